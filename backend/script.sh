@@ -9,4 +9,7 @@ until mongo_ready; do
 done
 >&2 echo 'MongoDB is available.'
 
-gunicorn main:app --bind 0.0.0.0:8000 -k uvicorn.workers.UvicornWorker
\ No newline at end of file
+python manage.py migrate
+
+exec gunicorn main:app --bind 0.0.0.0:8000 -k uvicorn.workers.UvicornWorker \
+  --graceful-timeout ${GRACEFUL_TIMEOUT:-30}
\ No newline at end of file
@@ -0,0 +1,159 @@
+import asyncio
+import re
+import time
+from collections import deque
+from contextlib import AsyncExitStack
+from http import HTTPStatus
+from typing import Deque, Dict, Optional, Pattern, Tuple
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.config import CONFIG
+from core.exceptions import ServiceUnavailableError
+from core.metrics import ADMISSION_QUEUE_TIME, ADMISSION_REJECTED
+
+
+class ConcurrencyLimit:
+    """Класс ограничения конкурентных запросов группы маршрутов с отказом при долгом ожидании в очереди."""
+
+    smoothing = 0.2
+
+    def __init__(self, group: str, limit: int, target: float):
+        """При инициализации класса принимает группу маршрутов, лимит запросов и целевое время ожидания.
+
+        Args:
+            group: Название группы маршрутов
+            limit: Максимальное количество одновременно обрабатываемых запросов
+            target: Целевое время ожидания в очереди в секундах
+        """
+        self.group = group
+        self.limit = limit
+        self.target = target
+        self.active = 0
+        self.delay: float = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> bool:
+        """Ожидание свободного места для обработки запроса.
+
+        Если очередь уже ждет дольше целевого времени, запрос отклоняется сразу, не занимая очередь.
+
+        Returns:
+            bool: Запрос допущен к обработке
+        """
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            self.observe(0)
+            return True
+        if self.delay > self.target:
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, timeout=self.target)
+        except asyncio.TimeoutError:
+            self.observe(time.monotonic() - started)
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        self.observe(time.monotonic() - started)
+        return True
+
+    def release(self):
+        """Освобождение места после обработки запроса с передачей его первому ожидающему."""
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def observe(self, delay: float):
+        """Учет времени ожидания в очереди в скользящем среднем.
+
+        Args:
+            delay: Время ожидания в секундах
+        """
+        self.delay += self.smoothing * (delay - self.delay)
+        ADMISSION_QUEUE_TIME.labels(self.group).observe(delay)
+
+
+class AdmissionMiddleware:
+    """Промежуточный слой для ограничения нагрузки по группам маршрутов: чтение рейтингов, списки рецензий и запись."""
+
+    routes: Tuple[Tuple[str, Pattern, str], ...] = (
+        ('GET', re.compile('/ratings$'), 'ratings'),
+        ('POST', re.compile('/ratings/search$'), 'ratings'),
+        ('GET', re.compile('/reviews$'), 'reviews'),
+        ('GET', re.compile('/reviews/search$'), 'reviews'),
+        ('POST', re.compile('^/api/'), 'writes'),
+        ('DELETE', re.compile('^/api/'), 'writes'),
+    )
+
+    def __init__(self, app: ASGIApp):
+        """При инициализации класса создает ограничения для групп маршрутов из настроек.
+
+        Args:
+            app: ASGI-приложение
+        """
+        self.app = app
+        self.limits: Dict[str, ConcurrencyLimit] = {
+            group: ConcurrencyLimit(group, limit, CONFIG.admission.target)
+            for group, limit in (
+                ('ratings', CONFIG.admission.ratings),
+                ('reviews', CONFIG.admission.reviews),
+                ('writes', CONFIG.admission.writes),
+            )
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Обработка запроса с учетом ограничения его группы маршрутов.
+
+        Место в группе освобождается после ответа, даже если обработка запроса завершилась ошибкой.
+
+        Args:
+            scope: Параметры запроса
+            receive: Получение сообщений запроса
+            send: Отправка сообщений ответа
+        """
+        if scope['type'] != 'http' or (limit := self.classify(scope)) is None:
+            return await self.app(scope, receive, send)
+        if not await limit.acquire():
+            ADMISSION_REJECTED.labels(limit.group).inc()
+            return await self.reject(scope, receive, send)
+        async with AsyncExitStack() as stack:
+            stack.callback(limit.release)
+            await self.app(scope, receive, send)
+
+    def classify(self, scope: Scope) -> Optional[ConcurrencyLimit]:
+        """Определение группы маршрута по методу и пути запроса.
+
+        Args:
+            scope: Параметры запроса
+
+        Returns:
+            Optional[ConcurrencyLimit]: Ограничение группы или None, если маршрут не ограничен
+        """
+        for method, path, group in self.routes:
+            if scope['method'] == method and path.search(scope['path']):
+                return self.limits[group]
+        return None
+
+    async def reject(self, scope: Scope, receive: Receive, send: Send):
+        """Отказ в обработке запроса с указанием, через сколько секунд повторить его.
+
+        Args:
+            scope: Параметры запроса
+            receive: Получение сообщений запроса
+            send: Отправка сообщений ответа
+        """
+        exc = ServiceUnavailableError(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            headers={'Retry-After': str(CONFIG.admission.retry)},
+        )
+        response = exc.handler(Request(scope), exc)
+        await response(scope, receive, send)
@@ -0,0 +1,178 @@
+from collections import OrderedDict
+from functools import partial
+from http import HTTPStatus
+from typing import Awaitable, Callable, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.encoders import ENCODERS, Encoder, negotiate
+from core.config import CONFIG
+from core.metrics import COMPRESSION_CACHE
+
+
+class CompressionMiddleware:
+    """Промежуточный слой для сжатия ответов zstd, brotli или gzip по заголовку Accept-Encoding клиента.
+
+    Ответ с ETag не меняется, пока не изменится версия документа, поэтому его сжатые байты кэшируются,
+    и горячий ответ сжимается один раз, а не на каждый запрос. Пакеты brotli и zstandard необязательны:
+    без них ответы сжимаются только gzip.
+    """
+
+    media_types: Tuple[str, ...] = ('application/json', 'application/x-ndjson', 'application/msgpack', 'text/')
+
+    def __init__(self, app: ASGIApp):
+        """При инициализации класса создает кэш сжатых ответов из настроек.
+
+        Args:
+            app: ASGI-приложение
+        """
+        self.app = app
+        self.minimum = CONFIG.compression.minimum
+        self.size = CONFIG.compression.cache
+        self.entries: 'OrderedDict[Tuple, bytes]' = OrderedDict()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Обработка запроса со сжатием ответа, если клиент его принимает.
+
+        Args:
+            scope: Параметры запроса
+            receive: Получение сообщений запроса
+            send: Отправка сообщений ответа
+        """
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        if (encoding := negotiate(Headers(scope=scope).get('accept-encoding', ''))) is None:
+            return await self.app(scope, receive, send)
+        await self.app(scope, receive, CompressedSend(self, scope, encoding, send))
+
+    def compress(self, key: Optional[Tuple], encoding: str, body: bytes) -> bytes:
+        """Сжатие тела ответа целиком или получение сжатых байтов из кэша.
+
+        Args:
+            key: Ключ кэша или None, если ответ не кэшируется
+            encoding: Название сжатия
+            body: Тело ответа
+
+        Returns:
+            bytes: Сжатое тело ответа
+        """
+        if key is not None and (compressed := self.entries.get(key)) is not None:
+            self.entries.move_to_end(key)
+            COMPRESSION_CACHE.labels('hit').inc()
+            return compressed
+        COMPRESSION_CACHE.labels('miss').inc()
+        compressed = ENCODERS[encoding]().finish(body)
+        if key is not None and self.size:
+            self.entries[key] = compressed
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+        return compressed
+
+
+class CompressedSend:
+    """Класс отправки ответа, который сжимает тело, если ответ достаточно большой и его тип сжимается.
+
+    Тело из одного сообщения сжимается целиком, а потоковый ответ - по частям, по мере их отправки.
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, encoding: str, send: Send):
+        """При инициализации класса принимает промежуточный слой, запрос и выбранное сжатие.
+
+        Args:
+            middleware: Промежуточный слой сжатия
+            scope: Параметры запроса
+            encoding: Название сжатия
+            send: Отправка сообщений ответа
+        """
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self.send = send
+        self.start: Message = {}
+        self.body: Callable[[Message], Awaitable[None]] = self.begin
+
+    async def __call__(self, message: Message):
+        """Отправка сообщения ответа: начало ответа откладывается до первой части тела.
+
+        Args:
+            message: Сообщение ответа
+        """
+        if message['type'] == 'http.response.start':
+            self.start = {**message, 'headers': list(message['headers'])}
+        elif message['type'] == 'http.response.body':
+            await self.body(message)
+        else:
+            await self.send(message)
+
+    async def begin(self, message: Message):
+        """Отправка начала ответа и первой части тела, сжатых или нет в зависимости от типа и размера ответа.
+
+        Args:
+            message: Первая часть тела ответа
+        """
+        headers = MutableHeaders(raw=self.start['headers'])
+        if self.compressible(headers):
+            headers.add_vary_header('Accept-Encoding')
+            if message.get('more_body', False):
+                return await self.stream(message)
+            if len(message.get('body', b'')) >= self.middleware.minimum:
+                return await self.whole(headers, message)
+        self.body = self.send
+        await self.send(self.start)
+        await self.send(message)
+
+    def compressible(self, headers: Headers) -> bool:
+        """Проверка, что тип ответа сжимается и ответ еще не сжат приложением.
+
+        Args:
+            headers: Заголовки ответа
+
+        Returns:
+            bool: Ответ можно сжать
+        """
+        media_type = headers.get('content-type', '')
+        return media_type.startswith(self.middleware.media_types) and 'content-encoding' not in headers
+
+    async def whole(self, headers: MutableHeaders, message: Message):
+        """Отправка ответа из одного сообщения, сжатого целиком или взятого из кэша, если у ответа есть ETag.
+
+        Args:
+            headers: Заголовки ответа
+            message: Тело ответа
+        """
+        headers['Content-Encoding'] = self.encoding
+        key = None
+        if self.start['status'] == HTTPStatus.OK and (etag := headers.get('etag')):
+            key = (self.scope['path'], self.scope['query_string'], etag, headers['content-type'], self.encoding)
+        body = self.middleware.compress(key, self.encoding, message.get('body', b''))
+        headers['Content-Length'] = str(len(body))
+        await self.send(self.start)
+        await self.send({**message, 'body': body})
+
+    async def stream(self, message: Message):
+        """Отправка потокового ответа, каждая часть которого сжимается по мере отправки.
+
+        Длина сжатого ответа заранее неизвестна, поэтому заголовок Content-Length не передается.
+
+        Args:
+            message: Первая часть тела ответа
+        """
+        self.start['headers'] = [header for header in self.start['headers'] if header[0] != b'content-length']
+        MutableHeaders(raw=self.start['headers'])['Content-Encoding'] = self.encoding
+        self.body = partial(self.encode, ENCODERS[self.encoding]())
+        await self.send(self.start)
+        await self.body(message)
+
+    async def encode(self, encoder: Encoder, message: Message):
+        """Отправка сжатой части потокового ответа.
+
+        Args:
+            encoder: Компрессор ответа
+            message: Часть тела ответа
+        """
+        body = message.get('body', b'')
+        if message.get('more_body', False):
+            await self.send({**message, 'body': encoder.chunk(body)})
+        else:
+            await self.send({**message, 'body': encoder.finish(body)})
@@ -1,12 +1,16 @@
 from http import HTTPStatus
+from typing import Optional
 from uuid import UUID
 
-from fastapi import Depends
+from fastapi import Depends, Header
 
+from api.negotiation import MSGPACK_TYPES
+from services.auth import AuthService
 from services.crud import CRUDService, get_crud_service
 from core.config import CONFIG
 from core.enums import MongoCollections
-from core.exceptions import NotFoundFilmError, NotFoundReviewError
+from core.exceptions import NotAdminError, NotFoundFilmError, NotFoundReviewError
+from models.base import BINARY
 
 
 async def check_film_exists(film_id: UUID, mongo: CRUDService = Depends(get_crud_service)):
@@ -20,7 +24,7 @@ async def check_film_exists(film_id: UUID, mongo: CRUDService = Depends(get_crud
         NotFoundFilmError: Ошибка 404, если фильм не найден
     """
     if not CONFIG.fastapi.debug:
-        if not (await mongo.retrieve(MongoCollections.films, film_id)):
+        if not (await mongo.retrieve(MongoCollections.films, film_id, projection={'_id': 1})):
             raise NotFoundFilmError(status_code=HTTPStatus.NOT_FOUND)
 
 
@@ -34,5 +38,30 @@ async def check_review_exists(review_id: UUID, mongo: CRUDService = Depends(get_
     Raises:
         NotFoundReviewError: Ошибка 404, если рецензии не найдена
     """
-    if not (await mongo.retrieve(MongoCollections.reviews, review_id)):
+    if not (await mongo.retrieve(MongoCollections.reviews, review_id, projection={'_id': 1})):
         raise NotFoundReviewError(status_code=HTTPStatus.NOT_FOUND)
+
+
+async def check_admin(auth: AuthService = Depends()):
+    """Функция для проверки прав администратора, с целью внедрения зависимости.
+
+    Args:
+        auth: Аутентификация пользователя
+
+    Raises:
+        NotAdminError: Ошибка 403, если в токене нет признака администратора
+    """
+    if not auth.is_admin:
+        raise NotAdminError(status_code=HTTPStatus.FORBIDDEN)
+
+
+async def negotiate_format(accept: Optional[str] = Header(default=None)):
+    """Функция для выбора формата ответа по заголовку Accept, с целью внедрения зависимости.
+
+    MessagePack отдается только тем клиентам, которые явно его запросили, остальным - JSON.
+
+    Args:
+        accept: Заголовок Accept
+    """
+    media_types = {media_type.split(';')[0].strip() for media_type in (accept or '').split(',')}
+    BINARY.set(not media_types.isdisjoint(MSGPACK_TYPES))
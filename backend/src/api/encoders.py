@@ -0,0 +1,146 @@
+import zlib
+from importlib import import_module
+from importlib.util import find_spec
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional, Tuple, Union
+
+GZIP_WBITS = 31  # окно 2^15 байт и заголовок gzip (MAX_WBITS + 16)
+
+
+class GzipEncoder:
+    """Класс потокового сжатия gzip."""
+
+    module = 'zlib'
+
+    def __init__(self):
+        """При инициализации класса создает компрессор."""
+        self.compressor = zlib.compressobj(6, zlib.DEFLATED, GZIP_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        """Сжатие части тела ответа так, чтобы клиент мог распаковать её, не дожидаясь следующей.
+
+        Args:
+            data: Часть тела ответа
+
+        Returns:
+            bytes: Сжатые данные
+        """
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b'') -> bytes:
+        """Сжатие последней части тела ответа с завершением потока.
+
+        Args:
+            data: Последняя часть тела ответа
+
+        Returns:
+            bytes: Сжатые данные
+        """
+        return self.compressor.compress(data) + self.compressor.flush()
+
+
+class BrotliEncoder:
+    """Класс потокового сжатия brotli."""
+
+    module = 'brotli'
+
+    def __init__(self):
+        """При инициализации класса создает компрессор из необязательного пакета brotli."""
+        self.compressor = import_module(self.module).Compressor(quality=5)
+
+    def chunk(self, data: bytes) -> bytes:
+        """Сжатие части тела ответа так, чтобы клиент мог распаковать её, не дожидаясь следующей.
+
+        Args:
+            data: Часть тела ответа
+
+        Returns:
+            bytes: Сжатые данные
+        """
+        return self.compressor.process(data) + self.compressor.flush()
+
+    def finish(self, data: bytes = b'') -> bytes:
+        """Сжатие последней части тела ответа с завершением потока.
+
+        Args:
+            data: Последняя часть тела ответа
+
+        Returns:
+            bytes: Сжатые данные
+        """
+        return self.compressor.process(data) + self.compressor.finish()
+
+
+class ZstdEncoder:
+    """Класс потокового сжатия zstd."""
+
+    module = 'zstandard'
+
+    def __init__(self):
+        """При инициализации класса создает компрессор из необязательного пакета zstandard."""
+        zstandard = import_module(self.module)
+        self.compressor = zstandard.ZstdCompressor(level=3).compressobj()
+        self.block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+
+    def chunk(self, data: bytes) -> bytes:
+        """Сжатие части тела ответа так, чтобы клиент мог распаковать её, не дожидаясь следующей.
+
+        Args:
+            data: Часть тела ответа
+
+        Returns:
+            bytes: Сжатые данные
+        """
+        return self.compressor.compress(data) + self.compressor.flush(self.block)
+
+    def finish(self, data: bytes = b'') -> bytes:
+        """Сжатие последней части тела ответа с завершением потока.
+
+        Args:
+            data: Последняя часть тела ответа
+
+        Returns:
+            bytes: Сжатые данные
+        """
+        return self.compressor.compress(data) + self.compressor.flush()
+
+
+Encoder = Union[GzipEncoder, BrotliEncoder, ZstdEncoder]
+
+ENCODERS: Mapping[str, Callable[[], Encoder]] = MappingProxyType({
+    name: encoder
+    for name, encoder in (('zstd', ZstdEncoder), ('br', BrotliEncoder), ('gzip', GzipEncoder))
+    if find_spec(encoder.module)
+})
+
+
+def parse_preference(preference: str) -> Tuple[str, float]:
+    """Функция для разбора одного значения заголовка Accept-Encoding на название сжатия и его вес.
+
+    Args:
+        preference: Значение заголовка, например `br;q=0.8`
+
+    Returns:
+        Tuple[str, float]: Название сжатия и вес, 0 при некорректном весе
+    """
+    name, *options = (part.strip() for part in preference.split(';'))
+    weight = next((option[2:] for option in options if option.startswith('q=')), '1')
+    try:
+        return name.lower(), float(weight)
+    except ValueError:
+        return name.lower(), 0
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Функция для выбора сжатия по весам из заголовка Accept-Encoding, а при равных весах - по порядку сервера.
+
+    Args:
+        accept_encoding: Заголовок Accept-Encoding
+
+    Returns:
+        Optional[str]: Название сжатия или None, если клиент не принимает ни одно из доступных
+    """
+    weights = dict(parse_preference(preference) for preference in accept_encoding.split(','))
+    default = weights.get('*', 0)
+    accepted = [name for name in ENCODERS if weights.get(name, default) > 0]
+    return max(accepted, key=lambda name: weights.get(name, default), default=None)
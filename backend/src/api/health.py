@@ -0,0 +1,27 @@
+from http import HTTPStatus
+
+from fastapi.responses import ORJSONResponse
+
+from db import mongo
+
+
+async def live() -> ORJSONResponse:
+    """Представление для проверки того, что воркер запущен и обрабатывает запросы.
+
+    Returns:
+        ORJSONResponse: HTTP-ответ с кодом 200
+    """
+    return ORJSONResponse(content={'status': 'live'})
+
+
+async def ready() -> ORJSONResponse:
+    """Представление для проверки готовности воркера принимать трафик.
+
+    Воркер готов, когда схема MongoDB проверена и пул соединений заполнен, и перестает быть готовым при остановке.
+
+    Returns:
+        ORJSONResponse: HTTP-ответ с кодом 200 или 503, если воркер не готов
+    """
+    if not mongo.ready:
+        return ORJSONResponse(content={'status': 'unavailable'}, status_code=HTTPStatus.SERVICE_UNAVAILABLE)
+    return ORJSONResponse(content={'status': 'ready'})
@@ -0,0 +1,170 @@
+from functools import partial
+from typing import Any, Callable, Coroutine, Dict, Mapping, Optional
+
+import msgpack
+import orjson
+from bson import CodecOptions, UuidRepresentation, decode
+from bson.raw_bson import RawBSONDocument
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import Receive, Scope
+
+from models.base import BINARY, msgpack_default
+
+MSGPACK = 'application/msgpack'
+MSGPACK_TYPES = (MSGPACK, 'application/x-msgpack')
+
+RouteHandler = Callable[[Request], Coroutine[Any, Any, Response]]
+
+
+class NegotiatedResponse(ORJSONResponse):
+    """HTTP-ответ в JSON или в MessagePack, если клиент запросил его заголовком Accept."""
+
+    def render(self, payload: Any) -> bytes:
+        """Сериализация ответа в формат, запрошенный клиентом.
+
+        Args:
+            payload: Данные ответа
+
+        Returns:
+            bytes: Тело ответа
+        """
+        if BINARY.get():
+            self.media_type = MSGPACK
+            return msgpack.packb(payload, default=self.pack)
+        return self.render_json(payload)
+
+    def render_json(self, payload: Any) -> bytes:
+        """Сериализация ответа в JSON.
+
+        Args:
+            payload: Данные ответа
+
+        Returns:
+            bytes: Тело ответа
+        """
+        return ORJSONResponse.render(self, payload)
+
+    def init_headers(self, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Заголовки ответа, по которым кэши различают ответы в JSON и MessagePack.
+
+        Args:
+            headers: Заголовки ответа
+        """
+        super().init_headers(headers)
+        MutableHeaders(raw=self.raw_headers).add_vary_header('Accept')
+
+    @classmethod
+    def pack(cls, instance: Any) -> Any:
+        """Упаковка объекта, который встретился при сериализации в MessagePack.
+
+        Args:
+            instance: Объект
+
+        Returns:
+            Any: Представление объекта в MessagePack
+        """
+        return msgpack_default(instance)
+
+
+class BSONResponse(NegotiatedResponse):
+    """HTTP-ответ с документами MongoDB, которые декодируются из BSON только в момент сериализации."""
+
+    codec_options: 'CodecOptions[Dict[str, Any]]' = CodecOptions(
+        document_class=dict, uuid_representation=UuidRepresentation.STANDARD,
+    )
+
+    def render_json(self, payload: Any) -> bytes:
+        """Сериализация документов в JSON без промежуточной валидации моделями ответа.
+
+        Args:
+            payload: Документы в виде BSON
+
+        Returns:
+            bytes: Тело ответа
+        """
+        return orjson.dumps(payload, default=self.inflate, option=orjson.OPT_NON_STR_KEYS)
+
+    @classmethod
+    def pack(cls, instance: Any) -> Any:
+        """Упаковка объекта, который встретился при сериализации в MessagePack.
+
+        Args:
+            instance: BSON-документ или объект из него
+
+        Returns:
+            Any: Представление объекта в MessagePack
+        """
+        if isinstance(instance, RawBSONDocument):
+            return cls.inflate(instance)
+        return msgpack_default(instance)
+
+    @classmethod
+    def inflate(cls, doc: Any) -> dict:
+        """Декодирование BSON-документа, который встретился при сериализации.
+
+        Args:
+            doc: BSON-документ
+
+        Raises:
+            TypeError: Ошибка, если объект не является BSON-документом
+
+        Returns:
+            dict: Документ
+        """
+        if isinstance(doc, RawBSONDocument):
+            return decode(doc.raw, cls.codec_options)
+        raise TypeError
+
+
+class MsgPackRequest(Request):
+    """HTTP-запрос с телом в MessagePack, которое FastAPI читает так же, как JSON."""
+
+    def __init__(self, scope: Scope, receive: Receive):
+        """При инициализации класса убирает из запроса Content-Type, с которым FastAPI не стал бы разбирать тело.
+
+        Args:
+            scope: ASGI-окружение запроса
+            receive: Получение тела запроса
+        """
+        headers = [(name, header) for name, header in scope['headers'] if name != b'content-type']
+        super().__init__({**scope, 'headers': headers}, receive)
+
+    async def json(self) -> Any:
+        """Распаковка тела запроса, в котором UUID могут быть переданы 16 байтами.
+
+        Returns:
+            Any: Тело запроса
+        """
+        if not hasattr(self, '_json'):
+            self._json = msgpack.unpackb(await self.body(), timestamp=3)
+        return self._json
+
+
+class NegotiatedRoute(APIRoute):
+    """Маршрут, который принимает тело запроса в JSON или в MessagePack по заголовку Content-Type."""
+
+    def get_route_handler(self) -> RouteHandler:
+        """Обработчик маршрута, который подменяет запрос с телом в MessagePack.
+
+        Returns:
+            RouteHandler: Обработчик запроса
+        """
+        return partial(self.negotiate, super().get_route_handler())
+
+    async def negotiate(self, handler: RouteHandler, request: Request) -> Response:
+        """Обработка запроса, тело которого FastAPI читает из MessagePack, если клиент прислал его в этом формате.
+
+        Args:
+            handler: Обработчик запроса FastAPI
+            request: HTTP-запрос
+
+        Returns:
+            Response: HTTP-ответ
+        """
+        content_type = request.headers.get('content-type', '').split(';')[0].strip()
+        if content_type in MSGPACK_TYPES:
+            request = MsgPackRequest(request.scope, request.receive)
+        return await handler(request)
@@ -1,11 +1,15 @@
-from typing import List
+from typing import Dict, List
+from uuid import UUID
 
 from fastapi import Depends
+from fastapi.responses import StreamingResponse
 from fastapi.routing import APIRoute
 
-from api.dependencies import check_film_exists, check_review_exists
-from api.v1 import bookmarks, ratings, reviews
-from models.responses import BookmarkResponse, RatingResponse, ReviewResponse
+from api import health
+from api.dependencies import check_admin, check_film_exists, check_review_exists
+from api.negotiation import NegotiatedRoute
+from api.v1 import batches, bookmarks, exports, history, leaderboards, ratings, reviews, users
+from models import responses
 
 routes = [
     APIRoute(
@@ -14,17 +18,35 @@ routes = [
         summary='Просмотр списка закладок',
         response_description='Закладки пользователя (отложенные на потом фильмы)',
         endpoint=bookmarks.get_user_bookmarks,
-        response_model=List[BookmarkResponse],
+        response_model=List[responses.BookmarkResponse],
         response_model_by_alias=False,
         tags=['bookmarks'],
     ),
+    APIRoute(
+        path='/users/me/votes',
+        methods=['GET'],
+        summary='Просмотр своих оценок',
+        response_description='Оценки пользователя по ID фильмов и рецензий',
+        endpoint=users.get_user_votes,
+        response_model=responses.VotesResponse,
+        tags=['users'],
+    ),
+    APIRoute(
+        path='/users/me/activity',
+        methods=['GET'],
+        summary='Просмотр своей активности',
+        response_description='Закладки, оценки и рецензии пользователя от новых к старым',
+        endpoint=users.get_user_activity,
+        response_model=responses.ActivityPageResponse,
+        tags=['users'],
+    ),
     APIRoute(
         path='/films/{film_id}/bookmarks',
         methods=['POST'],
         summary='Добавление фильма в закладки',
         response_description='Закладки пользователя (отложенные на потом фильмы)',
         endpoint=bookmarks.bookmark_film,
-        response_model=List[BookmarkResponse],
+        response_model=List[responses.BookmarkResponse],
         response_model_by_alias=False,
         dependencies=[Depends(check_film_exists)],
         tags=['bookmarks'],
@@ -35,18 +57,47 @@ routes = [
         summary='Удаление фильма из закладок',
         response_description='Закладки пользователя (отложенные на потом фильмы)',
         endpoint=bookmarks.unbookmark_film,
-        response_model=List[BookmarkResponse],
+        response_model=List[responses.BookmarkResponse],
         response_model_by_alias=False,
         dependencies=[Depends(check_film_exists)],
         tags=['bookmarks'],
     ),
+    APIRoute(
+        path='/films/ratings',
+        methods=['GET'],
+        summary='Просмотр рейтинга нескольких фильмов',
+        response_description='Рейтинги фильмов по их ID (лайки, дизлайки, средняя оценка и количество рецензий)',
+        endpoint=batches.get_films_ratings,
+        response_model=Dict[UUID, responses.FilmRatingResponse],
+        response_model_by_alias=False,
+        tags=['film_rating'],
+    ),
+    NegotiatedRoute(
+        path='/films/ratings/search',
+        methods=['POST'],
+        summary='Просмотр рейтинга нескольких фильмов по ID в теле запроса',
+        response_description='Рейтинги фильмов по их ID (лайки, дизлайки, средняя оценка и количество рецензий)',
+        endpoint=batches.search_films_ratings,
+        response_model=Dict[UUID, responses.FilmRatingResponse],
+        response_model_by_alias=False,
+        tags=['film_rating'],
+    ),
+    APIRoute(
+        path='/films/leaderboards/{board}',
+        methods=['GET'],
+        summary='Просмотр рейтинга фильмов за неделю',
+        response_description='Лучшие (top) или самые обсуждаемые (discussed) фильмы текущей недели',
+        endpoint=leaderboards.get_leaderboard,
+        response_model=List[responses.LeaderboardResponse],
+        tags=['leaderboards'],
+    ),
     APIRoute(
         path='/films/{film_id}/ratings',
         methods=['GET'],
         summary='Просмотр рейтинга фильма',
-        response_description='Рейтинг фильма (лайки, дизлайки и средняя оценка)',
+        response_description='Рейтинг фильма (лайки, дизлайки, средняя оценка и количество рецензий)',
         endpoint=ratings.get_film_rating,
-        response_model=RatingResponse,
+        response_model=responses.FilmRatingResponse,
         response_model_by_alias=False,
         tags=['film_rating'],
     ),
@@ -54,9 +105,9 @@ routes = [
         path='/films/{film_id}/ratings',
         methods=['POST'],
         summary='Добавление оценки фильму',
-        response_description='Рейтинг фильма (лайки, дизлайки и средняя оценка)',
+        response_description='Рейтинг фильма (лайки, дизлайки, средняя оценка и количество рецензий)',
         endpoint=ratings.rate_film,
-        response_model=RatingResponse,
+        response_model=responses.FilmRatingResponse,
         response_model_by_alias=False,
         tags=['film_rating'],
     ),
@@ -64,19 +115,38 @@ routes = [
         path='/films/{film_id}/ratings',
         methods=['DELETE'],
         summary='Удаление оценки у фильма',
-        response_description='Рейтинг фильма (лайки, дизлайки и средняя оценка)',
+        response_description='Рейтинг фильма (лайки, дизлайки, средняя оценка и количество рецензий)',
         endpoint=ratings.unrate_film,
-        response_model=RatingResponse,
+        response_model=responses.FilmRatingResponse,
         response_model_by_alias=False,
         tags=['film_rating'],
     ),
+    APIRoute(
+        path='/films/{film_id}/ratings/history',
+        methods=['GET'],
+        summary='Просмотр истории рейтинга фильма',
+        response_description='Изменения лайков, дизлайков и суммы оценок фильма по часам или дням',
+        endpoint=history.get_film_rating_history,
+        response_model=List[responses.HistoryResponse],
+        tags=['film_rating'],
+    ),
+    APIRoute(
+        path='/reviews/search',
+        methods=['GET'],
+        summary='Поиск рецензий по тексту',
+        response_description='Найденные рецензии от более релевантных к менее релевантным',
+        endpoint=reviews.search_reviews,
+        response_model=responses.ReviewSearchPageResponse,
+        response_model_by_alias=False,
+        tags=['reviews'],
+    ),
     APIRoute(
         path='/films/{film_id}/reviews',
         methods=['GET'],
         summary='Просмотр списка рецензий',
         response_description='Список рецензий на фильм',
         endpoint=reviews.get_film_reviews,
-        response_model=List[ReviewResponse],
+        response_model=List[responses.ReviewResponse],
         response_model_by_alias=False,
         tags=['reviews'],
     ),
@@ -86,7 +156,7 @@ routes = [
         summary='Добавление рецензии к фильму',
         response_description='Рецензия на фильм',
         endpoint=reviews.create_film_review,
-        response_model=ReviewResponse,
+        response_model=responses.ReviewResponse,
         response_model_by_alias=False,
         response_model_exclude_none=True,
         dependencies=[Depends(check_film_exists)],
@@ -107,7 +177,7 @@ routes = [
         summary='Просмотр рейтинга рецензии',
         response_description='Рейтинг рецензии (лайки, дизлайки и средняя оценка)',
         endpoint=ratings.get_review_rating,
-        response_model=RatingResponse,
+        response_model=responses.RatingResponse,
         response_model_by_alias=False,
         dependencies=[Depends(check_film_exists)],
         tags=['review_rating'],
@@ -118,7 +188,7 @@ routes = [
         summary='Добавление оценки рецензии',
         response_description='Рейтинг рецензии (лайки, дизлайки и средняя оценка)',
         endpoint=ratings.rate_review,
-        response_model=RatingResponse,
+        response_model=responses.RatingResponse,
         response_model_by_alias=False,
         dependencies=[Depends(check_film_exists)],
         tags=['review_rating'],
@@ -129,9 +199,46 @@ routes = [
         summary='Удаление оценки у рецензии',
         response_description='Рейтинг рецензии (лайки, дизлайки и средняя оценка)',
         endpoint=ratings.unrate_review,
-        response_model=RatingResponse,
+        response_model=responses.RatingResponse,
         response_model_by_alias=False,
         dependencies=[Depends(check_film_exists)],
         tags=['review_rating'],
     ),
+    APIRoute(
+        path='/admin/reviews/export',
+        methods=['GET'],
+        summary='Выгрузка рецензий',
+        response_description='Поток рецензий с рейтингом в формате NDJSON или CSV',
+        endpoint=exports.export_reviews,
+        response_class=StreamingResponse,
+        dependencies=[Depends(check_admin)],
+        tags=['admin'],
+    ),
+    APIRoute(
+        path='/admin/ratings/export',
+        methods=['GET'],
+        summary='Выгрузка рейтингов фильмов',
+        response_description='Поток рейтингов фильмов в формате NDJSON или CSV',
+        endpoint=exports.export_ratings,
+        response_class=StreamingResponse,
+        dependencies=[Depends(check_admin)],
+        tags=['admin'],
+    ),
+]
+
+health_routes = [
+    APIRoute(
+        path='/health/live',
+        methods=['GET'],
+        summary='Проверка работоспособности воркера',
+        endpoint=health.live,
+        include_in_schema=False,
+    ),
+    APIRoute(
+        path='/health/ready',
+        methods=['GET'],
+        summary='Проверка готовности воркера принимать трафик',
+        endpoint=health.ready,
+        include_in_schema=False,
+    ),
 ]
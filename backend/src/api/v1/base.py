@@ -1,4 +1,75 @@
-from fastapi import Query
+from http import HTTPStatus
+from typing import Dict, Optional
+
+from fastapi import Query, Request, Response
+
+from core.config import CONFIG
+
+
+def stale_headers(stale: bool) -> Dict[str, str]:
+    """Функция для пометки ответа, который отдан из кэша после устаревания записи.
+
+    Args:
+        stale: Признак устаревшей записи
+
+    Returns:
+        Dict[str, str]: Заголовки ответа
+    """
+    return {'X-Cache-Stale': '1'} if stale else {}
+
+
+def make_etag(version: int) -> str:
+    """Функция для построения ETag по версии документа.
+
+    Args:
+        version: Версия документа
+
+    Returns:
+        str: Значение заголовка ETag
+    """
+    return '"{version}"'.format(version=version)
+
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    """Функция для заголовков, по которым ответ кэшируется клиентом и nginx.
+
+    Args:
+        etag: ETag ответа
+
+    Returns:
+        Dict[str, str]: Заголовки ответа
+    """
+    return {'ETag': etag, 'Cache-Control': 'public, max-age={age}'.format(age=CONFIG.cache.age)}
+
+
+class Conditional:
+    """Класс для ответа на условные GET-запросы по ETag."""
+
+    def __init__(self, request: Request, response: Response):
+        """При инициализации класса принимает из запроса заголовок If-None-Match.
+
+        Args:
+            request: HTTP-запрос
+            response: HTTP-ответ
+        """
+        self.response = response
+        tags = [tag.strip() for tag in request.headers.get('if-none-match', '').split(',')]
+        self.tags = {tag[2:] if tag.startswith('W/') else tag for tag in tags if tag}
+
+    def check(self, version: int) -> Optional[Response]:
+        """Сравнение версии документа с ETag, который уже есть у клиента.
+
+        Args:
+            version: Версия документа
+
+        Returns:
+            Optional[Response]: HTTP-ответ с кодом 304, если у клиента актуальная версия, иначе None
+        """
+        etag = make_etag(version)
+        if etag in self.tags or '*' in self.tags:
+            return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=cache_headers(etag))
+        self.response.headers.update(cache_headers(etag))
+        return None
 
 
 class Paginator:
@@ -0,0 +1,98 @@
+from functools import partial
+from typing import Dict, Hashable, List, Optional
+from uuid import UUID
+
+from fastapi import Body, Depends, Query, Response
+
+from api.v1.base import stale_headers
+from services.cache import ReadCache, get_read_cache, get_version_cache
+from services.crud import CRUDService, get_crud_service
+from core.config import CONFIG
+from core.enums import MongoCollections
+from models.queries import ListRating
+from models.responses import FilmRatingResponse
+
+
+async def list_films(mongo: CRUDService, projection: Optional[Dict], source_ids: List[UUID]) -> Dict[UUID, Dict]:
+    """Функция для получения рейтинга или версий нескольких фильмов одним запросом.
+
+    Args:
+        mongo: Объект для выполнения MongoDB-запросов
+        projection: Проекция фильмов или None для рейтинга
+        source_ids: ID фильмов
+
+    Returns:
+        Dict[UUID, Dict]: Найденные фильмы по их ID
+    """
+    films = await mongo.search(
+        collection=MongoCollections.films, query=ListRating(source_ids=source_ids), projection=projection,
+    )
+    return {film.pop('_id'): film for film in films}
+
+
+def rating_keys(docs: Dict[UUID, Dict]) -> Dict[UUID, Hashable]:
+    """Функция для ключей кэша рейтингов фильмов по их версиям.
+
+    Args:
+        docs: Версии фильмов по их ID
+
+    Returns:
+        Dict[UUID, Hashable]: Ключи кэша по ID фильмов, такие же, как у рейтинга одного фильма
+    """
+    return {film_id: (MongoCollections.films, film_id, doc.get('version', 0)) for film_id, doc in docs.items()}
+
+
+async def get_films_ratings(
+    response: Response,
+    ids: List[UUID] = Query(description='ID фильмов', min_items=1, max_items=CONFIG.fastapi.batch),
+    mongo: CRUDService = Depends(get_crud_service),
+    cache: ReadCache = Depends(get_read_cache),
+    versions: ReadCache = Depends(get_version_cache),
+) -> Dict[UUID, FilmRatingResponse]:
+    """Представление для получения рейтинга нескольких фильмов за один запрос.
+
+    Версии фильмов читаются одним запросом, а рейтинги берутся из кэша по тем же ключам с версией,
+    что и рейтинг одного фильма, поэтому изменение оценки сразу видно в обоих представлениях.
+
+    Args:
+        response: HTTP-ответ
+        ids: ID фильмов
+        mongo: Объект для выполнения MongoDB-запросов
+        cache: Кэш чтения рейтингов
+        versions: Кэш версий документов
+
+    Returns:
+        Dict[UUID, FilmRatingResponse]: Рейтинги найденных фильмов по их ID
+    """
+    docs, outdated = await versions.get_many(
+        keys={film_id: (MongoCollections.films, film_id) for film_id in ids},
+        load=partial(list_films, mongo, {'version': 1}),
+    )
+    ratings, stale = await cache.get_many(
+        keys=rating_keys(docs),
+        load=partial(list_films, mongo, None),
+    )
+    response.headers.update(stale_headers(outdated or stale))
+    return ratings
+
+
+async def search_films_ratings(
+    response: Response,
+    ids: List[UUID] = Body(embed=True, description='ID фильмов', min_items=1, max_items=CONFIG.fastapi.batch),
+    mongo: CRUDService = Depends(get_crud_service),
+    cache: ReadCache = Depends(get_read_cache),
+    versions: ReadCache = Depends(get_version_cache),
+) -> Dict[UUID, FilmRatingResponse]:
+    """Представление для получения рейтинга нескольких фильмов по ID из тела запроса в JSON или MessagePack.
+
+    Args:
+        response: HTTP-ответ
+        ids: ID фильмов, в MessagePack - строками или 16 байтами
+        mongo: Объект для выполнения MongoDB-запросов
+        cache: Кэш чтения рейтингов
+        versions: Кэш версий документов
+
+    Returns:
+        Dict[UUID, FilmRatingResponse]: Рейтинги найденных фильмов по их ID
+    """
+    return await get_films_ratings(response, ids, mongo, cache, versions)
@@ -2,11 +2,15 @@ from uuid import UUID
 
 from fastapi import Depends, Path
 
+from api.negotiation import BSONResponse
 from api.v1.base import Paginator
+from services.activity import ActivityService, get_activity_service
 from services.auth import AuthService
 from services.crud import CRUDService, get_crud_service
+from core.config import CONFIG
 from core.enums import MongoCollections
-from models.queries import AddBookmark, RemoveBookmark
+from models.base import ActivityChoices
+from models.queries import AddBookmark, ListBookmark, RemoveBookmark
 from models.responses import BookmarkResponse
 
 
@@ -14,6 +18,7 @@ async def bookmark_film(
     auth: AuthService = Depends(),
     film_id: UUID = Path(title='ID фильма'),
     mongo: CRUDService = Depends(get_crud_service),
+    activity: ActivityService = Depends(get_activity_service),
 ) -> BookmarkResponse:
     """Представление для добавления фильма в закладки пользователя.
 
@@ -21,6 +26,7 @@ async def bookmark_film(
         auth: Аутентификация пользователя
         film_id: ID фильма
         mongo: Объект для выполнения MongoDB-запросов
+        activity: Сервис ленты активности пользователей
 
     Returns:
         BookmarkResponse: Список фильмов, отложенных пользователем на потом
@@ -29,6 +35,7 @@ async def bookmark_film(
         collection=MongoCollections.users,
         query=AddBookmark(user_id=auth.user_id, film_id=film_id),
     )
+    activity.record(auth.user_id, ActivityChoices.bookmark, film_id)
     return user.get('bookmarks', [])
 
 
@@ -36,6 +43,7 @@ async def unbookmark_film(
     auth: AuthService = Depends(),
     film_id: UUID = Path(title='Фильм ID'),
     mongo: CRUDService = Depends(get_crud_service),
+    activity: ActivityService = Depends(get_activity_service),
 ) -> BookmarkResponse:
     """Представление для изъятия фильма из закладок пользователя.
 
@@ -43,6 +51,7 @@ async def unbookmark_film(
         auth: Аутентификация пользователя
         film_id: ID фильма
         mongo: Объект для выполнения MongoDB-запросов
+        activity: Сервис ленты активности пользователей
 
     Returns:
         BookmarkResponse: Список фильмов, отложенных пользователем на потом
@@ -51,6 +60,7 @@ async def unbookmark_film(
         collection=MongoCollections.users,
         query=RemoveBookmark(user_id=auth.user_id, film_id=film_id),
     )
+    activity.record(auth.user_id, ActivityChoices.unbookmark, film_id)
     return user.get('bookmarks', [])
 
 
@@ -69,5 +79,11 @@ async def get_user_bookmarks(
     Returns:
         BookmarkResponse: Список фильмов, отложенных пользователем на потом
     """
-    user = await mongo.retrieve(collection=MongoCollections.users, doc_id=auth.user_id)
-    return user.get('bookmarks', [])[page.slice]
+    bookmarks = await mongo.search(
+        collection=MongoCollections.users,
+        query=ListBookmark(user_id=auth.user_id, offset=page.offset, limit=page.limit),
+        raw=CONFIG.mongo.raw,
+    )
+    if CONFIG.mongo.raw:
+        return BSONResponse(content=bookmarks)
+    return bookmarks
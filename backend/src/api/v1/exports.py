@@ -0,0 +1,89 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import Depends, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from services.crud import CRUDService, get_crud_service
+from services.exports import MEDIA_TYPES, render_chunks
+from core.config import CONFIG
+from core.enums import MongoCollections
+from models.base import ExportChoices, MongoQuery
+from models.queries import ExportRatings, ExportReviews
+
+
+async def stream_export(
+    mongo: CRUDService,
+    collection: MongoCollections,
+    query: MongoQuery,
+    export_format: ExportChoices,
+    filename: str,
+) -> StreamingResponse:
+    """Функция для потоковой выгрузки документов: каждая пачка курсора сразу уходит клиенту.
+
+    Первая пачка читается до начала ответа, поэтому при недоступности MongoDB клиент получает 503, а не обрыв.
+    Курсор закрывается после ответа, в том числе когда клиент обрывает выгрузку.
+
+    Args:
+        mongo: Объект для выполнения MongoDB-запросов
+        collection: Коллекция с документами
+        query: Запрос с проекцией документов в виде строк выгрузки
+        export_format: Формат выгрузки
+        filename: Имя файла выгрузки без расширения
+
+    Returns:
+        StreamingResponse: Потоковый HTTP-ответ
+    """
+    batches = mongo.stream(collection, query, CONFIG.export.batch)
+    try:
+        first = await batches.__anext__()
+    except StopAsyncIteration:
+        first = []
+    return StreamingResponse(
+        render_chunks(batches, first, export_format, [field for field in query.projection if field != '_id']),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            'Content-Disposition': 'attachment; filename="{filename}.{ext}"'.format(
+                filename=filename, ext=export_format.value,
+            ),
+            'X-Accel-Buffering': 'no',
+        },
+        background=BackgroundTask(batches.aclose),
+    )
+
+
+async def export_reviews(
+    film_id: Optional[UUID] = Query(default=None, description='ID фильма, если нужны рецензии только на него'),
+    export_format: ExportChoices = Query(default=ExportChoices.ndjson, alias='format', description='Формат'),
+    mongo: CRUDService = Depends(get_crud_service),
+) -> StreamingResponse:
+    """Представление для потоковой выгрузки рецензий вместе с их рейтингом.
+
+    Args:
+        film_id: ID фильма
+        export_format: Формат выгрузки: NDJSON или CSV
+        mongo: Объект для выполнения MongoDB-запросов
+
+    Returns:
+        StreamingResponse: Рецензии по одной на строку
+    """
+    return await stream_export(
+        mongo, MongoCollections.reviews, ExportReviews(film_id=film_id), export_format, 'reviews',
+    )
+
+
+async def export_ratings(
+    export_format: ExportChoices = Query(default=ExportChoices.ndjson, alias='format', description='Формат'),
+    mongo: CRUDService = Depends(get_crud_service),
+) -> StreamingResponse:
+    """Представление для потоковой выгрузки рейтинга всех фильмов.
+
+    Args:
+        export_format: Формат выгрузки: NDJSON или CSV
+        mongo: Объект для выполнения MongoDB-запросов
+
+    Returns:
+        StreamingResponse: Рейтинги фильмов по одному на строку
+    """
+    return await stream_export(mongo, MongoCollections.films, ExportRatings(), export_format, 'ratings')
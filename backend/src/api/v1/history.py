@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import Depends, Path, Query
+
+from services.history import HistoryService, get_history_service
+from models.base import HistoryChoices
+from models.responses import HistoryResponse
+
+MONTH_DAYS = 30
+
+HISTORY_WINDOWS = MappingProxyType({
+    HistoryChoices.hour: timedelta(days=1),
+    HistoryChoices.day: timedelta(days=MONTH_DAYS),
+})
+
+
+async def get_film_rating_history(
+    film_id: UUID = Path(title='Фильм ID'),
+    unit: HistoryChoices = Query(default=HistoryChoices.hour, description='Интервал'),
+    since: Optional[datetime] = Query(default=None, description='Начало периода, по умолчанию сутки или месяц назад'),
+    until: Optional[datetime] = Query(default=None, description='Конец периода, по умолчанию текущий момент'),
+    limit: int = Query(default=100, description='Максимальное количество интервалов', ge=1, le=1000),
+    history: HistoryService = Depends(get_history_service),
+) -> List[HistoryResponse]:
+    """Представление для получения истории рейтинга фильма по часам или дням.
+
+    Args:
+        film_id: ID фильма
+        unit: Интервал истории рейтинга
+        since: Начало периода
+        until: Конец периода
+        limit: Максимальное количество интервалов
+        history: Сервис истории рейтинга фильмов
+
+    Returns:
+        List[HistoryResponse]: Изменения лайков, дизлайков и суммы оценок по интервалам
+    """
+    until = until or datetime.now()
+    since = since or until - HISTORY_WINDOWS[unit]
+    return await history.search(film_id, unit, since, until, limit)
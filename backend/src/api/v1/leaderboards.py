@@ -0,0 +1,39 @@
+from fastapi import Depends, Path, Query, Response
+
+from api.v1.base import stale_headers
+from services.cache import ReadCache, get_read_cache
+from services.leaderboards import LeaderboardService, get_leaderboard_service
+from core.enums import MongoCollections
+from models.base import LeaderboardChoices
+from models.responses import LeaderboardResponse
+
+
+async def get_leaderboard(
+    response: Response,
+    board: LeaderboardChoices = Path(title='Рейтинг'),
+    limit: int = Query(default=10, description='Количество фильмов', ge=1, le=100),
+    leaderboards: LeaderboardService = Depends(get_leaderboard_service),
+    cache: ReadCache = Depends(get_read_cache),
+) -> LeaderboardResponse:
+    """Представление для получения первых фильмов рейтинга за текущую неделю.
+
+    Очки начисляются фоновыми задачами после записи голосов и рецензий, без подтверждения клиенту, поэтому
+    рейтинг может отставать от данных, а при сбое записи - расходиться с ними. Расхождение исправляет
+    полный пересчет `python manage.py leaderboards`, который стоит запускать по расписанию.
+
+    Args:
+        response: HTTP-ответ
+        board: Рейтинг: лучшие фильмы (top) или самые обсуждаемые (discussed)
+        limit: Количество фильмов
+        leaderboards: Сервис рейтингов фильмов за неделю
+        cache: Кэш чтения рейтингов
+
+    Returns:
+        LeaderboardResponse: Фильмы и их очки по убыванию очков
+    """
+    films, stale = await cache.get(
+        key=(MongoCollections.leaderboards, board, limit),
+        load=lambda: leaderboards.top(board, limit),
+    )
+    response.headers.update(stale_headers(stale))
+    return films
@@ -1,15 +1,49 @@
 from http import HTTPStatus
+from typing import Optional
 from uuid import UUID
 
-from fastapi import Body, Depends, Path
+from fastapi import Body, Depends, Path, Response
 
+from api.v1.base import Conditional, stale_headers
+from services.activity import ActivityService, get_activity_service
 from services.auth import AuthService
+from services.cache import ReadCache, get_read_cache, get_version_cache
 from services.crud import CRUDService, get_crud_service
+from services.history import HistoryService, get_history_service
+from services.leaderboards import LeaderboardService, get_leaderboard_service
 from core.enums import MongoCollections
 from core.exceptions import NotFoundFilmError, NotFoundReviewError
-from models.base import VotesChoices
-from models.queries import AddRating, RemoveRating
-from models.responses import RatingResponse
+from models.base import ActivityChoices, VotesChoices
+from models.queries import (
+    AddRating,
+    DestroyVote,
+    RemoveRating,
+    RetrieveRating,
+    SaveVote,
+    ScoreReview,
+    TouchFilm,
+)
+from models.responses import FilmRatingResponse, RatingResponse
+
+
+async def score_review(mongo: CRUDService, user_id: UUID, film_id: UUID, score: Optional[VotesChoices]):
+    """Функция для копирования оценки фильма в рецензию пользователя на этот фильм, если она есть.
+
+    Рецензия пользователя на фильм одна, поэтому обновляется не больше одного документа. Если рецензия изменилась,
+    то версия фильма увеличивается еще раз, чтобы кэш списка рецензий по прежней версии не отдавался.
+    Рейтинг фильма при этом не пересчитывается: он кэшируется под версией, которая вернулась вместе с ним.
+
+    Args:
+        mongo: Объект для выполнения MongoDB-запросов
+        user_id: ID пользователя
+        film_id: ID фильма
+        score: Новая оценка фильма или None, если оценка снята
+    """
+    if await mongo.update(
+        collection=MongoCollections.reviews,
+        query=ScoreReview(author=user_id, film_id=film_id, score=score),
+    ):
+        await mongo.update(collection=MongoCollections.films, query=TouchFilm(film_id=film_id))
 
 
 async def rate_film(
@@ -17,7 +51,11 @@ async def rate_film(
     film_id: UUID = Path(title='Фильм ID'),
     score: VotesChoices = Body(embed=True),
     mongo: CRUDService = Depends(get_crud_service),
-) -> RatingResponse:
+    cache: ReadCache = Depends(get_read_cache),
+    leaderboards: LeaderboardService = Depends(get_leaderboard_service),
+    history: HistoryService = Depends(get_history_service),
+    activity: ActivityService = Depends(get_activity_service),
+) -> FilmRatingResponse:
     """Представление для установления пользовательской оценки фильму.
 
     Args:
@@ -25,69 +63,115 @@ async def rate_film(
         film_id: ID фильма
         score: Оценка пользователя
         mongo: Объект для выполнения MongoDB-запросов
+        cache: Кэш чтения рейтингов
+        leaderboards: Сервис рейтингов фильмов за неделю
+        history: Сервис истории рейтинга фильмов
+        activity: Сервис ленты активности пользователей
 
     Raises:
         NotFoundFilmError: Ошибка 404, если фильм не найден
 
     Returns:
-        RatingResponse: Рейтинг фильма
+        FilmRatingResponse: Рейтинг фильма
     """
-    film = await mongo.update(
-        collection=MongoCollections.films,
-        query=AddRating(user_id=auth.user_id, source_id=film_id, score=score),
-    )
-    if not film:
+    query = AddRating(user_id=auth.user_id, source_id=film_id, score=score)
+    previous = await mongo.update(collection=MongoCollections.films, query=query)
+    if not (film := query.outcome(previous)):
         raise NotFoundFilmError(status_code=HTTPStatus.NOT_FOUND)
-    return film.get('rating', {})
+    await mongo.update(
+        collection=MongoCollections.votes,
+        query=SaveVote(
+            user_id=auth.user_id, source_id=film_id, source=MongoCollections.films, score=score, date=query.date,
+        ),
+    )
+    await score_review(mongo, auth.user_id, film_id, score)
+    leaderboards.rate(film_id, previous.get('vote'), query.vote)
+    history.rate(film_id, previous.get('vote'), query.vote)
+    cache.put((MongoCollections.films, film_id, film['version']), film)
+    activity.record(auth.user_id, ActivityChoices.rate_film, film_id, score=score)
+    return film
 
 
 async def unrate_film(
     auth: AuthService = Depends(),
     film_id: UUID = Path(title='Фильм ID'),
     mongo: CRUDService = Depends(get_crud_service),
-) -> RatingResponse:
+    cache: ReadCache = Depends(get_read_cache),
+    leaderboards: LeaderboardService = Depends(get_leaderboard_service),
+    history: HistoryService = Depends(get_history_service),
+    activity: ActivityService = Depends(get_activity_service),
+) -> FilmRatingResponse:
     """Представление для снятия пользовательской оценки фильму.
 
     Args:
         auth: Аутентификация пользователя
         film_id: ID фильма
         mongo: Объект для выполнения MongoDB-запросов
+        cache: Кэш чтения рейтингов
+        leaderboards: Сервис рейтингов фильмов за неделю
+        history: Сервис истории рейтинга фильмов
+        activity: Сервис ленты активности пользователей
 
     Raises:
         NotFoundFilmError: Ошибка 404, если фильм не найден
 
     Returns:
-        RatingResponse: Рейтинг фильма
+        FilmRatingResponse: Рейтинг фильма
     """
-    film = await mongo.update(
-        collection=MongoCollections.films,
-        query=RemoveRating(user_id=auth.user_id, source_id=film_id),
-    )
-    if not film:
+    query = RemoveRating(user_id=auth.user_id, source_id=film_id)
+    previous = await mongo.update(collection=MongoCollections.films, query=query)
+    if not (film := query.outcome(previous)):
         raise NotFoundFilmError(status_code=HTTPStatus.NOT_FOUND)
-    return film.get('rating', {})
+    await mongo.delete(collection=MongoCollections.votes, query=DestroyVote(user_id=auth.user_id, source_id=film_id))
+    await score_review(mongo, auth.user_id, film_id, None)
+    leaderboards.rate(film_id, previous.get('vote'), query.vote)
+    history.rate(film_id, previous.get('vote'), query.vote)
+    cache.put((MongoCollections.films, film_id, film['version']), film)
+    activity.record(auth.user_id, ActivityChoices.unrate_film, film_id)
+    return film
 
 
 async def get_film_rating(
+    response: Response,
     film_id: UUID = Path(title='Фильм ID'),
+    conditional: Conditional = Depends(),
     mongo: CRUDService = Depends(get_crud_service),
-) -> RatingResponse:
+    cache: ReadCache = Depends(get_read_cache),
+    versions: ReadCache = Depends(get_version_cache),
+) -> FilmRatingResponse:
     """Представление для получения рейтинга фильма.
 
     Args:
+        response: HTTP-ответ
         film_id: ID фильма
+        conditional: Условный запрос по ETag
         mongo: Объект для выполнения MongoDB-запросов
+        cache: Кэш чтения рейтингов
+        versions: Кэш версий документов
 
     Raises:
         NotFoundFilmError: Ошибка 404, если фильм не найден
 
     Returns:
-        RatingResponse: Рейтинг фильма
+        FilmRatingResponse: Рейтинг фильма
     """
-    film = await mongo.retrieve(collection=MongoCollections.films, doc_id=film_id)
-    if not film:
+    doc, outdated = await versions.get(
+        key=(MongoCollections.films, film_id),
+        load=lambda: mongo.retrieve(collection=MongoCollections.films, doc_id=film_id, projection={'version': 1}),
+    )
+    if not doc:
         raise NotFoundFilmError(status_code=HTTPStatus.NOT_FOUND)
-    return film.get('rating', {})
+    if not_modified := conditional.check(doc.get('version', 0)):
+        return not_modified
+    rating, stale = await cache.get(
+        key=(MongoCollections.films, film_id, doc.get('version', 0)),
+        load=lambda: mongo.aggregate(
+            collection=MongoCollections.films,
+            query=RetrieveRating(source_id=film_id),
+        ),
+    )
+    response.headers.update(stale_headers(outdated or stale))
+    return rating
 
 
 async def rate_review(
@@ -96,6 +180,8 @@ async def rate_review(
     review_id: UUID = Path(title='Ревью ID'),
     score: VotesChoices = Body(embed=True),
     mongo: CRUDService = Depends(get_crud_service),
+    cache: ReadCache = Depends(get_read_cache),
+    activity: ActivityService = Depends(get_activity_service),
 ) -> RatingResponse:
     """Представление для установления пользовательской оценки рецензии на фильм.
 
@@ -105,6 +191,8 @@ async def rate_review(
         review_id: ID рецензии
         score: Оценка пользователя
         mongo: Объект для выполнения MongoDB-запросов
+        cache: Кэш чтения рейтингов
+        activity: Сервис ленты активности пользователей
 
     Raises:
         NotFoundReviewError: Ошибка 404, если рецензия не найдена
@@ -112,13 +200,21 @@ async def rate_review(
     Returns:
         RatingResponse: Рейтинг рецензии на фильм
     """
-    review = await mongo.update(
-        collection=MongoCollections.reviews,
-        query=AddRating(user_id=auth.user_id, source_id=review_id, score=score),
-    )
-    if not review:
+    query = AddRating(user_id=auth.user_id, source_id=review_id, score=score)
+    previous = await mongo.update(collection=MongoCollections.reviews, query=query)
+    if not (review := query.outcome(previous)):
         raise NotFoundReviewError(status_code=HTTPStatus.NOT_FOUND)
-    return review.get('rating', {})
+    await mongo.update(
+        collection=MongoCollections.votes,
+        query=SaveVote(
+            user_id=auth.user_id, source_id=review_id, source=MongoCollections.reviews, score=score, date=query.date,
+        ),
+    )
+    film_id = previous.get('film_id', film_id)
+    await mongo.update(collection=MongoCollections.films, query=TouchFilm(film_id=film_id, upsert=False))
+    cache.put((MongoCollections.reviews, review_id, review['version']), review)
+    activity.record(auth.user_id, ActivityChoices.rate_review, film_id, review_id, score)
+    return review
 
 
 async def unrate_review(
@@ -126,6 +222,8 @@ async def unrate_review(
     film_id: UUID = Path(title='Фильм ID'),
     review_id: UUID = Path(title='Ревью ID'),
     mongo: CRUDService = Depends(get_crud_service),
+    cache: ReadCache = Depends(get_read_cache),
+    activity: ActivityService = Depends(get_activity_service),
 ) -> RatingResponse:
     """Представление для снятия пользовательской оценки рецензии на фильм.
 
@@ -134,6 +232,8 @@ async def unrate_review(
         film_id: ID фильма
         review_id: ID рецензии
         mongo: Объект для выполнения MongoDB-запросов
+        cache: Кэш чтения рейтингов
+        activity: Сервис ленты активности пользователей
 
     Raises:
         NotFoundReviewError: Ошибка 404, если рецензия не найдена
@@ -141,26 +241,37 @@ async def unrate_review(
     Returns:
         RatingResponse: Рейтинг рецензии на фильм
     """
-    review = await mongo.update(
-        collection=MongoCollections.reviews,
-        query=RemoveRating(user_id=auth.user_id, source_id=review_id),
-    )
-    if not review:
+    query = RemoveRating(user_id=auth.user_id, source_id=review_id)
+    previous = await mongo.update(collection=MongoCollections.reviews, query=query)
+    if not (review := query.outcome(previous)):
         raise NotFoundReviewError(status_code=HTTPStatus.NOT_FOUND)
-    return review.get('rating', {})
+    await mongo.delete(collection=MongoCollections.votes, query=DestroyVote(user_id=auth.user_id, source_id=review_id))
+    film_id = previous.get('film_id', film_id)
+    await mongo.update(collection=MongoCollections.films, query=TouchFilm(film_id=film_id, upsert=False))
+    cache.put((MongoCollections.reviews, review_id, review['version']), review)
+    activity.record(auth.user_id, ActivityChoices.unrate_review, film_id, review_id)
+    return review
 
 
 async def get_review_rating(
+    response: Response,
     film_id: UUID = Path(title='Фильм ID'),
     review_id: UUID = Path(title='Ревью ID'),
+    conditional: Conditional = Depends(),
     mongo: CRUDService = Depends(get_crud_service),
+    cache: ReadCache = Depends(get_read_cache),
+    versions: ReadCache = Depends(get_version_cache),
 ) -> RatingResponse:
     """Представление для получения рейтинга рецензии на фильм.
 
     Args:
+        response: HTTP-ответ
         film_id: ID фильма
         review_id: ID рецензии
+        conditional: Условный запрос по ETag
         mongo: Объект для выполнения MongoDB-запросов
+        cache: Кэш чтения рейтингов
+        versions: Кэш версий документов
 
     Raises:
         NotFoundReviewError: Ошибка 404, если рецензия не найдена
@@ -168,7 +279,20 @@ async def get_review_rating(
     Returns:
         RatingResponse: Рейтинг рецензии на фильм
     """
-    review = await mongo.retrieve(collection=MongoCollections.reviews, doc_id=review_id)
-    if not review:
+    doc, outdated = await versions.get(
+        key=(MongoCollections.reviews, review_id),
+        load=lambda: mongo.retrieve(collection=MongoCollections.reviews, doc_id=review_id, projection={'version': 1}),
+    )
+    if not doc:
         raise NotFoundReviewError(status_code=HTTPStatus.NOT_FOUND)
-    return review.get('rating', {})
+    if not_modified := conditional.check(doc.get('version', 0)):
+        return not_modified
+    rating, stale = await cache.get(
+        key=(MongoCollections.reviews, review_id, doc.get('version', 0)),
+        load=lambda: mongo.aggregate(
+            collection=MongoCollections.reviews,
+            query=RetrieveRating(source_id=review_id),
+        ),
+    )
+    response.headers.update(stale_headers(outdated or stale))
+    return rating
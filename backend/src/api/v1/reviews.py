@@ -1,17 +1,78 @@
+from functools import partial
 from http import HTTPStatus
+from typing import Dict, Optional
 from uuid import UUID
 
 from fastapi import Body, Depends, Path, Query, Response
+from motor.motor_asyncio import AsyncIOMotorClientSession
 from pymongo.errors import DuplicateKeyError
 
-from api.v1.base import Paginator
+from api.negotiation import BSONResponse
+from api.v1.base import Conditional, Paginator, stale_headers
+from services.activity import ActivityService, get_activity_service
 from services.auth import AuthService
+from services.cache import ReadCache, get_read_cache, get_version_cache
 from services.crud import CRUDService, get_crud_service
+from services.leaderboards import LeaderboardService, get_leaderboard_service
+from services.search import ReviewSearchService, get_review_search_service
+from core.config import CONFIG
 from core.enums import MongoCollections
 from core.exceptions import NotAuthorContentError, UniqueFilmReviewError
-from models.base import SortChoices
-from models.queries import CreateReview, DestroyReview, ListReview
-from models.responses import ReviewResponse
+from models.base import ActivityChoices, SortChoices
+from models.queries import CreateReview, DestroyReview, ListReview, ScoreReview, TouchFilm, vote_id
+from models.responses import ReviewResponse, ReviewSearchPageResponse
+
+
+async def insert_review(mongo: CRUDService, query: CreateReview, session: AsyncIOMotorClientSession) -> Dict:
+    """Функция для записи рецензии, оценки фильма её автором и количества рецензий у фильма в транзакции.
+
+    Args:
+        mongo: Объект для выполнения MongoDB-запросов
+        query: Запрос для создания рецензии
+        session: Сессия MongoDB с открытой транзакцией
+
+    Returns:
+        Dict: Созданная рецензия
+    """
+    created = await mongo.create(collection=MongoCollections.reviews, query=query, session=session)
+    vote = await mongo.retrieve(
+        collection=MongoCollections.votes,
+        doc_id=vote_id(query.author, query.film_id),
+        projection={'score': 1},
+        session=session,
+    )
+    if vote:
+        await mongo.update(
+            collection=MongoCollections.reviews,
+            query=ScoreReview(author=query.author, film_id=query.film_id, score=vote['score']),
+            session=session,
+        )
+        created['film_score'] = vote['score']
+    await mongo.update(
+        collection=MongoCollections.films, query=TouchFilm(film_id=query.film_id, reviews=1), session=session,
+    )
+    return created
+
+
+async def remove_review(mongo: CRUDService, query: DestroyReview, session: AsyncIOMotorClientSession) -> Dict:
+    """Функция для удаления рецензии и уменьшения количества рецензий у её фильма в транзакции.
+
+    Args:
+        mongo: Объект для выполнения MongoDB-запросов
+        query: Запрос для удаления рецензии
+        session: Сессия MongoDB с открытой транзакцией
+
+    Returns:
+        Dict: Удаленная рецензия или пустой результат, если пользователь не является её автором
+    """
+    deleted = await mongo.delete(collection=MongoCollections.reviews, query=query, session=session)
+    if deleted:
+        await mongo.update(
+            collection=MongoCollections.films,
+            query=TouchFilm(film_id=deleted['film_id'], reviews=-1, upsert=False),
+            session=session,
+        )
+    return deleted
 
 
 async def create_film_review(
@@ -19,14 +80,23 @@ async def create_film_review(
     film_id: UUID = Path(title='ID фильма'),
     text: str = Body(embed=True),
     mongo: CRUDService = Depends(get_crud_service),
+    leaderboards: LeaderboardService = Depends(get_leaderboard_service),
+    activity: ActivityService = Depends(get_activity_service),
 ) -> ReviewResponse:
     """Представление для создания пользователем рецензии на фильм.
 
+    Рецензия, оценка фильма её автором и количество рецензий у фильма записываются одной транзакцией,
+    поэтому счетчик не расходится с рецензиями при сбое между записями, а версия фильма увеличивается один раз.
+    Если автор оценит фильм одновременно с этим, то `rate_film` обновит рецензию уже после фиксации транзакции
+    или конфликт записи повторит транзакцию с его новым голосом.
+
     Args:
         auth: Аутентификация пользователя
         film_id: ID фильма
         text: Текст рецензии
         mongo: Объект для выполнения MongoDB-запросов
+        leaderboards: Сервис рейтингов фильмов за неделю
+        activity: Сервис ленты активности пользователей
 
     Raises:
         UniqueFilmReviewError: Ошибка 403, если у пользователя уже есть рецензия на данный фильм
@@ -34,13 +104,13 @@ async def create_film_review(
     Returns:
         ReviewResponse: Рецензия на фильм
     """
+    query = CreateReview(author=auth.user_id, film_id=film_id, text=text)
     try:
-        review = await mongo.create(
-            collection=MongoCollections.reviews,
-            query=CreateReview(author=auth.user_id, film_id=film_id, text=text),
-        )
+        review = await mongo.transaction(partial(insert_review, mongo, query))
     except DuplicateKeyError:
         raise UniqueFilmReviewError(status_code=HTTPStatus.FORBIDDEN)
+    leaderboards.review(film_id, review['pub_date'], 1)
+    activity.record(auth.user_id, ActivityChoices.create_review, film_id, review['_id'])
     return review
 
 
@@ -49,14 +119,20 @@ async def delete_film_review(
     film_id: UUID = Path(title='Фильм ID'),
     review_id: UUID = Path(title='Ревью ID'),
     mongo: CRUDService = Depends(get_crud_service),
+    leaderboards: LeaderboardService = Depends(get_leaderboard_service),
+    activity: ActivityService = Depends(get_activity_service),
 ) -> Response:
     """Представление для удаления пользователем рецензии на фильм.
 
+    Рецензия удаляется одной транзакцией с уменьшением количества рецензий у её фильма.
+
     Args:
         auth: Аутентификация пользователя
         film_id: ID фильма
         review_id: ID рецензии
         mongo: Объект для выполнения MongoDB-запросов
+        leaderboards: Сервис рейтингов фильмов за неделю
+        activity: Сервис ленты активности пользователей
 
     Raises:
         NotAuthorContentError: Ошибка 403, если пользователь не является автором рецензии
@@ -64,34 +140,78 @@ async def delete_film_review(
     Returns:
         Response: HTTP-ответ с кодом 204
     """
-    review = await mongo.delete(
-        collection=MongoCollections.reviews,
-        query=DestroyReview(id=review_id, author=auth.user_id),
-    )
-    if not review:
+    query = DestroyReview(id=review_id, author=auth.user_id)
+    if not (review := await mongo.transaction(partial(remove_review, mongo, query))):
         raise NotAuthorContentError(status_code=HTTPStatus.FORBIDDEN)
+    leaderboards.review(review['film_id'], review['pub_date'], -1)
+    activity.record(auth.user_id, ActivityChoices.delete_review, review['film_id'], review_id)
     return Response(status_code=HTTPStatus.NO_CONTENT)
 
 
 async def get_film_reviews(
+    response: Response,
     film_id: UUID = Path(title='Фильм ID'),
     sort: SortChoices = Query(default=SortChoices.top),
     page: Paginator = Depends(),
+    conditional: Conditional = Depends(),
     mongo: CRUDService = Depends(get_crud_service),
+    cache: ReadCache = Depends(get_read_cache),
+    versions: ReadCache = Depends(get_version_cache),
 ) -> ReviewResponse:
     """Представление для получения списка рецензий на фильм.
 
+    ETag списка строится по версии фильма, которая меняется вместе с оценками фильма и его рецензиями.
+
     Args:
+        response: HTTP-ответ
         film_id: ID фильма
         sort: Параметр сортировки
         page: Параметры страницы
+        conditional: Условный запрос по ETag
         mongo: Объект для выполнения MongoDB-запросов
+        cache: Кэш чтения списков рецензий
+        versions: Кэш версий документов
 
     Returns:
         ReviewResponse: Список рецензий на фильм
     """
-    reviews = await mongo.search(
-        collection=MongoCollections.reviews,
-        query=ListReview(film_id=film_id, sort=sort, offset=page.offset, limit=page.limit),
+    film, outdated = await versions.get(
+        key=(MongoCollections.films, film_id),
+        load=lambda: mongo.retrieve(collection=MongoCollections.films, doc_id=film_id, projection={'version': 1}),
+    )
+    if not_modified := conditional.check(film.get('version', 0)):
+        return not_modified
+    reviews, stale = await cache.get(
+        key=(MongoCollections.reviews, film_id, film.get('version', 0), sort, page.offset, page.limit),
+        load=lambda: mongo.search(
+            collection=MongoCollections.reviews,
+            query=ListReview(film_id=film_id, sort=sort, offset=page.offset, limit=page.limit),
+            raw=CONFIG.mongo.raw,
+        ),
     )
+    response.headers.update(stale_headers(outdated or stale))
+    if CONFIG.mongo.raw:
+        return BSONResponse(content=reviews, headers=dict(response.headers))
     return reviews
+
+
+async def search_reviews(
+    text: str = Query(alias='query', description='Поисковый запрос', min_length=1, max_length=CONFIG.fastapi.query),
+    film_id: Optional[UUID] = Query(default=None, description='ID фильма'),
+    cursor: Optional[str] = Query(default=None, description='Курсор следующей страницы из предыдущего ответа'),
+    limit: int = Query(default=10, description='Размер страницы', ge=1, le=100),
+    search: ReviewSearchService = Depends(get_review_search_service),
+) -> ReviewSearchPageResponse:
+    """Представление для полнотекстового поиска рецензий по всем фильмам или по одному фильму.
+
+    Args:
+        text: Поисковый запрос
+        film_id: ID фильма
+        cursor: Курсор следующей страницы
+        limit: Размер страницы
+        search: Сервис поиска рецензий
+
+    Returns:
+        ReviewSearchPageResponse: Рецензии от более релевантных к менее релевантным и курсор следующей страницы
+    """
+    return await search.search(text, film_id, cursor, limit)
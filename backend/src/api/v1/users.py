@@ -0,0 +1,64 @@
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from fastapi import Depends, Query
+
+from services.activity import ActivityService, get_activity_service
+from services.auth import AuthService
+from services.crud import CRUDService, get_crud_service
+from core.config import CONFIG
+from core.enums import MongoCollections
+from models.base import VotesChoices
+from models.queries import ListVotes
+from models.responses import ActivityPageResponse, VotesResponse
+
+
+async def get_user_votes(
+    auth: AuthService = Depends(),
+    films: List[UUID] = Query(default=[], description='ID фильмов', max_items=CONFIG.fastapi.batch),
+    reviews: List[UUID] = Query(default=[], description='ID рецензий', max_items=CONFIG.fastapi.batch),
+    mongo: CRUDService = Depends(get_crud_service),
+) -> VotesResponse:
+    """Представление для получения голосов пользователя по списку фильмов и рецензий.
+
+    Голоса читаются из коллекции голосов по индексу на пользователя, не затрагивая голоса внутри фильмов и рецензий.
+
+    Args:
+        auth: Аутентификация пользователя
+        films: ID фильмов
+        reviews: ID рецензий
+        mongo: Объект для выполнения MongoDB-запросов
+
+    Returns:
+        VotesResponse: Оценки пользователя по ID фильмов и рецензий, которые он оценил
+    """
+    result: Dict[str, Dict] = {MongoCollections.films.name: {}, MongoCollections.reviews.name: {}}
+    if not (source_ids := list(dict.fromkeys([*films, *reviews]))):
+        return result
+    votes = await mongo.search(
+        collection=MongoCollections.votes,
+        query=ListVotes(user_id=auth.user_id, source_ids=source_ids),
+    )
+    for vote in votes:
+        result[vote['source']][vote['source_id']] = VotesChoices(vote['score']).name
+    return result
+
+
+async def get_user_activity(
+    auth: AuthService = Depends(),
+    cursor: Optional[str] = Query(default=None, description='Курсор следующей страницы из предыдущего ответа'),
+    limit: int = Query(default=10, description='Размер страницы', ge=1, le=100),
+    activity: ActivityService = Depends(get_activity_service),
+) -> ActivityPageResponse:
+    """Представление для получения ленты активности пользователя: закладки, оценки и рецензии.
+
+    Args:
+        auth: Аутентификация пользователя
+        cursor: Курсор следующей страницы
+        limit: Размер страницы
+        activity: Сервис ленты активности пользователей
+
+    Returns:
+        ActivityPageResponse: Действия пользователя от новых к старым и курсор следующей страницы
+    """
+    return await activity.search(auth.user_id, cursor, limit)
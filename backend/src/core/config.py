@@ -9,6 +9,9 @@ class MongoConfig(BaseModel):
     host: str = 'localhost'
     port: int = 27017
     db: str = 'default'
+    raw: bool = False
+    pool: int = 10
+    timeout: int = 2000
 
 
 class LogstashConfig(BaseModel):
@@ -32,9 +35,54 @@ class FastApiConfig(BaseModel):
     debug: bool = False
     docs: str = 'openapi'
     secret_key: str = 'secret_key'
+    batch: int = 50
+    query: int = 200
+    drain: float = 10
     title: str = 'API для мониторинга пользовательского контента'
 
 
+class AdmissionConfig(BaseModel):
+    """Класс с настройками ограничения конкурентных запросов по группам маршрутов."""
+
+    ratings: int = 200
+    reviews: int = 100
+    writes: int = 100
+    target: float = 0.05
+    retry: int = 1
+
+
+class BreakerConfig(BaseModel):
+    """Класс с настройками автомата защиты MongoDB."""
+
+    window: int = 20
+    threshold: float = 0.5
+    latency: float = 1.0
+    cooldown: float = 5
+
+
+class CacheConfig(BaseModel):
+    """Класс с настройками кэша чтения рейтингов и рецензий."""
+
+    ttl: float = 5
+    stale: float = 30
+    error: float = 300
+    size: int = 10000
+    age: int = 1
+
+
+class CompressionConfig(BaseModel):
+    """Класс с настройками сжатия ответов."""
+
+    minimum: int = 1000
+    cache: int = 1000
+
+
+class ExportConfig(BaseModel):
+    """Класс с настройками потоковой выгрузки рецензий и рейтингов."""
+
+    batch: int = 1000
+
+
 class MainSettings(BaseSettings):
     """Класс с основными настройками проекта."""
 
@@ -42,6 +90,11 @@ class MainSettings(BaseSettings):
     mongo: MongoConfig = Field(default_factory=MongoConfig)
     sentry: SentryConfig = Field(default_factory=SentryConfig)
     logstash: LogstashConfig = Field(default_factory=LogstashConfig)
+    admission: AdmissionConfig = Field(default_factory=AdmissionConfig)
+    breaker: BreakerConfig = Field(default_factory=BreakerConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
+    export: ExportConfig = Field(default_factory=ExportConfig)
+    compression: CompressionConfig = Field(default_factory=CompressionConfig)
 
 
 @lru_cache()
@@ -1,4 +1,11 @@
 from enum import Enum
+from typing import Any, Dict, List, Tuple, Union
+
+IndexKey = Tuple[str, Union[int, str]]
+
+IndexKeys = Tuple[IndexKey, ...]
+
+DEFAULT_OPTIONS: Dict[str, Any] = {}
 
 
 class MongoCollections(Enum):
@@ -7,3 +14,54 @@ class MongoCollections(Enum):
     users = 'users'
     films = 'films'
     reviews = 'reviews'
+    leaderboards = 'leaderboards'
+    history = 'history'
+    votes = 'votes'
+    activity = 'activity'
+    jobs = 'jobs'
+    migrations = 'migrations'
+
+
+class MongoIndexes(Enum):
+    """Класс с перечислением индексов в MongoDB: коллекция, ключи индекса и его параметры."""
+
+    reviews_author_film = (MongoCollections.reviews, (('author', 1), ('film_id', 1)), {'unique': True})
+    reviews_film_pub_date = (MongoCollections.reviews, (('film_id', 1), ('pub_date', -1)), DEFAULT_OPTIONS)
+    reviews_text = (MongoCollections.reviews, (('text', 'text'),), {'default_language': 'russian'})
+    leaderboards_board_period_score = (
+        MongoCollections.leaderboards, (('board', 1), ('period', 1), ('score', -1)), DEFAULT_OPTIONS,
+    )
+    history_film_unit_period = (
+        MongoCollections.history, (('film_id', 1), ('unit', 1), ('period', 1)), DEFAULT_OPTIONS,
+    )
+    votes_user_source = (MongoCollections.votes, (('user_id', 1), ('source_id', 1)), {'unique': True})
+    activity_user_timestamp = (
+        MongoCollections.activity, (('user_id', 1), ('timestamp', -1), ('_id', -1)), DEFAULT_OPTIONS,
+    )
+
+    @property
+    def collection(self) -> MongoCollections:
+        """Коллекция, к которой относится индекс.
+
+        Returns:
+            MongoCollections: Коллекция
+        """
+        return self.value[0]
+
+    @property
+    def keys(self) -> List[IndexKey]:
+        """Ключи индекса в порядке следования.
+
+        Returns:
+            List[IndexKey]: Поля и направление сортировки или вид индекса
+        """
+        return list(self.value[1])
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        """Параметры создания индекса.
+
+        Returns:
+            Dict[str, Any]: Параметры индекса вместе с его именем
+        """
+        return {'name': self.name, **self.value[2]}
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, Optional
 
 from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
@@ -9,13 +9,14 @@ class UGCException(HTTPException):
 
     message: Optional[str] = None
 
-    def __init__(self, status_code: int):
+    def __init__(self, status_code: int, headers: Optional[Dict[str, str]] = None):
         """При инициализации исключения ожидает код ошибки HTTP.
 
         Args:
             status_code: Код ошибки
+            headers: Заголовки ответа
         """
-        super().__init__(status_code, detail=self.message)
+        super().__init__(status_code, detail=self.message, headers=headers)
 
     @staticmethod
     def handler(request: Request, exc: HTTPException) -> JSONResponse:
@@ -28,7 +29,7 @@ class UGCException(HTTPException):
         Returns:
             JSONResponse: Ответ сервера
         """
-        return JSONResponse(content={'message': exc.detail}, status_code=exc.status_code)
+        return JSONResponse(content={'message': exc.detail}, status_code=exc.status_code, headers=exc.headers)
 
 
 class NotFoundFilmError(UGCException):
@@ -55,4 +56,22 @@ class NotAuthorContentError(UGCException):
     message: str = 'Изменение чужого контента запрещено!'
 
 
+class NotAdminError(UGCException):
+    """Ошибка из-за обращения к административным данным без прав администратора."""
+
+    message: str = 'Доступ только для администраторов!'
+
+
+class InvalidCursorError(UGCException):
+    """Ошибка из-за курсора страницы, который не был выдан сервисом."""
+
+    message: str = 'Некорректный курсор страницы!'
+
+
+class ServiceUnavailableError(UGCException):
+    """Ошибка из-за перегрузки сервиса или недоступности базы данных."""
+
+    message: str = 'Сервис временно недоступен, повторите запрос позже!'
+
+
 exception_handlers = {exc: exc.handler for exc in UGCException.__subclasses__()}
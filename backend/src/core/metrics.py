@@ -0,0 +1,58 @@
+import os
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, make_asgi_app, multiprocess
+from starlette.types import ASGIApp
+
+COALESCED_READS = Counter(
+    'ugc_coalesced_reads_total',
+    'Количество запросов на чтение, которые дождались уже выполняющегося одинакового запроса к MongoDB',
+    ['collection'],
+)
+
+ADMISSION_QUEUE_TIME = Histogram(
+    'ugc_admission_queue_seconds',
+    'Время ожидания запроса в очереди перед обработкой',
+    ['group'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5),
+)
+
+ADMISSION_REJECTED = Counter(
+    'ugc_admission_rejected_total',
+    'Количество запросов, отклоненных с кодом 503 из-за перегрузки',
+    ['group'],
+)
+
+BREAKER_STATE = Gauge(
+    'ugc_circuit_breaker_state',
+    'Состояние автомата защиты MongoDB: 0 - замкнут, 1 - пробные запросы, 2 - разомкнут',
+    multiprocess_mode='max',
+)
+
+READ_CACHE = Counter(
+    'ugc_read_cache_total',
+    'Количество чтений через кэш: fresh - свежая запись, stale - устаревшая с фоновым обновлением, '
+    'error - устаревшая при недоступности MongoDB, miss - загрузка из MongoDB',
+    ['result'],
+)
+
+COMPRESSION_CACHE = Counter(
+    'ugc_compression_cache_total',
+    'Количество сжатых ответов: hit - сжатые байты взяты из кэша, miss - ответ сжат заново',
+    ['result'],
+)
+
+
+def metrics_app() -> ASGIApp:
+    """Функция для создания приложения, которое отдает метрики в формате Prometheus.
+
+    Если gunicorn запущен с несколькими воркерами и задан `PROMETHEUS_MULTIPROC_DIR`,
+    то метрики собираются со всех воркеров.
+
+    Returns:
+        ASGIApp: Приложение с метриками
+    """
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return make_asgi_app(registry)
+    return make_asgi_app()
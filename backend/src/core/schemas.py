@@ -0,0 +1,143 @@
+from core.enums import MongoCollections
+
+BINARY_FIELD = {'bsonType': 'binData'}
+
+NUMBER_FIELD = {'bsonType': 'number'}
+
+VOTES_SCHEMA = {
+    'bsonType': 'object',
+    'required': ['votes'],
+    'properties': {
+        'votes': {
+            'bsonType': 'array',
+            'items': {
+                'bsonType': 'object',
+                'required': ['user_id', 'score'],
+                'properties': {
+                    'user_id': BINARY_FIELD,
+                    'score': NUMBER_FIELD,
+                },
+            },
+        },
+    },
+}
+
+USERS_SCHEMA = {
+    'bsonType': 'object',
+    'required': ['_id', 'bookmarks'],
+    'properties': {
+        '_id': BINARY_FIELD,
+        'bookmarks': {
+            'bsonType': 'array',
+            'items': {
+                'bsonType': 'object',
+                'required': ['film_id'],
+                'properties': {
+                    'film_id': BINARY_FIELD,
+                },
+            },
+        },
+    },
+}
+
+FILMS_SCHEMA = {
+    'bsonType': 'object',
+    'required': ['_id', 'rating'],
+    'properties': {
+        '_id': BINARY_FIELD,
+        'review_count': NUMBER_FIELD,
+        'rating': VOTES_SCHEMA,
+    },
+}
+
+REVIEWS_SCHEMA = {
+    'bsonType': 'object',
+    'required': ['_id', 'rating'],
+    'properties': {
+        '_id': BINARY_FIELD,
+        'author': BINARY_FIELD,
+        'film_id': BINARY_FIELD,
+        'pub_date': {'bsonType': 'date'},
+        'film_score': {'bsonType': ['number', 'null']},
+        'rating': VOTES_SCHEMA,
+    },
+}
+
+LEADERBOARDS_SCHEMA = {
+    'bsonType': 'object',
+    'required': ['_id', 'board', 'period', 'film_id', 'score'],
+    'properties': {
+        '_id': BINARY_FIELD,
+        'board': {'bsonType': 'string'},
+        'period': {'bsonType': 'date'},
+        'film_id': BINARY_FIELD,
+        'score': NUMBER_FIELD,
+    },
+}
+
+HISTORY_SCHEMA = {
+    'bsonType': 'object',
+    'required': ['_id', 'film_id', 'unit', 'period'],
+    'properties': {
+        '_id': BINARY_FIELD,
+        'film_id': BINARY_FIELD,
+        'unit': {'enum': ['hour', 'day']},
+        'period': {'bsonType': 'date'},
+        'likes': NUMBER_FIELD,
+        'dislikes': NUMBER_FIELD,
+        'total': NUMBER_FIELD,
+    },
+}
+
+USER_VOTES_SCHEMA = {
+    'bsonType': 'object',
+    'required': ['_id', 'user_id', 'source_id', 'source', 'score'],
+    'properties': {
+        '_id': BINARY_FIELD,
+        'user_id': BINARY_FIELD,
+        'source_id': BINARY_FIELD,
+        'source': {'enum': [MongoCollections.films.name, MongoCollections.reviews.name]},
+        'score': NUMBER_FIELD,
+        'date': {'bsonType': 'date'},
+    },
+}
+
+ACTIVITY_SCHEMA = {
+    'bsonType': 'object',
+    'required': ['_id', 'user_id', 'action', 'film_id', 'timestamp'],
+    'properties': {
+        '_id': BINARY_FIELD,
+        'user_id': BINARY_FIELD,
+        'action': {'bsonType': 'string'},
+        'film_id': BINARY_FIELD,
+        'review_id': {'bsonType': ['binData', 'null']},
+        'score': {'bsonType': ['number', 'null']},
+        'timestamp': {'bsonType': 'date'},
+    },
+}
+
+JOBS_SCHEMA = {
+    'bsonType': 'object',
+    'required': ['_id', 'user_id', 'stage', 'processed', 'started'],
+    'properties': {
+        '_id': {'bsonType': 'string'},
+        'user_id': BINARY_FIELD,
+        'stage': NUMBER_FIELD,
+        'offset': NUMBER_FIELD,
+        'processed': NUMBER_FIELD,
+        'started': {'bsonType': 'date'},
+        'finished': {'bsonType': ['date', 'null']},
+    },
+}
+
+IMPORT_JOBS_SCHEMA = {
+    'bsonType': 'object',
+    'required': ['_id', 'offset', 'processed', 'started'],
+    'properties': {
+        '_id': {'bsonType': 'string', 'pattern': '^import:'},
+        'offset': NUMBER_FIELD,
+        'processed': NUMBER_FIELD,
+        'started': {'bsonType': 'date'},
+        'finished': {'bsonType': ['date', 'null']},
+    },
+}
@@ -0,0 +1,35 @@
+import asyncio
+import logging
+from typing import Coroutine, Set
+
+tasks: Set[asyncio.Task] = set()
+
+
+def spawn(coro: Coroutine) -> asyncio.Task:
+    """Функция для запуска фоновой задачи, которую воркер дождется перед остановкой.
+
+    Args:
+        coro: Корутина фоновой задачи
+
+    Returns:
+        asyncio.Task: Фоновая задача
+    """
+    task = asyncio.create_task(coro)
+    tasks.add(task)
+    task.add_done_callback(tasks.discard)
+    return task
+
+
+async def drain(timeout: float):
+    """Функция для ожидания фоновых задач (например, отложенных записей) при остановке воркера.
+
+    Args:
+        timeout: Крайний срок ожидания в секундах, после которого задачи отменяются
+    """
+    if not tasks:
+        return
+    _, pending = await asyncio.wait(set(tasks), timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        logging.error('При остановке воркера отменено фоновых задач: {count}'.format(count=len(pending)))
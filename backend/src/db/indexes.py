@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, NamedTuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+
+from core.enums import IndexKey, IndexKeys, MongoCollections, MongoIndexes
+
+
+class LiveIndex(NamedTuple):
+    """Индекс, который есть в MongoDB."""
+
+    collection: MongoCollections
+    name: str
+    keys: IndexKeys
+    accesses: int
+
+
+class IndexesDiff(NamedTuple):
+    """Расхождение объявленных в коде индексов с индексами в MongoDB."""
+
+    missing: List[MongoIndexes]
+    undeclared: List[LiveIndex]
+    unused: List[LiveIndex]
+
+
+def declared_keys(index: Dict[str, Any]) -> IndexKeys:
+    """Функция для получения ключей индекса в том виде, в каком они объявляются при создании.
+
+    Текстовый индекс хранится в MongoDB со служебными ключами `_fts` и `_ftsx`,
+    а проиндексированные поля перечислены в его весах.
+
+    Args:
+        index: Описание индекса из `index_information`
+
+    Returns:
+        IndexKeys: Поля и направление сортировки или вид индекса
+    """
+    keys: List[IndexKey] = []
+    for field, kind in index['key']:
+        if field == '_fts':
+            keys.extend((weighted, 'text') for weighted in sorted(index['weights']))
+        elif field != '_ftsx':
+            keys.append((field, kind))
+    return tuple(keys)
+
+
+async def get_live_indexes(mongo: AsyncIOMotorDatabase, collection: MongoCollections) -> List[LiveIndex]:
+    """Функция для получения индексов коллекции, кроме индекса по `_id`, вместе с количеством их использований.
+
+    Args:
+        mongo: Соединение с MongoDB
+        collection: Коллекция
+
+    Returns:
+        List[LiveIndex]: Индексы коллекции
+    """
+    information = await mongo[collection.name].index_information()
+    stats = await mongo[collection.name].aggregate([{'$indexStats': {}}]).to_list(None)
+    accesses = {index['name']: index['accesses']['ops'] for index in stats}
+    return [
+        LiveIndex(collection, name, declared_keys(index), accesses.get(name, 0))
+        for name, index in information.items() if name != '_id_'
+    ]
+
+
+async def diff_indexes(mongo: AsyncIOMotorDatabase) -> IndexesDiff:
+    """Функция для сравнения объявленных в `MongoIndexes` индексов с индексами в MongoDB.
+
+    Индексы сравниваются по ключам, а не по именам, поэтому созданный ранее индекс
+    с именем по умолчанию считается объявленным.
+
+    Args:
+        mongo: Соединение с MongoDB
+
+    Returns:
+        IndexesDiff: Недостающие, необъявленные и неиспользуемые индексы
+    """
+    collections = await mongo.list_collection_names()
+    collections_indexes = await asyncio.gather(*(
+        get_live_indexes(mongo, collection) for collection in MongoCollections if collection.name in collections
+    ))
+    live = [index for indexes in collections_indexes for index in indexes]
+    live_keys = {(index.collection, index.keys) for index in live}
+    expected_keys = {(index.collection, tuple(index.keys)) for index in MongoIndexes}
+    return IndexesDiff(
+        missing=[index for index in MongoIndexes if (index.collection, tuple(index.keys)) not in live_keys],
+        undeclared=[index for index in live if (index.collection, index.keys) not in expected_keys],
+        unused=[index for index in live if not index.accesses],
+    )
+
+
+async def create_indexes(mongo: AsyncIOMotorDatabase, indexes: List[MongoIndexes]):
+    """Функция для построения индексов.
+
+    Начиная с MongoDB 4.2 индекс строится без блокировки коллекции на всё время построения;
+    на наборе реплик сборку можно выполнять поочередно на каждой реплике (rolling build).
+    Индексы разных коллекций строятся одновременно.
+
+    Args:
+        mongo: Соединение с MongoDB
+        indexes: Индексы для построения
+    """
+    collections_models = {
+        collection: [IndexModel(index.keys, **index.options) for index in indexes if index.collection == collection]
+        for collection in MongoCollections
+    }
+    collections_models = {collection: models for collection, models in collections_models.items() if models}
+    await asyncio.gather(*(
+        mongo[collection.name].create_indexes(models) for collection, models in collections_models.items()
+    ))
+    for collection, models in collections_models.items():
+        logging.info('Построены индексы коллекции {collection}: {names}'.format(
+            collection=collection.name, names=', '.join(model.document['name'] for model in models),
+        ))
+
+
+def report(diff: IndexesDiff):
+    """Функция для вывода в лог расхождения индексов.
+
+    Args:
+        diff: Расхождение индексов
+    """
+    for index in diff.missing:
+        logging.warning('Нет индекса {name} в коллекции {collection}'.format(
+            name=index.name, collection=index.collection.name,
+        ))
+    for live in diff.undeclared:
+        logging.warning('Индекс {name} в коллекции {collection} не объявлен в MongoIndexes'.format(
+            name=live.name, collection=live.collection.name,
+        ))
+    for live in diff.unused:
+        logging.warning('Индекс {name} в коллекции {collection} не использовался с момента старта MongoDB'.format(
+            name=live.name, collection=live.collection.name,
+        ))
@@ -0,0 +1,267 @@
+import logging
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import CollectionInvalid
+
+from core.enums import MongoCollections, MongoIndexes
+from core import schemas
+from models.queries import vote_id
+
+BATCH_SIZE = 1000
+
+
+async def create_collection(mongo: AsyncIOMotorDatabase, collection: MongoCollections, schema: Dict):
+    """Функция для создания коллекции с валидатором или обновления валидатора у существующей коллекции.
+
+    Args:
+        mongo: Соединение с MongoDB
+        collection: Коллекция
+        schema: JSON-схема документов коллекции
+    """
+    try:
+        await mongo.create_collection(name=collection.name, validator={'$jsonSchema': schema})
+    except CollectionInvalid:
+        await mongo.command('collMod', collection.name, validator={'$jsonSchema': schema})
+
+
+async def initial(mongo: AsyncIOMotorDatabase):
+    """Миграция для создания коллекций пользователей, фильмов и рецензий.
+
+    Args:
+        mongo: Соединение с MongoDB
+    """
+    await create_collection(mongo, MongoCollections.users, schemas.USERS_SCHEMA)
+    await create_collection(mongo, MongoCollections.films, schemas.FILMS_SCHEMA)
+    await create_collection(mongo, MongoCollections.reviews, schemas.REVIEWS_SCHEMA)
+    await mongo[MongoCollections.reviews.name].create_index([('author', 1), ('film_id', 1)], unique=True)
+
+
+async def leaderboards(mongo: AsyncIOMotorDatabase):
+    """Миграция для создания коллекции рейтингов фильмов за неделю.
+
+    Args:
+        mongo: Соединение с MongoDB
+    """
+    index = MongoIndexes.leaderboards_board_period_score
+    await create_collection(mongo, MongoCollections.leaderboards, schemas.LEADERBOARDS_SCHEMA)
+    await mongo[index.collection.name].create_index(index.keys, **index.options)
+
+
+async def history(mongo: AsyncIOMotorDatabase):
+    """Миграция для создания коллекции истории рейтинга фильмов по часам и дням.
+
+    Args:
+        mongo: Соединение с MongoDB
+    """
+    index = MongoIndexes.history_film_unit_period
+    await create_collection(mongo, MongoCollections.history, schemas.HISTORY_SCHEMA)
+    await mongo[index.collection.name].create_index(index.keys, **index.options)
+
+
+async def votes(mongo: AsyncIOMotorDatabase):
+    """Миграция для создания коллекции голосов пользователей и её заполнения голосами из фильмов и рецензий.
+
+    Голоса переносятся пачками, а повторный запуск перезаписывает те же документы.
+
+    Args:
+        mongo: Соединение с MongoDB
+    """
+    index = MongoIndexes.votes_user_source
+    await create_collection(mongo, MongoCollections.votes, schemas.USER_VOTES_SCHEMA)
+    await mongo[index.collection.name].create_index(index.keys, **index.options)
+    for source in (MongoCollections.films, MongoCollections.reviews):
+        requests = []
+        cursor = mongo[source.name].aggregate([
+            {'$unwind': '$rating.votes'},
+            {'$project': {
+                '_id': 0,
+                'user_id': '$rating.votes.user_id',
+                'source_id': '$_id',
+                'source': {'$literal': source.name},
+                'score': '$rating.votes.score',
+                'date': '$rating.votes.date',
+            }},
+        ])
+        async for vote in cursor:
+            requests.append(ReplaceOne({'_id': vote_id(vote['user_id'], vote['source_id'])}, vote, upsert=True))
+            if len(requests) >= BATCH_SIZE:
+                await mongo[MongoCollections.votes.name].bulk_write(requests, ordered=False)
+                requests = []
+        if requests:
+            await mongo[MongoCollections.votes.name].bulk_write(requests, ordered=False)
+
+
+async def activity(mongo: AsyncIOMotorDatabase):
+    """Миграция для создания коллекции действий пользователей.
+
+    Args:
+        mongo: Соединение с MongoDB
+    """
+    index = MongoIndexes.activity_user_timestamp
+    await create_collection(mongo, MongoCollections.activity, schemas.ACTIVITY_SCHEMA)
+    await mongo[index.collection.name].create_index(index.keys, **index.options)
+
+
+async def jobs(mongo: AsyncIOMotorDatabase):
+    """Миграция для создания коллекции заданий по выгрузке и удалению данных пользователей.
+
+    Args:
+        mongo: Соединение с MongoDB
+    """
+    await create_collection(mongo, MongoCollections.jobs, schemas.JOBS_SCHEMA)
+
+
+async def import_jobs(mongo: AsyncIOMotorDatabase):
+    """Миграция для валидатора заданий, который допускает и задания загрузки данных.
+
+    Задание загрузки не относится к пользователю, а его ID начинается с `import:`.
+
+    Args:
+        mongo: Соединение с MongoDB
+    """
+    await create_collection(mongo, MongoCollections.jobs, {'anyOf': [schemas.JOBS_SCHEMA, schemas.IMPORT_JOBS_SCHEMA]})
+
+
+async def review_search(mongo: AsyncIOMotorDatabase):
+    """Миграция для создания текстового индекса по рецензиям.
+
+    Args:
+        mongo: Соединение с MongoDB
+    """
+    index = MongoIndexes.reviews_text
+    await mongo[index.collection.name].create_index(index.keys, **index.options)
+
+
+async def score_updates(mongo: AsyncIOMotorDatabase, reviews: List[Dict]) -> List[UpdateOne]:
+    """Функция для запросов записи оценки фильма автором в пачку рецензий.
+
+    Args:
+        mongo: Соединение с MongoDB
+        reviews: Рецензии с автором и фильмом
+
+    Returns:
+        List[UpdateOne]: Запросы обновления рецензий, в том числе без оценки, если автор не голосовал за фильм
+    """
+    ids = {vote_id(doc['author'], doc['film_id']): doc['_id'] for doc in reviews}
+    scores = dict.fromkeys(ids.values())
+    async for vote in mongo[MongoCollections.votes.name].find({'_id': {'$in': list(ids)}}, {'score': 1}):
+        scores[ids[vote['_id']]] = vote['score']
+    return [UpdateOne({'_id': review_id}, {'$set': {'film_score': scores[review_id]}}) for review_id in scores]
+
+
+async def review_scores(mongo: AsyncIOMotorDatabase):
+    """Миграция для записи в рецензии оценки фильма их автором, которая раньше соединялась из фильмов при чтении.
+
+    Оценки читаются пачками из коллекции голосов по ID голоса, а повторный запуск перезаписывает те же значения.
+
+    Args:
+        mongo: Соединение с MongoDB
+    """
+    await create_collection(mongo, MongoCollections.reviews, schemas.REVIEWS_SCHEMA)
+    cursor = mongo[MongoCollections.reviews.name].find({}, {'author': 1, 'film_id': 1})
+    while reviews := await cursor.to_list(BATCH_SIZE):
+        await mongo[MongoCollections.reviews.name].bulk_write(await score_updates(mongo, reviews), ordered=False)
+
+
+async def recount_reviews(mongo: AsyncIOMotorDatabase):
+    """Функция для пересчета количества рецензий у всех фильмов, в том числе после сбоя между записями.
+
+    Счетчики считаются и записываются в фильмы одной агрегацией на стороне MongoDB: фильмы с ненулевым счетчиком
+    дополняются количеством рецензий по фильмам, а версия меняется только у фильмов с изменившимся счетчиком.
+    Рецензии, созданные во время пересчета, могут быть не учтены до следующего запуска.
+
+    Args:
+        mongo: Соединение с MongoDB
+    """
+    cursor = mongo[MongoCollections.films.name].aggregate([
+        {'$match': {'review_count': {'$gt': 0}}},
+        {'$project': {'count': {'$literal': 0}}},
+        {'$unionWith': {
+            'coll': MongoCollections.reviews.name,
+            'pipeline': [{'$group': {'_id': '$film_id', 'count': {'$sum': 1}}}],
+        }},
+        {'$group': {'_id': '$_id', 'review_count': {'$sum': '$count'}}},
+        {'$merge': {
+            'into': MongoCollections.films.name,
+            'on': '_id',
+            'whenMatched': [{'$set': {
+                'review_count': '$$new.review_count',
+                'version': {'$cond': [
+                    {'$eq': [{'$ifNull': ['$review_count', 0]}, '$$new.review_count']},
+                    '$version',
+                    {'$add': [{'$ifNull': ['$version', 0]}, 1]},
+                ]},
+            }}],
+            'whenNotMatched': 'discard',
+        }},
+    ])
+    await cursor.to_list(None)
+
+
+async def review_counts(mongo: AsyncIOMotorDatabase):
+    """Миграция для заполнения количества рецензий у фильмов.
+
+    Args:
+        mongo: Соединение с MongoDB
+    """
+    await create_collection(mongo, MongoCollections.films, schemas.FILMS_SCHEMA)
+    await recount_reviews(mongo)
+
+
+async def review_listing(mongo: AsyncIOMotorDatabase):
+    """Миграция для создания индекса рецензий фильма по дате публикации.
+
+    Args:
+        mongo: Соединение с MongoDB
+    """
+    index = MongoIndexes.reviews_film_pub_date
+    await mongo[index.collection.name].create_index(index.keys, **index.options)
+
+
+MIGRATIONS: Tuple[Callable[[AsyncIOMotorDatabase], Awaitable], ...] = (
+    initial,
+    leaderboards,
+    history,
+    votes,
+    activity,
+    jobs,
+    import_jobs,
+    review_search,
+    review_scores,
+    review_counts,
+    review_listing,
+)
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+async def get_schema_version(mongo: AsyncIOMotorDatabase) -> int:
+    """Функция для получения версии схемы, до которой мигрирована база данных.
+
+    Args:
+        mongo: Соединение с MongoDB
+
+    Returns:
+        int: Номер последней примененной миграции
+    """
+    schema = await mongo[MongoCollections.migrations.name].find_one({'_id': 'schema'})
+    return schema['version'] if schema else 0
+
+
+async def migrate(mongo: AsyncIOMotorDatabase):
+    """Функция для применения миграций, которые еще не применены к базе данных.
+
+    Каждая миграция идемпотентна, поэтому одновременный запуск из нескольких контейнеров безопасен.
+
+    Args:
+        mongo: Соединение с MongoDB
+    """
+    version = await get_schema_version(mongo)
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        logging.info('Применение миграции {number}: {name}'.format(number=number, name=migration.__name__))
+        await migration(mongo)
+        await mongo[MongoCollections.migrations.name].update_one(
+            {'_id': 'schema'}, {'$max': {'version': number}}, upsert=True,
+        )
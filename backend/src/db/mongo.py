@@ -1,137 +1,98 @@
+import asyncio
 from typing import Optional
 
+from bson.binary import UuidRepresentation
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
-from pymongo.errors import CollectionInvalid
 
 from core.config import CONFIG
-from core.enums import MongoCollections
+from db.indexes import create_indexes, diff_indexes
+from db.migrations import SCHEMA_VERSION, get_schema_version, migrate
+
+RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument, uuid_representation=UuidRepresentation.STANDARD)
 
 mongo: Optional[AsyncIOMotorDatabase] = None
+ready: bool = False
 
 
-async def create_users_collection():
-    """Функция для создания коллекции пользователей."""
-    try:
-        await mongo.create_collection(
-            name=MongoCollections.users.name,
-            validator={
-                '$jsonSchema': {
-                    'bsonType': 'object',
-                    'required': ['_id', 'bookmarks'],
-                    'properties': {
-                        '_id': {'bsonType': 'binData'},
-                        'bookmarks': {
-                            'bsonType': 'array',
-                            'items': {
-                                'bsonType': 'object',
-                                'required': ['film_id'],
-                                'properties': {
-                                    'film_id': {'bsonType': 'binData'},
-                                },
-                            },
-                        },
-                    },
-                },
-            },
-        )
-    except CollectionInvalid:
-        pass
-
-
-async def create_films_collection():
-    """Функция для создания коллекции фильмов."""
-    try:
-        await mongo.create_collection(
-            name=MongoCollections.films.name,
-            validator={
-                '$jsonSchema': {
-                    'bsonType': 'object',
-                    'required': ['_id', 'rating'],
-                    'properties': {
-                        '_id': {'bsonType': 'binData'},
-                        'rating': {
-                            'bsonType': 'object',
-                            'required': ['votes'],
-                            'properties': {
-                                'votes': {
-                                    'bsonType': 'array',
-                                    'items': {
-                                        'bsonType': 'object',
-                                        'required': ['user_id', 'score'],
-                                        'properties': {
-                                            'user_id': {'bsonType': 'binData'},
-                                            'score': {'bsonType': 'number'},
-                                        },
-                                    },
-                                },
-                            },
-                        },
-                    },
-                },
-            },
-        )
-    except CollectionInvalid:
-        pass
-
-
-async def create_reviews_collection():
-    """Функция для создания коллекции рецензий."""
-    try:
-        await mongo.create_collection(
-            name=MongoCollections.reviews.name,
-            validator={
-                '$jsonSchema': {
-                    'bsonType': 'object',
-                    'required': ['_id', 'rating'],
-                    'properties': {
-                        '_id': {'bsonType': 'binData'},
-                        'author': {'bsonType': 'binData'},
-                        'film_id': {'bsonType': 'binData'},
-                        'pub_date': {'bsonType': 'date'},
-                        'rating': {
-                            'bsonType': 'object',
-                            'required': ['votes'],
-                            'properties': {
-                                'votes': {
-                                    'bsonType': 'array',
-                                    'items': {
-                                        'bsonType': 'object',
-                                        'required': ['user_id', 'score'],
-                                        'properties': {
-                                            'user_id': {'bsonType': 'binData'},
-                                            'score': {'bsonType': 'number'},
-                                        },
-                                    },
-                                },
-                            },
-                        },
-                    },
-                },
-            },
-        )
-    except CollectionInvalid:
-        pass
-    await mongo[MongoCollections.reviews.name].create_index([('author', 1), ('film_id', 1)], unique=True)
+def connect() -> AsyncIOMotorDatabase:
+    """Функция для создания соединения с MongoDB.
 
-
-async def start():
-    """Функция для подключения к хранилищу данных MongoDB."""
-    global mongo
-    mongo = AsyncIOMotorDatabase(
+    Returns:
+        AsyncIOMotorDatabase: Соединение с MongoDB
+    """
+    return AsyncIOMotorDatabase(
         name='ugc_database',
         client=AsyncIOMotorClient(
             host=CONFIG.mongo.host,
             port=CONFIG.mongo.port,
             uuidRepresentation='standard',
+            minPoolSize=CONFIG.mongo.pool,
+            serverSelectionTimeoutMS=CONFIG.mongo.timeout,
+            connectTimeoutMS=CONFIG.mongo.timeout,
         ),
     )
-    await create_users_collection()
-    await create_films_collection()
-    await create_reviews_collection()
+
+
+async def check_schema():
+    """Функция для проверки того, что база данных мигрирована до версии схемы, которую ожидает код.
+
+    Raises:
+        RuntimeError: Ошибка, если миграции не применены
+    """
+    version = await get_schema_version(mongo)
+    if version < SCHEMA_VERSION:
+        raise RuntimeError(
+            'Схема MongoDB версии {version}, а требуется {required}: выполните `python manage.py migrate`'.format(
+                version=version, required=SCHEMA_VERSION,
+            ),
+        )
+
+
+async def check_transactions():
+    """Функция для проверки того, что MongoDB поддерживает транзакции, в которых пишутся рецензии.
+
+    Транзакции доступны только в наборе реплик (хотя бы из одного узла) или в шардированном кластере,
+    а на одиночном сервере каждая запись рецензии завершалась бы ошибкой уже во время обработки запросов.
+
+    Raises:
+        RuntimeError: Ошибка, если MongoDB запущена одиночным сервером
+    """
+    hello = await mongo.command('hello')
+    if not hello.get('setName') and hello.get('msg') != 'isdbgrid':
+        raise RuntimeError(
+            'MongoDB запущена без набора реплик и не поддерживает транзакции: '
+            'запустите mongod с `--replSet rs0` и выполните `rs.initiate()`',
+        )
+
+
+async def warm_up():
+    """Функция для заполнения пула соединений до начала обработки запросов."""
+    await asyncio.gather(*(mongo.command('ping') for _ in range(CONFIG.mongo.pool)))
+
+
+async def start():
+    """Функция для подключения к хранилищу данных MongoDB.
+
+    Коллекции и индексы создаются отдельной командой `python manage.py migrate`,
+    а воркер только проверяет версию схемы и поддержку транзакций. В режиме отладки миграции
+    применяются сразу, как и построение недостающих индексов (`python manage.py indexes --apply`).
+    """
+    global mongo, ready
+    mongo = connect()
+    if CONFIG.fastapi.debug:
+        await migrate(mongo)
+        await create_indexes(mongo, (await diff_indexes(mongo)).missing)
+    await asyncio.gather(check_transactions(), check_schema())
+    await warm_up()
+    ready = True
 
 
 async def stop():
     """Функция для отключения от хранилища данных MongoDB."""
+    global ready
+    ready = False
     mongo.client.close()
 
 
@@ -3,13 +3,18 @@ import logging
 import sentry_sdk
 import uvicorn
 from fastapi import APIRouter, Depends, FastAPI, Header
-from fastapi.responses import ORJSONResponse
 from sentry_sdk.integrations.fastapi import FastApiIntegration
 
-from api.urls import routes
+from api.admission import AdmissionMiddleware
+from api.compression import CompressionMiddleware
+from api.dependencies import negotiate_format
+from api.negotiation import NegotiatedResponse
+from api.urls import health_routes, routes
 from core.config import CONFIG
 from core.exceptions import exception_handlers
 from core.logger import LOGGING, RequestIdFilter
+from core.metrics import metrics_app
+from core.tasks import drain
 from db import mongo
 
 if sentry := CONFIG.sentry.dsn:
@@ -32,8 +37,8 @@ app = FastAPI(
     version='1.0.0',
     docs_url=f'/{CONFIG.fastapi.docs}',
     openapi_url=f'/{CONFIG.fastapi.docs}.json',
-    default_response_class=ORJSONResponse,
-    dependencies=[Depends(logging_request_id)],
+    default_response_class=NegotiatedResponse,
+    dependencies=[Depends(logging_request_id), Depends(negotiate_format)],
     exception_handlers=exception_handlers,
 )
 
@@ -46,11 +51,19 @@ async def startup():
 
 @app.on_event('shutdown')
 async def shutdown():
-    """Отключаемся от хранилищу данных MongoDB при выключении сервера."""
+    """Дожидаемся фоновых записей и отключаемся от хранилища данных MongoDB при выключении сервера.
+
+    К этому моменту сервер уже перестал принимать соединения и дождался обработки начатых запросов.
+    """
+    await drain(timeout=CONFIG.fastapi.drain)
     await mongo.stop()
 
 
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(CompressionMiddleware)
 app.include_router(APIRouter(routes=routes), prefix='/api/v1')
+app.include_router(APIRouter(routes=health_routes))
+app.mount('/metrics', metrics_app())
 
 
 if __name__ == '__main__':
@@ -0,0 +1,183 @@
+import argparse
+import asyncio
+import logging
+from contextlib import closing
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from services.imports import import_records
+from services.privacy import UserDataJob
+from services.rebuilds import rebuild_history, rebuild_leaderboards
+from services.records import ImportSource
+from db import mongo
+from db.indexes import create_indexes, diff_indexes, report
+from db.migrations import migrate, recount_reviews
+from models.base import HistoryChoices, ImportChoices, week_start
+
+USER_DATA_BATCH = 500
+
+
+async def run_migrate(database: AsyncIOMotorDatabase, args: argparse.Namespace):
+    """Команда для применения миграций схемы MongoDB (коллекции, валидаторы и индексы).
+
+    Args:
+        database: Соединение с MongoDB
+        args: Аргументы командной строки
+    """
+    await migrate(database)
+
+
+async def run_indexes(database: AsyncIOMotorDatabase, args: argparse.Namespace):
+    """Команда для сравнения объявленных в коде индексов с индексами в MongoDB.
+
+    Args:
+        database: Соединение с MongoDB
+        args: Аргументы командной строки
+    """
+    diff = await diff_indexes(database)
+    report(diff)
+    if args.apply:
+        await create_indexes(database, diff.missing)
+
+
+async def run_leaderboards(database: AsyncIOMotorDatabase, args: argparse.Namespace):
+    """Команда для полного пересчета рейтингов фильмов за последние недели.
+
+    Args:
+        database: Соединение с MongoDB
+        args: Аргументы командной строки
+    """
+    current = week_start(datetime.now())
+    for weeks in range(args.weeks):
+        await rebuild_leaderboards(database, current - timedelta(weeks=weeks))
+
+
+async def run_history(database: AsyncIOMotorDatabase, args: argparse.Namespace):
+    """Команда для полного пересчета истории рейтинга фильмов по голосам пользователей.
+
+    Args:
+        database: Соединение с MongoDB
+        args: Аргументы командной строки
+    """
+    for unit in args.unit or HistoryChoices:
+        await rebuild_history(database, unit, args.batch)
+
+
+async def run_reviews(database: AsyncIOMotorDatabase, args: argparse.Namespace):
+    """Команда для пересчета количества рецензий у фильмов.
+
+    Args:
+        database: Соединение с MongoDB
+        args: Аргументы командной строки
+    """
+    await recount_reviews(database)
+
+
+async def run_export(database: AsyncIOMotorDatabase, args: argparse.Namespace):
+    """Команда для выгрузки всех данных пользователя в файл NDJSON.
+
+    Args:
+        database: Соединение с MongoDB
+        args: Аргументы командной строки
+    """
+    await UserDataJob(database, args.user, args.batch, args.pause).export(args.output)
+
+
+async def run_erase(database: AsyncIOMotorDatabase, args: argparse.Namespace):
+    """Команда для удаления всех данных пользователя.
+
+    Args:
+        database: Соединение с MongoDB
+        args: Аргументы командной строки
+    """
+    await UserDataJob(database, args.user, args.batch, args.pause).erase()
+
+
+async def run_import(database: AsyncIOMotorDatabase, args: argparse.Namespace):
+    """Команда для загрузки закладок, голосов или рецензий из файла NDJSON или CSV.
+
+    Args:
+        database: Соединение с MongoDB
+        args: Аргументы командной строки
+    """
+    await import_records(
+        database, ImportSource(args.kind, args.path), args.batch, args.concurrency, resume=not args.restart,
+    )
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Функция для описания команд и их аргументов.
+
+    Returns:
+        argparse.ArgumentParser: Парсер аргументов командной строки
+    """
+    parser = argparse.ArgumentParser(description='Команды для обслуживания хранилища UGC')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('migrate', help='Применение миграций схемы MongoDB')
+    command.set_defaults(handler=run_migrate)
+
+    command = commands.add_parser('indexes', help='Сравнение объявленных индексов с индексами в MongoDB')
+    command.add_argument('--apply', action='store_true', help='Построить недостающие индексы')
+    command.set_defaults(handler=run_indexes)
+
+    command = commands.add_parser('leaderboards', help='Пересчет рейтингов фильмов за неделю')
+    command.add_argument('--weeks', type=int, default=1, help='Количество последних недель для пересчета')
+    command.set_defaults(handler=run_leaderboards)
+
+    command = commands.add_parser('history', help='Пересчет истории рейтинга фильмов по голосам')
+    command.add_argument(
+        '--unit',
+        type=HistoryChoices,
+        action='append',
+        choices=[choice.value for choice in HistoryChoices],
+        help='Интервал истории, по умолчанию все',
+    )
+    command.add_argument('--batch', type=int, default=1000, help='Размер пачки документов')
+    command.set_defaults(handler=run_history)
+
+    command = commands.add_parser('reviews', help='Пересчет количества рецензий у фильмов')
+    command.set_defaults(handler=run_reviews)
+
+    command = commands.add_parser('export', help='Выгрузка всех данных пользователя в файл NDJSON')
+    command.add_argument('--user', type=UUID, required=True, help='ID пользователя')
+    command.add_argument('--output', required=True, help='Путь к файлу выгрузки')
+    command.add_argument('--batch', type=int, default=USER_DATA_BATCH, help='Размер пачки документов')
+    command.add_argument('--pause', type=float, default=0.1, help='Пауза в секундах между пачками')
+    command.set_defaults(handler=run_export)
+
+    command = commands.add_parser('erase', help='Удаление всех данных пользователя')
+    command.add_argument('--user', type=UUID, required=True, help='ID пользователя')
+    command.add_argument('--batch', type=int, default=USER_DATA_BATCH, help='Размер пачки документов')
+    command.add_argument('--pause', type=float, default=0.1, help='Пауза в секундах между пачками')
+    command.set_defaults(handler=run_erase)
+
+    command = commands.add_parser('import', help='Загрузка закладок, голосов или рецензий из файла NDJSON или CSV')
+    command.add_argument(
+        'kind', type=ImportChoices, choices=[choice.value for choice in ImportChoices], help='Вид записей',
+    )
+    command.add_argument('path', help='Путь к файлу, формат определяется по расширению')
+    command.add_argument('--batch', type=int, default=1000, help='Размер пачки записей')
+    command.add_argument('--concurrency', type=int, default=4, help='Количество пачек, которые пишутся одновременно')
+    command.add_argument('--restart', action='store_true', help='Начать загрузку файла заново')
+    command.set_defaults(handler=run_import)
+
+    return parser
+
+
+async def main(args: argparse.Namespace):
+    """Функция для выполнения команды с соединением с MongoDB, которое закрывается после команды.
+
+    Args:
+        args: Аргументы командной строки
+    """
+    database = mongo.connect()
+    with closing(database.client):
+        await args.handler(database, args)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(get_parser().parse_args()))
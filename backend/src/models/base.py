@@ -1,13 +1,20 @@
 from abc import ABC, abstractmethod
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime, time, timedelta, timezone
 from enum import Enum, IntEnum
-from typing import Callable, Dict, List, Union
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 from uuid import UUID, uuid4
 
+import msgpack
 import orjson
 from pydantic import BaseModel
 
 from core.config import CONFIG
 
+BINARY: ContextVar[bool] = ContextVar('binary', default=False)
+
 
 class VotesChoices(IntEnum):
     """Класс с перечислением оценок пользователем."""
@@ -24,6 +31,48 @@ class SortChoices(str, Enum):
     old = 'old'
 
 
+class LeaderboardChoices(str, Enum):
+    """Класс с перечислением рейтингов фильмов за неделю."""
+
+    top = 'top'
+    discussed = 'discussed'
+
+
+class ActivityChoices(str, Enum):
+    """Класс с перечислением действий пользователя."""
+
+    bookmark = 'bookmark'
+    unbookmark = 'unbookmark'
+    rate_film = 'rate_film'
+    unrate_film = 'unrate_film'
+    rate_review = 'rate_review'
+    unrate_review = 'unrate_review'
+    create_review = 'create_review'
+    delete_review = 'delete_review'
+
+
+class ExportChoices(str, Enum):
+    """Класс с перечислением форматов выгрузки."""
+
+    ndjson = 'ndjson'
+    csv = 'csv'
+
+
+class ImportChoices(str, Enum):
+    """Класс с перечислением видов загружаемых записей."""
+
+    bookmarks = 'bookmarks'
+    votes = 'votes'
+    reviews = 'reviews'
+
+
+class HistoryChoices(str, Enum):
+    """Класс с перечислением интервалов истории рейтинга."""
+
+    hour = 'hour'
+    day = 'day'
+
+
 def orjson_dumps(data: object, *, default: Callable) -> str:
     """Функция для декодирования в unicode для парсирования объектов на основе pydantic класса.
 
@@ -37,6 +86,105 @@ def orjson_dumps(data: object, *, default: Callable) -> str:
     return orjson.dumps(data, default=default).decode()
 
 
+def msgpack_default(value: Any) -> Any:
+    """Функция для упаковки в MessagePack типов, которых нет в формате: UUID - 16 байтами, время - Timestamp.
+
+    Время из MongoDB хранится без часового пояса в UTC.
+
+    Args:
+        value: Объект, который не может быть упакован напрямую
+
+    Raises:
+        TypeError: Ошибка, если тип объекта не поддерживается
+
+    Returns:
+        Any: Представление объекта в MessagePack
+    """
+    if isinstance(value, UUID):
+        return value.bytes
+    if isinstance(value, datetime):
+        return msgpack.Timestamp.from_datetime(value if value.tzinfo else value.replace(tzinfo=timezone.utc))
+    raise TypeError
+
+
+def negotiated(encoder: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Функция для кодирования поля модели ответа в зависимости от формата, запрошенного клиентом.
+
+    Args:
+        encoder: Кодирование поля для JSON
+
+    Returns:
+        Callable[[Any], Any]: Кодирование поля для JSON или MessagePack
+    """
+    return lambda value: msgpack_default(value) if BINARY.get() else encoder(value)
+
+
+def aggregate_votes(votes: Iterable[Dict]) -> Dict:
+    """Функция для подсчета рейтинга по голосам пользователей без создания объектов на каждый голос.
+
+    Оценки укладываются в компактный массив байтов, по которому голоса считаются на уровне C.
+    Если среди оценок есть значения вне диапазона байта, голоса считаются обычным счетчиком.
+
+    Args:
+        votes: Голоса пользователей в том виде, в каком они пришли из MongoDB
+
+    Returns:
+        Dict: Количество лайков, дизлайков и средняя оценка
+    """
+    scores = list(map(itemgetter('score'), votes))
+    try:
+        packed = bytes(scores)
+    except (TypeError, ValueError):
+        counter = Counter(scores)
+        return summarize_votes({choice: counter[choice.value] for choice in VotesChoices})
+    return summarize_votes({choice: packed.count(choice.value) for choice in VotesChoices})
+
+
+def summarize_votes(counts: Dict[VotesChoices, int]) -> Dict:
+    """Функция для подсчета рейтинга по количеству голосов каждого вида.
+
+    Args:
+        counts: Количество голосов по оценкам
+
+    Returns:
+        Dict: Количество лайков, дизлайков и средняя оценка
+    """
+    total_votes = sum(counts.values())
+    return {
+        'likes': counts[VotesChoices.like],
+        'dislikes': counts[VotesChoices.dislike],
+        'average_rating': sum(choice.value * count for choice, count in counts.items()) // total_votes
+        if total_votes else None,
+    }
+
+
+def week_start(date: datetime) -> datetime:
+    """Функция для получения начала недели (понедельник, 00:00), к которой относится момент времени.
+
+    Args:
+        date: Момент времени
+
+    Returns:
+        datetime: Начало недели
+    """
+    return datetime.combine(date.date() - timedelta(days=date.weekday()), time.min)
+
+
+def bucket_start(unit: HistoryChoices, date: datetime) -> datetime:
+    """Функция для получения начала часа или дня, к которому относится момент времени.
+
+    Args:
+        unit: Интервал истории рейтинга
+        date: Момент времени
+
+    Returns:
+        datetime: Начало интервала
+    """
+    if unit == HistoryChoices.day:
+        return datetime.combine(date.date(), time.min)
+    return date.replace(minute=0, second=0, microsecond=0)
+
+
 class OrjsonMixin(BaseModel):
     """Миксин для замены стандартной работы с json на более быструю."""
 
@@ -55,6 +203,14 @@ class MongoQuery(ABC, OrjsonMixin):
     def params(self) -> Dict:
         """Основной метод модели, представляющий собой параметры запроса в MongoDB."""
 
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Минимальный набор полей документа, который нужен для ответа на запрос.
+
+        Returns:
+            Optional[Dict]: Проекция документа или None, если нужен документ целиком
+        """
+
     def insert_operations(self, new_doc: Dict) -> Dict:
         """Представление параметров запроса для вставки нового документа.
 
@@ -66,9 +222,10 @@ class MongoQuery(ABC, OrjsonMixin):
         """
         return {
             'filter': {'_id': uuid4()},
-            'replacement': new_doc,
+            'replacement': {**new_doc, 'version': 1},
             'upsert': True,
             'return_document': True,
+            'projection': self.projection,
         }
 
     def find_operations(self, pipeline: List[Dict]) -> Dict:
@@ -80,26 +237,64 @@ class MongoQuery(ABC, OrjsonMixin):
         Returns:
             Dict: Параметры для операции поиска
         """
+        if self.projection:
+            pipeline = [*pipeline, {'$project': self.projection}]
         return {
             'pipeline': pipeline,
         }
 
-    def update_operations(self, doc_id: UUID, mapping: Union[Dict, List], upsert: bool = False) -> Dict:
+    def update_operations(
+        self,
+        doc_id: UUID,
+        mapping: Union[Dict, List],
+        upsert: bool = False,
+        return_document: bool = True,
+    ) -> Dict:
         """Представление параметров запроса для обновления документа.
 
+        Каждое обновление увеличивает версию документа, по которой строится ETag для условных GET-запросов.
+
         Args:
             doc_id: ID документа
             mapping: Изменения документа
             upsert: Выполнение вставки документа, если документа нет
+            return_document: Возврат документа после обновления, а не до него
+
+        Returns:
+            Dict: Параметры для операции обновления
+        """
+        return self.filter_update_operations(
+            {'_id': doc_id}, mapping, True if CONFIG.fastapi.debug else upsert, return_document,
+        )
+
+    def filter_update_operations(
+        self,
+        filtering: Dict,
+        mapping: Union[Dict, List],
+        upsert: bool = False,
+        return_document: bool = True,
+    ) -> Dict:
+        """Представление параметров запроса для обновления документа, найденного не по ID.
+
+        Args:
+            filtering: Фильтр, соответствующий обновляемому документу
+            mapping: Изменения документа
+            upsert: Выполнение вставки документа, если документа нет
+            return_document: Возврат документа после обновления, а не до него
 
         Returns:
             Dict: Параметры для операции обновления
         """
+        if isinstance(mapping, list):
+            mapping = [*mapping, {'$set': {'version': {'$add': [{'$ifNull': ['$version', 0]}, 1]}}}]
+        else:
+            mapping = {**mapping, '$inc': {**mapping.get('$inc', {}), 'version': 1}}
         return {
-            'filter': {'_id': doc_id},
+            'filter': filtering,
             'update': mapping,
-            'upsert': True if CONFIG.fastapi.debug else upsert,
-            'return_document': True,
+            'upsert': upsert,
+            'return_document': return_document,
+            'projection': self.projection,
         }
 
     def delete_operations(self, filtering: Dict) -> Dict:
@@ -113,8 +308,14 @@ class MongoQuery(ABC, OrjsonMixin):
         """
         return {
             'filter': filtering,
+            'projection': self.projection,
         }
 
 
 class APIResponse(ABC, OrjsonMixin):
     """Абстрактная модель ответа API, представляющий данные по HTTP."""
+
+    class Config:
+        """Настройки сериализации UUID и времени: строками в JSON и двоичными значениями в MessagePack."""
+
+        json_encoders = {UUID: negotiated(str), datetime: negotiated(datetime.isoformat)}
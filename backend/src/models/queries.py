@@ -1,10 +1,57 @@
-from datetime import datetime
-from typing import Dict
-from uuid import UUID
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid5
 
 from pydantic import Field, validator
 
-from models.base import MongoQuery, SortChoices, VotesChoices
+from core.config import CONFIG
+from core.enums import MongoCollections
+from models.base import (
+    ActivityChoices,
+    HistoryChoices,
+    LeaderboardChoices,
+    MongoQuery,
+    SortChoices,
+    VotesChoices,
+    summarize_votes,
+)
+
+
+def rating_fields(votes: str = '$rating.votes') -> Dict:
+    """Функция для подсчета рейтинга средствами MongoDB, чтобы голоса не покидали базу данных.
+
+    Args:
+        votes: Путь к массиву голосов в документе
+
+    Returns:
+        Dict: Выражения для количества лайков, дизлайков и средней оценки
+    """
+    return {
+        'likes': {'$size': {'$filter': {
+            'input': {'$ifNull': [votes, []]},
+            'cond': {'$eq': ['$$this.score', VotesChoices.like.value]},
+        }}},
+        'dislikes': {'$size': {'$filter': {
+            'input': {'$ifNull': [votes, []]},
+            'cond': {'$eq': ['$$this.score', VotesChoices.dislike.value]},
+        }}},
+        'average_rating': {'$toInt': {
+            '$avg': '{votes}.score'.format(votes=votes),
+        }},
+    }
+
+
+def vote_id(user_id: UUID, source_id: UUID) -> UUID:
+    """Функция для получения ID голоса пользователя, однозначно определяемого пользователем и фильмом или рецензией.
+
+    Args:
+        user_id: ID пользователя
+        source_id: ID фильма или рецензии
+
+    Returns:
+        UUID: ID документа с голосом
+    """
+    return uuid5(source_id, user_id.hex)
 
 
 class AddBookmark(MongoQuery):
@@ -24,6 +71,39 @@ class AddBookmark(MongoQuery):
         mapping['$addToSet'] = {'bookmarks': {'film_id': self.film_id}}
         return self.update_operations(self.user_id, mapping, upsert=True)
 
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция документа с пользователем, достаточная для ответа.
+
+        Returns:
+            Optional[Dict]: Только список закладок
+        """
+        return {'_id': 0, 'bookmarks': 1}
+
+
+class ListBookmark(MongoQuery):
+    """Модель запроса для получения страницы закладок пользователя."""
+
+    user_id: UUID
+    offset: int
+    limit: int
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для получения закладок пользователя, по документу на закладку.
+
+        Returns:
+            Dict: Запрос для поиска закладок в документе с пользователем
+        """
+        pipeline = []
+        pipeline.extend([
+            {'$match': {'_id': self.user_id}},
+            {'$project': {'_id': 0, 'bookmarks': {'$slice': ['$bookmarks', self.offset, self.limit]}}},
+            {'$unwind': '$bookmarks'},
+            {'$replaceWith': '$bookmarks'},
+        ])
+        return self.find_operations(pipeline)
+
 
 class RemoveBookmark(MongoQuery):
     """Модель запроса для изъятия фильма из закладок пользователя."""
@@ -42,13 +122,90 @@ class RemoveBookmark(MongoQuery):
         mapping['$pull'] = {'bookmarks': {'film_id': self.film_id}}
         return self.update_operations(self.user_id, mapping)
 
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция документа с пользователем, достаточная для ответа.
 
-class AddRating(MongoQuery):
-    """Модель запроса для установления пользовательской оценки."""
+        Returns:
+            Optional[Dict]: Только список закладок
+        """
+        return {'_id': 0, 'bookmarks': 1}
+
+
+class RatingQuery(MongoQuery):
+    """Модель запроса для изменения пользовательской оценки, который возвращает документ до обновления.
+
+    По документу до обновления видно прежний голос пользователя, поэтому рейтинг после обновления
+    и изменения рейтингов фильмов за неделю считаются без повторного чтения из MongoDB.
+    """
 
     user_id: UUID
     source_id: UUID
+
+    @property
+    def vote(self) -> Optional[Dict]:
+        """Голос пользователя после обновления.
+
+        Returns:
+            Optional[Dict]: Голос или None, если оценка снимается
+        """
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция документа до обновления с подсчитанным рейтингом и прежним голосом пользователя.
+
+        Returns:
+            Optional[Dict]: Рейтинг, количество рецензий, версия, фильм рецензии и голос пользователя
+        """
+        return {
+            '_id': 0,
+            'version': 1,
+            'review_count': 1,
+            'film_id': 1,
+            **rating_fields(),
+            'vote': {'$first': {'$filter': {
+                'input': {'$ifNull': ['$rating.votes', []]},
+                'cond': {'$eq': ['$$this.user_id', self.user_id]},
+            }}},
+        }
+
+    def outcome(self, previous: Dict) -> Dict:
+        """Рейтинг после обновления, посчитанный по документу до обновления.
+
+        Args:
+            previous: Документ до обновления
+
+        Returns:
+            Dict: Рейтинг и версия документа после обновления или пустой словарь, если документа нет
+        """
+        if not previous and not CONFIG.fastapi.debug:
+            return {}
+        counts = {VotesChoices.like: previous.get('likes', 0), VotesChoices.dislike: previous.get('dislikes', 0)}
+        if vote := previous.get('vote'):
+            counts[VotesChoices(vote['score'])] -= 1
+        if self.vote:
+            counts[VotesChoices(self.vote['score'])] += 1
+        return {
+            **summarize_votes(counts),
+            'review_count': previous.get('review_count', 0),
+            'version': previous.get('version', 0) + 1,
+        }
+
+
+class AddRating(RatingQuery):
+    """Модель запроса для установления пользовательской оценки."""
+
     score: VotesChoices
+    date: datetime = Field(default_factory=datetime.now)
+
+    @property
+    def vote(self) -> Optional[Dict]:
+        """Голос пользователя после обновления.
+
+        Returns:
+            Optional[Dict]: Оценка пользователя и время голосования
+        """
+        return {'user_id': self.user_id, 'score': self.score.value, 'date': self.date}
 
     @property
     def params(self) -> Dict:
@@ -61,7 +218,7 @@ class AddRating(MongoQuery):
         pipeline.append(
             {'$set': {'rating.votes': {
                 '$concatArrays': [
-                    [{'user_id': self.user_id, 'score': self.score.value}],
+                    [self.vote],
                     {'$filter': {
                         'input': {'$ifNull': ['$rating.votes', []]},
                         'cond': {'$ne': ['$$this.user_id', self.user_id]},
@@ -69,15 +226,12 @@ class AddRating(MongoQuery):
                 ]},
             }},
         )
-        return self.update_operations(self.source_id, pipeline)
+        return self.update_operations(self.source_id, pipeline, return_document=False)
 
 
-class RemoveRating(MongoQuery):
+class RemoveRating(RatingQuery):
     """Модель запроса для снятия пользовательской оценки."""
 
-    user_id: UUID
-    source_id: UUID
-
     @property
     def params(self) -> Dict:
         """Параметры запроса для обновления рейтинга фильма или рецензии.
@@ -87,7 +241,102 @@ class RemoveRating(MongoQuery):
         """
         mapping = {}
         mapping['$pull'] = {'rating.votes': {'user_id': {'$eq': self.user_id}}}
-        return self.update_operations(self.source_id, mapping)
+        return self.update_operations(self.source_id, mapping, return_document=False)
+
+
+class RetrieveRating(MongoQuery):
+    """Модель запроса для получения рейтинга фильма или рецензии без выгрузки голосов."""
+
+    source_id: UUID
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для подсчета рейтинга фильма или рецензии на стороне MongoDB.
+
+        Returns:
+            Dict: Запрос для агрегации документа с фильмом или рецензией
+        """
+        pipeline = []
+        pipeline.extend([
+            {'$match': {'_id': self.source_id}},
+            {'$project': {'_id': 0, 'version': 1, 'review_count': 1, **rating_fields()}},
+        ])
+        return self.find_operations(pipeline)
+
+
+class ListRating(MongoQuery):
+    """Модель запроса для получения рейтинга нескольких фильмов или рецензий за один запрос."""
+
+    source_ids: List[UUID]
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для подсчета рейтинга фильмов или рецензий на стороне MongoDB.
+
+        Returns:
+            Dict: Запрос для агрегации документов с фильмами или рецензиями
+        """
+        pipeline = []
+        pipeline.extend([
+            {'$match': {'_id': {'$in': self.source_ids}}},
+            {'$project': {'version': 1, 'review_count': 1, **rating_fields()}},
+        ])
+        return self.find_operations(pipeline)
+
+
+class ExportRatings(MongoQuery):
+    """Модель запроса для выгрузки рейтинга всех фильмов."""
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для подсчета рейтинга каждого фильма на стороне MongoDB.
+
+        Returns:
+            Dict: Запрос для агрегации всех документов с фильмами
+        """
+        return self.find_operations([])
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция фильмов сразу в виде строки выгрузки.
+
+        Returns:
+            Optional[Dict]: ID фильма и его рейтинг
+        """
+        return {'_id': 0, 'film_id': '$_id', **rating_fields()}
+
+
+class TouchFilm(MongoQuery):
+    """Модель запроса для смены версии и количества рецензий фильма, когда меняются его рецензии."""
+
+    film_id: UUID
+    reviews: int = 0
+    upsert: bool = True
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для увеличения версии фильма, от которой зависит ETag списка рецензий.
+
+        Количество рецензий меняется на `reviews` тем же обновлением, что и версия, то есть атомарно.
+        Фильм создается, если его еще нет, только при `upsert`.
+
+        Returns:
+            Dict: Запрос для обновления документа с фильмом
+        """
+        mapping: Dict[str, Dict] = {}
+        mapping['$setOnInsert'] = {'rating': {'votes': []}}
+        if self.reviews:
+            mapping['$inc'] = {'review_count': self.reviews}
+        return self.update_operations(self.film_id, mapping, upsert=self.upsert)
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция документа с фильмом, достаточная для проверки обновления.
+
+        Returns:
+            Optional[Dict]: Только версия фильма
+        """
+        return {'_id': 0, 'version': 1}
 
 
 class CreateReview(MongoQuery):
@@ -109,6 +358,15 @@ class CreateReview(MongoQuery):
         new_doc['rating'] = {'votes': []}
         return self.insert_operations(new_doc)
 
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция новой рецензии без голосов, которых у неё пока нет.
+
+        Returns:
+            Optional[Dict]: Рецензия без рейтинга
+        """
+        return {'rating': 0}
+
 
 class DestroyReview(MongoQuery):
     """Модель запроса для удаления пользователем рецензии на фильм."""
@@ -126,12 +384,52 @@ class DestroyReview(MongoQuery):
         filtering = self.dict(by_alias=True)
         return self.delete_operations(filtering)
 
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция удаленной рецензии, достаточная для проверки факта удаления и обновления её фильма.
+
+        Returns:
+            Optional[Dict]: ID рецензии, её фильм и дата публикации
+        """
+        return {'_id': 1, 'film_id': 1, 'pub_date': 1}
+
     class Config:
         """Настройки валидации."""
 
         allow_population_by_field_name = True
 
 
+class ScoreReview(MongoQuery):
+    """Модель запроса для копирования оценки фильма в рецензию автора на этот фильм."""
+
+    author: UUID
+    film_id: UUID
+    score: Optional[VotesChoices]
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для обновления оценки фильма в рецензии.
+
+        Рецензия ищется по уникальному индексу автора и фильма, поэтому запрос меняет не больше одного документа
+        и не создает рецензию, если её нет.
+
+        Returns:
+            Dict: Запрос для обновления документа с рецензией
+        """
+        mapping = {}
+        mapping['$set'] = {'film_score': None if self.score is None else self.score.value}
+        return self.filter_update_operations({'author': self.author, 'film_id': self.film_id}, mapping)
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция рецензии, достаточная для проверки, что она есть.
+
+        Returns:
+            Optional[Dict]: Только ID рецензии
+        """
+        return {'_id': 1}
+
+
 class ListReview(MongoQuery):
     """Модель запроса для получения списка рецензий по фильму с возможностью гибкой сортировки."""
 
@@ -163,40 +461,523 @@ class ListReview(MongoQuery):
     def params(self) -> Dict:
         """Параметры запроса для получения рецензий по фильму.
 
+        Оценка фильма автором хранится в самой рецензии, поэтому рецензии читаются из одной коллекции.
+
         Returns:
             Dict: Запрос для поиска документов с рецензиями
         """
         pipeline = []
         pipeline.extend([
             {'$match': {'film_id': self.film_id}},
-            {'$lookup': {
-                'from': 'films',
-                'let': {'author': '$author'},
-                'pipeline': [
-                    {'$match': {'_id': self.film_id}},
-                    {'$unwind': '$rating.votes'},
-                    {'$match': {'$expr': {'$eq': ['$rating.votes.user_id', '$$author']}}},
+            {'$addFields': rating_fields()},
+            {'$sort': self.sort},
+            {'$skip': self.offset},
+            {'$limit': self.limit},
+        ])
+        return self.find_operations(pipeline)
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция рецензий сразу в виде ответа API, без голосов и вспомогательных данных.
+
+        Returns:
+            Optional[Dict]: Рецензии без голосов
+        """
+        return {
+            '_id': 0,
+            'id': '$_id',
+            'author': 1,
+            'film_id': 1,
+            'text': 1,
+            'pub_date': 1,
+            'film_score': {'$switch': {
+                'branches': [
+                    {'case': {'$eq': ['$film_score', choice.value]}, 'then': choice.name} for choice in VotesChoices
                 ],
-                'as': 'films',
+                'default': None,
             }},
-            {'$addFields': {
-                'film_score': {
-                    '$first': '$films.rating.votes.score',
-                },
-                'likes': {'$size': {'$filter': {
-                    'input': '$rating.votes',
-                    'cond': {'$eq': ['$$this.score', VotesChoices.like.value]},
-                }}},
-                'dislikes': {'$size': {'$filter': {
-                    'input': '$rating.votes',
-                    'cond': {'$eq': ['$$this.score', VotesChoices.dislike.value]},
-                }}},
-                'average_rating': {
-                    '$avg': '$rating.votes.score',
-                },
+            'likes': 1,
+            'dislikes': 1,
+            'average_rating': 1,
+        }
+
+
+class SearchReviews(MongoQuery):
+    """Модель запроса для полнотекстового поиска рецензий по текстовому индексу после курсора."""
+
+    text: str
+    film_id: Optional[UUID]
+    relevance: Optional[float]
+    last_id: Optional[UUID]
+    limit: int
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для поиска рецензий от более релевантных к менее релевантным.
+
+        Returns:
+            Dict: Запрос для поиска документов с рецензиями
+        """
+        filtering: Dict[str, Any] = {'$text': {'$search': self.text}}
+        if self.film_id:
+            filtering['film_id'] = self.film_id
+        pipeline: List[Dict[str, Any]] = [
+            {'$match': filtering},
+            {'$addFields': {'relevance': {'$meta': 'textScore'}}},
+        ]
+        if self.relevance is not None:
+            pipeline.append({'$match': {'$or': [
+                {'relevance': {'$lt': self.relevance}},
+                {'relevance': self.relevance, '_id': {'$lt': self.last_id}},
+            ]}})
+        pipeline.extend([
+            {'$sort': {'relevance': -1, '_id': -1}},
+            {'$limit': self.limit},
+        ])
+        return self.find_operations(pipeline)
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция рецензий сразу в виде ответа API вместе с релевантностью.
+
+        Returns:
+            Optional[Dict]: Рецензии без голосов
+        """
+        return {
+            '_id': 0,
+            'id': '$_id',
+            'author': 1,
+            'film_id': 1,
+            'text': 1,
+            'pub_date': 1,
+            'film_score': 1,
+            'relevance': 1,
+            **rating_fields(),
+        }
+
+
+class ExportReviews(MongoQuery):
+    """Модель запроса для выгрузки всех рецензий или рецензий по фильму."""
+
+    film_id: Optional[UUID]
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для выгрузки рецензий с рейтингом, посчитанным на стороне MongoDB.
+
+        Рецензии по фильму идут от новых к старым по индексу, а все рецензии - в порядке хранения без сортировки.
+
+        Returns:
+            Dict: Запрос для поиска документов с рецензиями
+        """
+        pipeline = []
+        if self.film_id:
+            pipeline.extend([
+                {'$match': {'film_id': self.film_id}},
+                {'$sort': {'pub_date': -1}},
+            ])
+        return self.find_operations(pipeline)
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция рецензий сразу в виде строки выгрузки.
+
+        Returns:
+            Optional[Dict]: Рецензии без голосов
+        """
+        return {
+            '_id': 0,
+            'id': '$_id',
+            'author': 1,
+            'film_id': 1,
+            'text': 1,
+            'pub_date': 1,
+            **rating_fields(),
+        }
+
+
+class ScoreLeaderboard(MongoQuery):
+    """Модель запроса для изменения очков фильма в рейтинге за неделю."""
+
+    board: LeaderboardChoices
+    film_id: UUID
+    period: datetime
+    delta: int
+
+    @property
+    def doc_id(self) -> UUID:
+        """ID позиции фильма в рейтинге, однозначно определяемый рейтингом, неделей и фильмом.
+
+        Returns:
+            UUID: ID документа
+        """
+        return uuid5(self.film_id, '{board}:{period:%Y-%m-%d}'.format(board=self.board.value, period=self.period))
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для увеличения или уменьшения очков фильма.
+
+        Returns:
+            Dict: Запрос для обновления документа с позицией фильма в рейтинге
+        """
+        mapping: Dict[str, Dict] = {}
+        mapping['$inc'] = {'score': self.delta}
+        mapping['$setOnInsert'] = {'board': self.board.value, 'period': self.period, 'film_id': self.film_id}
+        return self.update_operations(self.doc_id, mapping, upsert=True)
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция позиции фильма в рейтинге, достаточная для проверки обновления.
+
+        Returns:
+            Optional[Dict]: Только ID документа
+        """
+        return {'_id': 1}
+
+
+class ListLeaderboard(MongoQuery):
+    """Модель запроса для получения первых фильмов рейтинга за неделю по индексу без сортировки в памяти."""
+
+    board: LeaderboardChoices
+    period: datetime
+    limit: int
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для получения первых фильмов рейтинга.
+
+        Returns:
+            Dict: Запрос для поиска документов с позициями фильмов
+        """
+        pipeline = []
+        pipeline.extend([
+            {'$match': {'board': self.board.value, 'period': self.period}},
+            {'$sort': {'score': -1}},
+            {'$limit': self.limit},
+        ])
+        return self.find_operations(pipeline)
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция позиций фильмов сразу в виде ответа API.
+
+        Returns:
+            Optional[Dict]: ID фильма и его очки
+        """
+        return {'_id': 0, 'film_id': 1, 'score': 1}
+
+
+class RankFilms(MongoQuery):
+    """Модель запроса для полного пересчета очков фильмов по голосам, поданным за неделю."""
+
+    period: datetime
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для подсчета лайков за вычетом дизлайков по каждому фильму.
+
+        Returns:
+            Dict: Запрос для агрегации документов с фильмами
+        """
+        interval = {'$gte': self.period, '$lt': self.period + timedelta(weeks=1)}
+        pipeline = []
+        pipeline.extend([
+            {'$match': {'rating.votes.date': interval}},
+            {'$unwind': '$rating.votes'},
+            {'$match': {'rating.votes.date': interval}},
+            {'$group': {'_id': '$_id', 'score': {'$sum': {
+                '$cond': [{'$eq': ['$rating.votes.score', VotesChoices.like.value]}, 1, -1],
+            }}}},
+        ])
+        return self.find_operations(pipeline)
+
+
+class RankReviews(MongoQuery):
+    """Модель запроса для полного пересчета количества рецензий на фильмы, опубликованных за неделю."""
+
+    period: datetime
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для подсчета рецензий по каждому фильму.
+
+        Returns:
+            Dict: Запрос для агрегации документов с рецензиями
+        """
+        pipeline = []
+        pipeline.extend([
+            {'$match': {'pub_date': {'$gte': self.period, '$lt': self.period + timedelta(weeks=1)}}},
+            {'$group': {'_id': '$film_id', 'score': {'$sum': 1}}},
+        ])
+        return self.find_operations(pipeline)
+
+
+class RecordHistory(MongoQuery):
+    """Модель запроса для учета изменения рейтинга фильма в документе за час или день (шаблон bucket)."""
+
+    film_id: UUID
+    unit: HistoryChoices
+    period: datetime
+    likes: int
+    dislikes: int
+    total: int
+
+    @property
+    def doc_id(self) -> UUID:
+        """ID документа за интервал, однозначно определяемый фильмом, интервалом и его началом.
+
+        Returns:
+            UUID: ID документа
+        """
+        return uuid5(self.film_id, '{unit}:{period:%Y-%m-%dT%H}'.format(unit=self.unit.value, period=self.period))
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для увеличения счетчиков лайков, дизлайков и суммы оценок за интервал.
+
+        Returns:
+            Dict: Запрос для обновления документа с историей рейтинга
+        """
+        mapping: Dict[str, Dict] = {}
+        mapping['$inc'] = {'likes': self.likes, 'dislikes': self.dislikes, 'total': self.total}
+        mapping['$setOnInsert'] = {'film_id': self.film_id, 'unit': self.unit.value, 'period': self.period}
+        return self.update_operations(self.doc_id, mapping, upsert=True)
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция документа с историей рейтинга, достаточная для проверки обновления.
+
+        Returns:
+            Optional[Dict]: Только ID документа
+        """
+        return {'_id': 1}
+
+
+class ListHistory(MongoQuery):
+    """Модель запроса для получения истории рейтинга фильма за период одним запросом по индексу."""
+
+    film_id: UUID
+    unit: HistoryChoices
+    since: datetime
+    until: datetime
+    limit: int
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для получения документов за интервалы внутри периода.
+
+        Returns:
+            Dict: Запрос для поиска документов с историей рейтинга
+        """
+        pipeline = []
+        pipeline.extend([
+            {'$match': {
+                'film_id': self.film_id,
+                'unit': self.unit.value,
+                'period': {'$gte': self.since, '$lt': self.until},
             }},
-            {'$sort': self.sort},
-            {'$skip': self.offset},
+            {'$sort': {'period': 1}},
             {'$limit': self.limit},
         ])
         return self.find_operations(pipeline)
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция истории рейтинга сразу в виде ответа API.
+
+        Returns:
+            Optional[Dict]: Начало интервала и изменения рейтинга за него
+        """
+        return {'_id': 0, 'period': 1, 'likes': 1, 'dislikes': 1, 'total': 1}
+
+
+class CountHistory(MongoQuery):
+    """Модель запроса для полного пересчета истории рейтинга фильмов по голосам пользователей."""
+
+    unit: HistoryChoices
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для подсчета лайков, дизлайков и суммы оценок фильма за каждый интервал.
+
+        Голос относится к интервалу даты своего последнего изменения, голоса без даты не учитываются.
+
+        Returns:
+            Dict: Запрос для агрегации документов с голосами
+        """
+        return self.find_operations([
+            {'$match': {'source': MongoCollections.films.name, 'date': {'$type': 'date'}}},
+            {'$group': {
+                '_id': {'film_id': '$source_id', 'period': {'$dateTrunc': {'date': '$date', 'unit': self.unit.value}}},
+                'likes': {'$sum': {'$cond': [{'$eq': ['$score', VotesChoices.like.value]}, 1, 0]}},
+                'dislikes': {'$sum': {'$cond': [{'$eq': ['$score', VotesChoices.dislike.value]}, 1, 0]}},
+                'total': {'$sum': '$score'},
+            }},
+        ])
+
+
+class SaveVote(MongoQuery):
+    """Модель запроса для сохранения голоса в коллекцию голосов пользователей."""
+
+    user_id: UUID
+    source_id: UUID
+    source: MongoCollections
+    score: VotesChoices
+    date: datetime
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для вставки или замены голоса пользователя.
+
+        Returns:
+            Dict: Запрос для обновления документа с голосом
+        """
+        mapping = {}
+        mapping['$set'] = {
+            'user_id': self.user_id,
+            'source_id': self.source_id,
+            'source': self.source.name,
+            'score': self.score.value,
+            'date': self.date,
+        }
+        return self.update_operations(vote_id(self.user_id, self.source_id), mapping, upsert=True)
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция документа с голосом, достаточная для проверки обновления.
+
+        Returns:
+            Optional[Dict]: Только ID документа
+        """
+        return {'_id': 1}
+
+
+class DestroyVote(MongoQuery):
+    """Модель запроса для удаления голоса из коллекции голосов пользователей."""
+
+    user_id: UUID
+    source_id: UUID
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для удаления голоса пользователя.
+
+        Returns:
+            Dict: Запрос для удаления документа с голосом
+        """
+        return self.delete_operations({'_id': vote_id(self.user_id, self.source_id)})
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция удаленного голоса, достаточная для проверки факта удаления.
+
+        Returns:
+            Optional[Dict]: Только ID документа
+        """
+        return {'_id': 1}
+
+
+class ListVotes(MongoQuery):
+    """Модель запроса для получения голосов пользователя по списку фильмов и рецензий через индекс по пользователю."""
+
+    user_id: UUID
+    source_ids: List[UUID]
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для получения голосов пользователя.
+
+        Returns:
+            Dict: Запрос для поиска документов с голосами
+        """
+        pipeline = []
+        pipeline.append(
+            {'$match': {'user_id': self.user_id, 'source_id': {'$in': self.source_ids}}},
+        )
+        return self.find_operations(pipeline)
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция голосов без служебных полей.
+
+        Returns:
+            Optional[Dict]: ID фильма или рецензии, коллекция и оценка
+        """
+        return {'_id': 0, 'source_id': 1, 'source': 1, 'score': 1}
+
+
+class RecordActivity(MongoQuery):
+    """Модель запроса для записи действия пользователя в ленту его активности."""
+
+    user_id: UUID
+    action: ActivityChoices
+    film_id: UUID
+    review_id: Optional[UUID]
+    score: Optional[VotesChoices]
+    timestamp: datetime = Field(default_factory=datetime.now)
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для вставки действия пользователя.
+
+        Returns:
+            Dict: Запрос для вставки документа с действием
+        """
+        new_doc = self.dict()
+        new_doc['action'] = self.action.value
+        new_doc['score'] = None if self.score is None else self.score.value
+        return self.insert_operations(new_doc)
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция нового действия, достаточная для проверки вставки.
+
+        Returns:
+            Optional[Dict]: Только ID документа
+        """
+        return {'_id': 1}
+
+
+class ListActivity(MongoQuery):
+    """Модель запроса для получения страницы ленты активности пользователя после курсора по индексу."""
+
+    user_id: UUID
+    timestamp: Optional[datetime]
+    last_id: Optional[UUID]
+    limit: int
+
+    @property
+    def params(self) -> Dict:
+        """Параметры запроса для получения действий пользователя от новых к старым.
+
+        Returns:
+            Dict: Запрос для поиска документов с действиями
+        """
+        filtering: Dict[str, Any] = {'user_id': self.user_id}
+        if self.timestamp is not None:
+            filtering['$or'] = [
+                {'timestamp': {'$lt': self.timestamp}},
+                {'timestamp': self.timestamp, '_id': {'$lt': self.last_id}},
+            ]
+        return self.find_operations([
+            {'$match': filtering},
+            {'$sort': {'timestamp': -1, '_id': -1}},
+            {'$limit': self.limit},
+        ])
+
+    @property
+    def projection(self) -> Optional[Dict]:
+        """Проекция действий сразу в виде ответа API.
+
+        Returns:
+            Optional[Dict]: Действия без ID пользователя
+        """
+        return {
+            '_id': 0,
+            'id': '$_id',
+            'action': 1,
+            'film_id': 1,
+            'review_id': 1,
+            'score': 1,
+            'timestamp': 1,
+        }
@@ -1,10 +1,10 @@
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from uuid import UUID
 
-from pydantic import Field, root_validator, validator
+from pydantic import Field, validator
 
-from models.base import APIResponse, OrjsonMixin, VotesChoices
+from models.base import ActivityChoices, APIResponse, VotesChoices
 
 
 class BookmarkResponse(APIResponse):
@@ -13,41 +13,18 @@ class BookmarkResponse(APIResponse):
     film_id: UUID
 
 
-class Vote(OrjsonMixin):
-    """Класс пользовательской оценки."""
-
-    user_id: UUID
-    score: VotesChoices
-
-
 class RatingResponse(APIResponse):
     """Модель ответа для представления рейтинга."""
 
     likes: int = Field(default=0)
     dislikes: int = Field(default=0)
     average_rating: Optional[int]
-    votes: Optional[List[Vote]] = Field(exclude=True)
 
-    @root_validator
-    def scoring(cls, data: Dict) -> Dict:
-        """Основной валидатор для подсчета количества лайков, дизлайков и средней пользовательской оценки.
 
-        Args:
-            data: Данные с голосами пользователей
+class FilmRatingResponse(RatingResponse):
+    """Модель ответа для представления рейтинга фильма вместе с количеством рецензий на него."""
 
-        Returns:
-            Dict: Подсчитанный рейтинг
-        """
-        if votes := data.get('votes'):
-            total_scores = 0
-            for vote in votes:
-                if vote.score == VotesChoices.like.value:
-                    data['likes'] += 1
-                elif vote.score == VotesChoices.dislike.value:
-                    data['dislikes'] += 1
-                total_scores += vote.score
-            data['average_rating'] = total_scores // (data['likes'] + data['dislikes'])
-        return data
+    review_count: int = Field(default=0)
 
 
 class ReviewResponse(APIResponse):
@@ -63,14 +40,103 @@ class ReviewResponse(APIResponse):
     dislikes: int = Field(default=0)
     average_rating: Optional[int]
 
+    @validator('film_score', pre=True)
+    def parse_film_vote(cls, film_score: Union[str, int, None]) -> Optional[VotesChoices]:
+        """Валидация оценки фильма, которая могла прийти из MongoDB уже в виде лайка или дизлайка.
+
+        Args:
+            film_score: Оценка фильма или её название
+
+        Returns:
+            Optional[VotesChoices]: Оценка фильма
+        """
+        if isinstance(film_score, str):
+            return VotesChoices[film_score]
+        return film_score
+
     @validator('film_score')
-    def get_film_vote(cls, film_score: VotesChoices) -> str:
+    def get_film_vote(cls, film_score: Optional[VotesChoices]) -> Optional[str]:
         """Валидация оценки фильма автором рецензии для приведения её в лайк или дизлайк.
 
         Args:
             film_score: Оценка фильма, привязанная к рецензии
 
         Returns:
-            str: Лайк или дизлайк
+            Optional[str]: Лайк или дизлайк
         """
+        if film_score is None:
+            return None
         return film_score.name
+
+    class Config:
+        """Настройки валидации."""
+
+        allow_population_by_field_name = True
+
+
+class ReviewSearchResponse(ReviewResponse):
+    """Модель ответа для представления найденной рецензии на фильм."""
+
+    relevance: float
+
+
+class ReviewSearchPageResponse(APIResponse):
+    """Модель ответа для представления страницы результатов поиска рецензий."""
+
+    items: List[ReviewSearchResponse]
+    cursor: Optional[str]
+
+
+class LeaderboardResponse(APIResponse):
+    """Модель ответа для представления позиции фильма в рейтинге за неделю."""
+
+    film_id: UUID
+    score: int
+
+
+class HistoryResponse(APIResponse):
+    """Модель ответа для представления изменения рейтинга фильма за час или день."""
+
+    period: datetime
+    likes: int
+    dislikes: int
+    total: int
+
+
+class VotesResponse(APIResponse):
+    """Модель ответа для представления голосов пользователя по фильмам и рецензиям."""
+
+    films: Dict[UUID, str] = Field(default_factory=dict)
+    reviews: Dict[UUID, str] = Field(default_factory=dict)
+
+
+class ActivityResponse(APIResponse):
+    """Модель ответа для представления действия пользователя."""
+
+    id: UUID
+    action: ActivityChoices
+    film_id: UUID
+    review_id: Optional[UUID]
+    score: Optional[VotesChoices]
+    timestamp: datetime
+
+    @validator('score')
+    def get_vote(cls, score: Optional[VotesChoices]) -> Optional[str]:
+        """Валидация оценки для приведения её в лайк или дизлайк.
+
+        Args:
+            score: Оценка пользователя
+
+        Returns:
+            Optional[str]: Лайк или дизлайк
+        """
+        if score is None:
+            return None
+        return score.name
+
+
+class ActivityPageResponse(APIResponse):
+    """Модель ответа для представления страницы ленты активности пользователя."""
+
+    items: List[ActivityResponse]
+    cursor: Optional[str]
@@ -0,0 +1,97 @@
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional
+from uuid import UUID
+
+from fastapi import Depends
+
+from services.crud import CRUDService, get_crud_service
+from services.cursors import decode_cursor, encode_cursor
+from core.enums import MongoCollections
+from core.tasks import spawn
+from models.base import ActivityChoices, VotesChoices
+from models.queries import ListActivity, RecordActivity
+
+
+class ActivityService:
+    """Класс для ведения и чтения ленты активности пользователей.
+
+    Лента хранится отдельной коллекцией с индексом (user_id, timestamp), которая пополняется при каждой записи,
+    поэтому страница ленты читается одним запросом по индексу, а не собирается из закладок, голосов и рецензий.
+    """
+
+    def __init__(self, mongo: CRUDService):
+        """При инициализации класса принимает сервис для выполнения MongoDB-запросов.
+
+        Args:
+            mongo: Объект для выполнения MongoDB-запросов
+        """
+        self.mongo = mongo
+
+    def record(
+        self,
+        user_id: UUID,
+        action: ActivityChoices,
+        film_id: UUID,
+        review_id: Optional[UUID] = None,
+        score: Optional[VotesChoices] = None,
+    ):
+        """Фоновая запись действия пользователя в ленту.
+
+        Args:
+            user_id: ID пользователя
+            action: Действие
+            film_id: ID фильма
+            review_id: ID рецензии
+            score: Оценка пользователя
+        """
+        query = RecordActivity(user_id=user_id, action=action, film_id=film_id, review_id=review_id, score=score)
+        spawn(self.save(query))
+
+    async def save(self, query: RecordActivity):
+        """Вставка действия пользователя в ленту.
+
+        Args:
+            query: Запрос для вставки действия
+        """
+        try:
+            await self.mongo.create(collection=MongoCollections.activity, query=query)
+        except Exception as exc:
+            logging.error('Не удалось записать действие {action} пользователя {user_id}: {exc}'.format(
+                action=query.action.value, user_id=query.user_id, exc=exc,
+            ))
+
+    async def search(self, user_id: UUID, cursor: Optional[str], limit: int) -> Dict:
+        """Страница ленты активности пользователя от новых действий к старым.
+
+        Args:
+            user_id: ID пользователя
+            cursor: Курсор, выданный вместе с предыдущей страницей
+            limit: Размер страницы
+
+        Returns:
+            Dict: Действия и курсор следующей страницы, если она может быть
+        """
+        timestamp, last_id = decode_cursor(cursor, datetime.fromisoformat) if cursor else (None, None)
+        actions = await self.mongo.search(
+            collection=MongoCollections.activity,
+            query=ListActivity(user_id=user_id, timestamp=timestamp, last_id=last_id, limit=limit),
+        )
+        next_cursor = None
+        if len(actions) == limit:
+            next_cursor = encode_cursor(actions[-1]['timestamp'], actions[-1]['id'])
+        return {'items': actions, 'cursor': next_cursor}
+
+
+@lru_cache()
+def get_activity_service(mongo: CRUDService = Depends(get_crud_service)) -> ActivityService:
+    """Функция для создания объекта сервиса ActivityService в едином экземпляре (синглтона).
+
+    Args:
+        mongo: Объект для выполнения MongoDB-запросов
+
+    Returns:
+        ActivityService: Сервис ленты активности пользователей
+    """
+    return ActivityService(mongo)
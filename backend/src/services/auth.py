@@ -43,6 +43,15 @@ class AuthService:
             raise HTTPException(status_code=HTTPStatus.BAD_REQUEST)
         return user_id
 
+    @property
+    def is_admin(self) -> bool:
+        """Свойство с признаком администратора из заявок (claims) токена.
+
+        Returns:
+            bool: Пользователь является администратором
+        """
+        return bool(self.decode_token().get('is_admin'))
+
     def decode_token(self) -> Dict:
         """Декодирование JWT-токена.
 
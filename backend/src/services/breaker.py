@@ -0,0 +1,99 @@
+import logging
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Deque
+
+from core.metrics import BREAKER_STATE
+
+
+class BreakerState(IntEnum):
+    """Класс с перечислением состояний автомата защиты."""
+
+    closed = 0
+    half_open = 1
+    open = 2
+
+
+class CircuitBreaker:
+    """Класс автомата защиты, который перестает обращаться к MongoDB при частых ошибках или медленных ответах.
+
+    Каждое переключение состояния начинает новое поколение. Результат запроса учитывается только
+    в том поколении, в котором запрос начался, поэтому поздний ответ на запрос, отправленный до размыкания,
+    не замыкает автомат вместо пробного запроса.
+    """
+
+    def __init__(self, window: int, threshold: float, latency: float, cooldown: float):
+        """При инициализации класса принимает параметры срабатывания автомата.
+
+        Args:
+            window: Количество последних запросов, по которым считается доля неудач
+            threshold: Доля неудачных запросов, при которой автомат размыкается
+            latency: Время ответа в секундах, после которого запрос считается неудачным
+            cooldown: Время в секундах, через которое разомкнутый автомат пропускает пробный запрос
+        """
+        self.threshold = threshold
+        self.latency = latency
+        self.cooldown = cooldown
+        self.state = BreakerState.closed
+        self.generation = 0
+        self.opened_at: float = 0
+        self._calls: Deque[bool] = deque(maxlen=window)
+        self._probing = False
+        BREAKER_STATE.set(self.state)
+
+    def allow(self) -> bool:
+        """Проверка того, можно ли выполнить запрос к MongoDB.
+
+        Returns:
+            bool: Запрос разрешен
+        """
+        if self.state == BreakerState.open:
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.switch(BreakerState.half_open)
+        if self.state == BreakerState.half_open:
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def record(self, failed: bool, generation: int):
+        """Учет результата выполненного запроса.
+
+        Args:
+            failed: Запрос завершился ошибкой соединения или выполнялся слишком долго
+            generation: Поколение автомата, в котором начался запрос
+        """
+        if generation != self.generation:
+            return
+        if self.state == BreakerState.half_open:
+            self.switch(BreakerState.open if failed else BreakerState.closed)
+            return
+        self._calls.append(failed)
+        if len(self._calls) == self._calls.maxlen and sum(self._calls) >= self.threshold * len(self._calls):
+            self.switch(BreakerState.open)
+
+    def abandon(self, generation: int):
+        """Учет запроса, который был отменен и не дал результата.
+
+        Args:
+            generation: Поколение автомата, в котором начался запрос
+        """
+        if generation == self.generation:
+            self._probing = False
+
+    def switch(self, state: BreakerState):
+        """Переключение состояния автомата с началом нового поколения.
+
+        Args:
+            state: Новое состояние
+        """
+        if state == BreakerState.open:
+            self.opened_at = time.monotonic()
+            logging.error('Автомат защиты MongoDB разомкнут')
+        self._calls.clear()
+        self._probing = False
+        self.generation += 1
+        self.state = state
+        BREAKER_STATE.set(state)
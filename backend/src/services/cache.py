@@ -0,0 +1,198 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Set, Tuple
+
+from core.config import CONFIG
+from core.exceptions import ServiceUnavailableError
+from core.metrics import READ_CACHE
+from core.tasks import spawn
+
+Loader = Callable[[], Awaitable]
+BatchLoader = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+
+def younger(cached: Dict[Hashable, Tuple[Any, float]], age: float) -> Dict[Hashable, Any]:
+    """Функция для выбора значений из записей кэша моложе заданного возраста.
+
+    Args:
+        cached: Значения и возраст записей по идентификаторам значений
+        age: Возраст в секундах
+
+    Returns:
+        Dict[Hashable, Any]: Значения по идентификаторам
+    """
+    return {ident: payload for ident, (payload, stored_age) in cached.items() if stored_age < age}
+
+
+class ReadCache:
+    """Класс кэша чтения в памяти воркера для данных, которые допускают небольшое отставание.
+
+    Свежая запись отдается сразу. Устаревшая запись тоже отдается сразу, а в фоне запускается
+    одно обновление. Если MongoDB недоступна, отдается любая сохраненная запись, пока она не слишком старая.
+    """
+
+    def __init__(self, ttl: float, stale: float, error: float, size: int):
+        """При инициализации класса принимает время жизни записей и размер кэша.
+
+        Args:
+            ttl: Время в секундах, в течение которого запись свежая
+            stale: Время в секундах после устаревания, в течение которого запись отдается с фоновым обновлением
+            error: Время в секундах после устаревания, в течение которого запись отдается при недоступности MongoDB
+            size: Максимальное количество записей
+        """
+        self.ttl = ttl
+        self.stale = stale
+        self.error = error
+        self.size = size
+        self.entries: 'OrderedDict[Hashable, Tuple[Any, float]]' = OrderedDict()
+        self.refreshing: Set[Hashable] = set()
+
+    def lookup(self, key: Hashable) -> Tuple[Any, float]:
+        """Поиск записи в кэше.
+
+        Args:
+            key: Ключ записи
+
+        Returns:
+            Tuple[Any, float]: Значение и возраст записи в секундах или бесконечный возраст, если записи нет
+        """
+        if key not in self.entries:
+            return None, math.inf
+        self.entries.move_to_end(key)
+        payload, stored = self.entries[key]
+        return payload, time.monotonic() - stored
+
+    def put(self, key: Hashable, payload: Any):
+        """Сохранение записи в кэш с вытеснением самых давно использованных записей.
+
+        Args:
+            key: Ключ записи
+            payload: Значение
+        """
+        self.entries[key] = (payload, time.monotonic())
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    async def get(self, key: Hashable, load: Loader) -> Tuple[Any, bool]:
+        """Получение значения из кэша или из MongoDB.
+
+        Args:
+            key: Ключ записи
+            load: Функция для загрузки значения из MongoDB
+
+        Raises:
+            ServiceUnavailableError: Ошибка 503, если MongoDB недоступна, а подходящей записи в кэше нет
+
+        Returns:
+            Tuple[Any, bool]: Значение и признак того, что оно устарело
+        """
+        cached, age = self.lookup(key)
+        if age < self.ttl:
+            READ_CACHE.labels('fresh').inc()
+            return cached, False
+        if age < self.ttl + self.stale:
+            READ_CACHE.labels('stale').inc()
+            self.revalidate(key, load)
+            return cached, True
+        try:
+            loaded = await load()
+        except ServiceUnavailableError:
+            if age < self.ttl + self.error:
+                READ_CACHE.labels('error').inc()
+                return cached, True
+            raise
+        READ_CACHE.labels('miss').inc()
+        self.put(key, loaded)
+        return loaded, False
+
+    async def get_many(self, keys: Dict[Hashable, Hashable], load: BatchLoader) -> Tuple[Dict[Hashable, Any], bool]:
+        """Получение нескольких значений: свежие берутся из кэша, остальные загружаются одним запросом к MongoDB.
+
+        Args:
+            keys: Ключи записей по идентификаторам значений
+            load: Функция для загрузки значений из MongoDB по списку идентификаторов
+
+        Raises:
+            ServiceUnavailableError: Ошибка 503, если MongoDB недоступна, а подходящих записей в кэше нет
+
+        Returns:
+            Tuple[Dict[Hashable, Any], bool]: Значения по идентификаторам и признак того, что часть из них устарела
+        """
+        cached = {ident: self.lookup(keys[ident]) for ident in keys}
+        fresh = younger(cached, self.ttl)
+        READ_CACHE.labels('fresh').inc(len(fresh))
+        if fresh.keys() == keys.keys():
+            return fresh, False
+        try:
+            loaded = await load([ident for ident in keys if ident not in fresh])
+        except ServiceUnavailableError:
+            usable = younger(cached, self.ttl + self.error)
+            if usable.keys() == fresh.keys():
+                raise
+            READ_CACHE.labels('error').inc(len(usable) - len(fresh))
+            return usable, True
+        READ_CACHE.labels('miss').inc(len(keys) - len(fresh))
+        for ident in loaded:
+            self.put(keys[ident], loaded[ident])
+        return {**fresh, **loaded}, False
+
+    def revalidate(self, key: Hashable, load: Loader):
+        """Запуск фонового обновления записи, если оно еще не запущено.
+
+        Args:
+            key: Ключ записи
+            load: Функция для загрузки значения из MongoDB
+        """
+        if key not in self.refreshing:
+            self.refreshing.add(key)
+            spawn(self.refresh(key, load))
+
+    async def refresh(self, key: Hashable, load: Loader):
+        """Фоновое обновление записи, которое при ошибке оставляет старую запись в кэше.
+
+        Args:
+            key: Ключ записи
+            load: Функция для загрузки значения из MongoDB
+        """
+        try:
+            self.put(key, await load())
+        except Exception as exc:
+            logging.warning('Не удалось обновить запись кэша {key}: {exc}'.format(key=key, exc=exc))
+        finally:
+            self.refreshing.discard(key)
+
+
+@lru_cache()
+def get_read_cache() -> ReadCache:
+    """Функция для создания объекта кэша чтения в едином экземпляре (синглтона).
+
+    Returns:
+        ReadCache: Кэш чтения рейтингов и рецензий
+    """
+    return ReadCache(
+        ttl=CONFIG.cache.ttl,
+        stale=CONFIG.cache.stale,
+        error=CONFIG.cache.error,
+        size=CONFIG.cache.size,
+    )
+
+
+@lru_cache()
+def get_version_cache() -> ReadCache:
+    """Функция для создания объекта кэша версий документов в едином экземпляре (синглтона).
+
+    Версия всегда читается из MongoDB, а сохраненная версия нужна только на время недоступности MongoDB.
+
+    Returns:
+        ReadCache: Кэш версий фильмов и рецензий
+    """
+    return ReadCache(
+        ttl=0,
+        stale=0,
+        error=CONFIG.cache.error,
+        size=CONFIG.cache.size,
+    )
@@ -1,127 +1,251 @@
-import logging
-from functools import lru_cache
-from http import HTTPStatus
-from typing import Dict, List
+import asyncio
+from functools import lru_cache, partial
+from typing import AsyncIterator, Dict, List, Optional
 from uuid import UUID
 
-from fastapi import Depends, HTTPException
-from motor.motor_asyncio import AsyncIOMotorDatabase
-from pymongo.errors import ServerSelectionTimeoutError
+from fastapi import Depends
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorDatabase
 
 from core.enums import MongoCollections
-from db.mongo import get_mongo
+from db.mongo import RAW_CODEC_OPTIONS, get_mongo
 from models.base import MongoQuery
+from services.executor import MongoExecutor
+from services.flights import flight_key
 
 
-class CRUDService:
-    """Класс сервиса для выполнения основных операций по обработке данных в MongoDB."""
+def project(query: MongoQuery, projection: Optional[Dict]) -> Dict:
+    """Функция для получения параметров запроса с проекцией, переданной при вызове операции.
 
-    def __init__(self, mongo: AsyncIOMotorDatabase):
-        """При инициализации класса принимает клиент базы данных MongoDB.
+    Args:
+        query: Запрос на языке запросов MongoDB
+        projection: Проекция документов вместо заявленной в запросе
 
-        Args:
-            mongo: Клиент MongoDB
-        """
-        self.mongo = mongo
+    Returns:
+        Dict: Параметры запроса
+    """
+    params = query.params
+    if projection is None:
+        return params
+    if (pipeline := params.get('pipeline')) is not None:
+        return {**params, 'pipeline': [*pipeline, {'$project': projection}]}
+    return {**params, 'projection': projection}
+
+
+class CRUDService(MongoExecutor):
+    """Класс сервиса для выполнения основных операций по обработке данных в MongoDB."""
 
-    async def create(self, collection: MongoCollections, query: MongoQuery) -> Dict:
+    async def create(
+        self,
+        collection: MongoCollections,
+        query: MongoQuery,
+        projection: Optional[Dict] = None,
+        session: Optional[AsyncIOMotorClientSession] = None,
+    ) -> Dict:
         """Cоздание документа в коллекции.
 
         Args:
             collection: Коллекция с документами
             query: Запрос на языке запросов MongoDB
+            projection: Проекция документов вместо заявленной в запросе
+            session: Сессия транзакции, в которой выполняется операция
 
         Raises:
-            HTTPException: Ошибка, если сервер MongoDB недоступен для операции
+            ServiceUnavailableError: Ошибка 503, если MongoDB недоступна или разомкнут автомат защиты
 
         Returns:
             Dict: Новый документ
         """
-        try:
-            result = await self.mongo[collection.name].find_one_and_replace(**query.params)
-        except ServerSelectionTimeoutError as exc:
-            logging.error(exc)
-            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST)
+        params = project(query, projection)
+        result = await self.run(
+            lambda: self.mongo[collection.name].find_one_and_replace(**params, session=session),
+            session,
+            (collection, params['filter'].get('_id')),
+        )
         return result or {}
 
-    async def retrieve(self, collection: MongoCollections, doc_id: UUID) -> Dict:
+    async def retrieve(
+        self,
+        collection: MongoCollections,
+        doc_id: UUID,
+        projection: Optional[Dict] = None,
+        session: Optional[AsyncIOMotorClientSession] = None,
+    ) -> Dict:
         """Чтение документа по ID в коллекции.
 
+        Чтение в транзакции не объединяется с другими запросами, так как должно видеть её записи.
+
         Args:
             collection: Коллекция с документами
             doc_id: ID документа
+            projection: Проекция документа
+            session: Сессия транзакции, в которой выполняется операция
 
         Raises:
-            HTTPException: Ошибка, если сервер MongoDB недоступен для операции
+            ServiceUnavailableError: Ошибка 503, если MongoDB недоступна или разомкнут автомат защиты
 
         Returns:
             Dict: Документ по ID
         """
-        try:
-            result = await self.mongo[collection.name].find_one(doc_id)
-        except ServerSelectionTimeoutError as exc:
-            logging.error(exc)
-            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST)
+        find = partial(self.mongo[collection.name].find_one, {'_id': doc_id}, projection, session=session)
+        if session is None:
+            result = await self.flights.coalesce(
+                collection,
+                flight_key(collection, 'retrieve', doc_id, projection),
+                partial(self.execute, find),
+                doc_id,
+            )
+        else:
+            result = await find()
         return result or {}
 
-    async def search(self, collection: MongoCollections, query: MongoQuery) -> List[Dict]:
+    async def search(
+        self,
+        collection: MongoCollections,
+        query: MongoQuery,
+        projection: Optional[Dict] = None,
+        raw: bool = False,
+    ) -> List[Dict]:
         """Поиск документов в коллекции.
 
         Args:
             collection: Коллекция с документами
             query: Запрос на языке запросов MongoDB
+            projection: Проекция документов вместо заявленной в запросе
+            raw: Вернуть документы в виде BSON без декодирования в объекты Python
 
         Raises:
-            HTTPException: Ошибка, если сервер MongoDB недоступен для операции
+            ServiceUnavailableError: Ошибка 503, если MongoDB недоступна или разомкнут автомат защиты
 
         Returns:
             List: Список документов
         """
-        try:
-            result = await self.mongo[collection.name].aggregate(**query.params).to_list(None)
-        except ServerSelectionTimeoutError as exc:
-            logging.error(exc)
-            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST)
+        mongo_collection = self.mongo[collection.name]
+        if raw:
+            mongo_collection = mongo_collection.with_options(codec_options=RAW_CODEC_OPTIONS)
+        params = project(query, projection)
+        result = await self.flights.coalesce(
+            collection,
+            flight_key(collection, 'search', params, raw),
+            partial(self.execute, lambda: mongo_collection.aggregate(**params).to_list(None)),
+        )
         return result
 
-    async def update(self, collection: MongoCollections, query: MongoQuery) -> Dict:
+    async def stream(
+        self,
+        collection: MongoCollections,
+        query: MongoQuery,
+        batch_size: int,
+    ) -> AsyncIterator[List[Dict]]:
+        """Чтение документов из коллекции пачками по курсору, чтобы в памяти была только одна пачка.
+
+        Первая пачка читается через автомат защиты, поэтому недоступность MongoDB видна до начала ответа,
+        а остальные - напрямую, чтобы долгая выгрузка не считалась медленным запросом.
+        Курсор закрывается и тогда, когда клиент обрывает выгрузку.
+
+        Args:
+            collection: Коллекция с документами
+            query: Запрос на языке запросов MongoDB
+            batch_size: Размер пачки документов
+
+        Raises:
+            ServiceUnavailableError: Ошибка 503, если MongoDB недоступна или разомкнут автомат защиты
+
+        Yields:
+            List[Dict]: Очередная пачка документов
+        """
+        cursor = self.mongo[collection.name].aggregate(**query.params, batchSize=batch_size)
+        batch = await self.execute(lambda: cursor.to_list(batch_size))
+        try:
+            while batch:
+                yield batch
+                batch = await cursor.to_list(batch_size)
+        except (GeneratorExit, asyncio.CancelledError):
+            await cursor.close()
+            raise
+
+    async def aggregate(
+        self,
+        collection: MongoCollections,
+        query: MongoQuery,
+        projection: Optional[Dict] = None,
+    ) -> Dict:
+        """Агрегация одного документа в коллекции.
+
+        Args:
+            collection: Коллекция с документами
+            query: Запрос на языке запросов MongoDB
+            projection: Проекция документов вместо заявленной в запросе
+
+        Raises:
+            ServiceUnavailableError: Ошибка 503, если MongoDB недоступна или разомкнут автомат защиты
+
+        Returns:
+            Dict: Результат агрегации
+        """
+        params = project(query, projection)
+        result = await self.flights.coalesce(
+            collection,
+            flight_key(collection, 'aggregate', params),
+            partial(self.execute, lambda: self.mongo[collection.name].aggregate(**params).to_list(1)),
+        )
+        return result[0] if result else {}
+
+    async def update(
+        self,
+        collection: MongoCollections,
+        query: MongoQuery,
+        projection: Optional[Dict] = None,
+        session: Optional[AsyncIOMotorClientSession] = None,
+    ) -> Dict:
         """Обновление документа в коллекции.
 
         Args:
             collection: Коллекция с документами
             query: Запрос на языке запросов MongoDB
+            projection: Проекция документов вместо заявленной в запросе
+            session: Сессия транзакции, в которой выполняется операция
 
         Raises:
-            HTTPException: Ошибка, если сервер MongoDB недоступен для операции
+            ServiceUnavailableError: Ошибка 503, если MongoDB недоступна или разомкнут автомат защиты
 
         Returns:
-            Dict: Документ после обновления
+            Dict: Документ после обновления или до него, как задано в запросе
         """
-        try:
-            result = await self.mongo[collection.name].find_one_and_update(**query.params)
-        except ServerSelectionTimeoutError as exc:
-            logging.error(exc)
-            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST)
+        params = project(query, projection)
+        result = await self.run(
+            lambda: self.mongo[collection.name].find_one_and_update(**params, session=session),
+            session,
+            (collection, params['filter'].get('_id')),
+        )
         return result or {}
 
-    async def delete(self, collection: MongoCollections, query: MongoQuery) -> Dict:
+    async def delete(
+        self,
+        collection: MongoCollections,
+        query: MongoQuery,
+        projection: Optional[Dict] = None,
+        session: Optional[AsyncIOMotorClientSession] = None,
+    ) -> Dict:
         """Удаление документа из коллекции.
 
         Args:
             collection: Коллекция с документами
             query: Запрос на языке запросов MongoDB
+            projection: Проекция документов вместо заявленной в запросе
+            session: Сессия транзакции, в которой выполняется операция
 
         Raises:
-            HTTPException: Ошибка, если сервер MongoDB недоступен для операции
+            ServiceUnavailableError: Ошибка 503, если MongoDB недоступна или разомкнут автомат защиты
 
         Returns:
             Dict: Документ для удаления
         """
-        try:
-            result = await self.mongo[collection.name].find_one_and_delete(**query.params)
-        except ServerSelectionTimeoutError as exc:
-            logging.error(exc)
-            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST)
+        params = project(query, projection)
+        result = await self.run(
+            lambda: self.mongo[collection.name].find_one_and_delete(**params, session=session),
+            session,
+            (collection, params['filter'].get('_id')),
+        )
         return result
 
 
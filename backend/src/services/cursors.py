@@ -0,0 +1,56 @@
+import base64
+from http import HTTPStatus
+from typing import Any, Callable, Tuple, TypeVar
+from uuid import UUID
+
+import orjson
+
+from core.exceptions import InvalidCursorError
+
+Position = TypeVar('Position')
+
+
+def encode_cursor(position: Any, last_id: UUID) -> str:
+    """Функция для создания курсора страницы по позиции и ID последнего документа на ней.
+
+    Args:
+        position: Значение, по которому отсортирована страница
+        last_id: ID последнего документа
+
+    Returns:
+        str: Непрозрачный для клиента курсор
+    """
+    return base64.urlsafe_b64encode(orjson.dumps([position, str(last_id)])).decode()
+
+
+def decode_cursor(cursor: str, position: Callable[[Any], Position]) -> Tuple[Position, UUID]:
+    """Функция для получения позиции и ID последнего документа предыдущей страницы по курсору.
+
+    Args:
+        cursor: Курсор
+        position: Функция для приведения позиции к её типу
+
+    Raises:
+        InvalidCursorError: Ошибка 400, если курсор не был выдан сервисом
+
+    Returns:
+        Tuple[Position, UUID]: Позиция и ID последнего документа
+    """
+    try:
+        return read_cursor(position, *orjson.loads(base64.urlsafe_b64decode(cursor.encode())))
+    except (TypeError, ValueError):
+        raise InvalidCursorError(status_code=HTTPStatus.BAD_REQUEST)
+
+
+def read_cursor(position: Callable[[Any], Position], saved: Any, last_id: str) -> Tuple[Position, UUID]:
+    """Функция для приведения сохраненных в курсоре значений к их типам.
+
+    Args:
+        position: Функция для приведения позиции к её типу
+        saved: Позиция из курсора
+        last_id: ID последнего документа из курсора
+
+    Returns:
+        Tuple[Position, UUID]: Позиция и ID последнего документа
+    """
+    return position(saved), UUID(last_id)
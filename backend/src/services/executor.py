@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorDatabase
+from pymongo.errors import ConnectionFailure, ExecutionTimeout, OperationFailure
+
+from core.config import CONFIG
+from core.exceptions import ServiceUnavailableError
+from services.breaker import CircuitBreaker
+from services.flights import Document, SingleFlight
+
+TRANSACTION_ATTEMPTS = 3
+
+WRITTEN: ContextVar[List[Document]] = ContextVar('written')
+
+
+class MongoExecutor:
+    """Класс для выполнения операций в MongoDB через автомат защиты и транзакции."""
+
+    def __init__(self, mongo: AsyncIOMotorDatabase):
+        """При инициализации класса принимает клиент базы данных MongoDB.
+
+        Args:
+            mongo: Клиент MongoDB
+        """
+        self.mongo = mongo
+        self.flights = SingleFlight()
+        self.breaker = CircuitBreaker(
+            window=CONFIG.breaker.window,
+            threshold=CONFIG.breaker.threshold,
+            latency=CONFIG.breaker.latency,
+            cooldown=CONFIG.breaker.cooldown,
+        )
+
+    def admit(self) -> int:
+        """Пропуск операции через автомат защиты.
+
+        Raises:
+            ServiceUnavailableError: Ошибка 503, если разомкнут автомат защиты
+
+        Returns:
+            int: Поколение автомата, в котором начинается операция
+        """
+        if not self.breaker.allow():
+            raise self.unavailable()
+        return self.breaker.generation
+
+    async def execute(self, call: Callable[[], Awaitable], written: Optional[Document] = None) -> Any:
+        """Выполнение операции в MongoDB через автомат защиты.
+
+        После успешной записи выполняющиеся запросы на чтение записанного документа сбрасываются.
+
+        Args:
+            call: Функция, выполняющая операцию
+            written: Коллекция и ID документа, который записывает операция
+
+        Raises:
+            ServiceUnavailableError: Ошибка 503, если MongoDB недоступна или разомкнут автомат защиты
+
+        Returns:
+            Any: Результат операции
+        """
+        generation = self.admit()
+        started = time.monotonic()
+        try:
+            result = await call()
+        except (ConnectionFailure, ExecutionTimeout) as exc:
+            logging.error(exc)
+            self.breaker.record(failed=True, generation=generation)
+            raise self.unavailable()
+        except asyncio.CancelledError:
+            self.breaker.abandon(generation)
+            raise
+        except Exception:
+            self.breaker.record(failed=False, generation=generation)
+            raise
+        self.breaker.record(failed=time.monotonic() - started > self.breaker.latency, generation=generation)
+        if written:
+            self.flights.forget(*written)
+        return result
+
+    async def transaction(self, call: Callable[[AsyncIOMotorClientSession], Awaitable]) -> Any:
+        """Выполнение нескольких операций в MongoDB одной транзакцией через автомат защиты.
+
+        Документы, записанные в транзакции, сбрасываются из запросов на чтение после её фиксации.
+
+        Args:
+            call: Функция, выполняющая операции в переданной ей сессии
+
+        Raises:
+            ServiceUnavailableError: Ошибка 503, если MongoDB недоступна или разомкнут автомат защиты
+
+        Returns:
+            Any: Результат функции после фиксации транзакции
+        """
+        written: List[Document] = []
+        WRITTEN.set(written)
+        result = await self.execute(lambda: self.commit(call))
+        for document in written:
+            self.flights.forget(*document)
+        return result
+
+    async def commit(
+        self,
+        call: Callable[[AsyncIOMotorClientSession], Awaitable],
+        attempts: int = TRANSACTION_ATTEMPTS,
+    ) -> Any:
+        """Фиксация транзакции с повтором при конфликте записи с другой транзакцией.
+
+        Ошибка соединения не повторяется, чтобы недоступность MongoDB по-прежнему давала быстрый отказ.
+
+        Args:
+            call: Функция, выполняющая операции в переданной ей сессии
+            attempts: Оставшееся количество попыток
+
+        Returns:
+            Any: Результат функции после фиксации транзакции
+        """
+        async with await self.mongo.client.start_session() as session:
+            try:
+                async with session.start_transaction():
+                    return await call(session)
+            except OperationFailure as exc:
+                if attempts == 1 or not exc.has_error_label('TransientTransactionError'):
+                    raise
+        return await self.commit(call, attempts - 1)
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable],
+        session: Optional[AsyncIOMotorClientSession],
+        written: Document,
+    ) -> Any:
+        """Выполнение записи через автомат защиты или внутри транзакции, которая уже через него проходит.
+
+        Args:
+            call: Функция, выполняющая операцию
+            session: Сессия транзакции или None
+            written: Коллекция и ID документа, который записывает операция
+
+        Returns:
+            Any: Результат операции
+        """
+        if session is None:
+            return await self.execute(call, written)
+        result = await call()
+        WRITTEN.get().append(written)
+        return result
+
+    def unavailable(self) -> ServiceUnavailableError:
+        """Ошибка для ответа клиенту, пока MongoDB недоступна.
+
+        Returns:
+            ServiceUnavailableError: Ошибка 503 с рекомендацией повторить запрос после восстановления автомата
+        """
+        return ServiceUnavailableError(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            headers={'Retry-After': str(int(self.breaker.cooldown))},
+        )
@@ -0,0 +1,73 @@
+import csv
+import io
+from datetime import datetime
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, List
+
+import orjson
+
+from models.base import ExportChoices
+
+MEDIA_TYPES = MappingProxyType({
+    ExportChoices.ndjson: 'application/x-ndjson',
+    ExportChoices.csv: 'text/csv',
+})
+
+
+def render_ndjson(batch: List[Dict], columns: List[str]) -> bytes:
+    """Функция для сериализации пачки документов в NDJSON, по строке на документ.
+
+    Args:
+        batch: Пачка документов
+        columns: Поля документов
+
+    Returns:
+        bytes: Часть тела ответа
+    """
+    return b''.join(orjson.dumps(doc, option=orjson.OPT_APPEND_NEWLINE) for doc in batch)
+
+
+def render_csv(batch: List[Dict], columns: List[str]) -> bytes:
+    """Функция для сериализации пачки документов в строки CSV с полями в порядке колонок.
+
+    Args:
+        batch: Пачка документов
+        columns: Поля документов
+
+    Returns:
+        bytes: Часть тела ответа
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for doc in batch:
+        writer.writerow([
+            cell.isoformat() if isinstance(cell, datetime) else cell
+            for cell in map(doc.get, columns)
+        ])
+    return buffer.getvalue().encode()
+
+
+async def render_chunks(
+    batches: AsyncIterator[List[Dict]],
+    first: List[Dict],
+    export_format: ExportChoices,
+    columns: List[str],
+) -> AsyncIterator[bytes]:
+    """Функция для сериализации пачек документов в части тела ответа по мере их чтения из MongoDB.
+
+    Args:
+        batches: Оставшиеся пачки документов
+        first: Первая пачка документов, прочитанная до начала ответа
+        export_format: Формат выгрузки
+        columns: Поля документов
+
+    Yields:
+        bytes: Часть тела ответа
+    """
+    render = render_csv if export_format == ExportChoices.csv else render_ndjson
+    if export_format == ExportChoices.csv:
+        yield render_csv([dict(zip(columns, columns))], columns)
+    if first:
+        yield render(first, columns)
+    async for batch in batches:
+        yield render(batch, columns)
@@ -0,0 +1,92 @@
+import asyncio
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, DefaultDict, Dict, Optional, Set, Tuple
+from uuid import UUID
+
+import orjson
+
+from core.enums import MongoCollections
+from core.metrics import COALESCED_READS
+
+Document = Tuple[MongoCollections, Optional[UUID]]
+
+
+def flight_key(collection: MongoCollections, *params: Any) -> bytes:
+    """Функция для получения ключа запроса, одинакового для запросов к одной коллекции с одинаковыми параметрами.
+
+    Args:
+        collection: Коллекция с документами
+        params: Параметры запроса
+
+    Returns:
+        bytes: Ключ запроса
+    """
+    return orjson.dumps([collection.name, *params], default=str, option=orjson.OPT_SORT_KEYS)
+
+
+class SingleFlight:
+    """Класс для объединения одинаковых конкурентных запросов на чтение в один запрос к MongoDB."""
+
+    def __init__(self):
+        """При инициализации класса создается пустой реестр выполняющихся запросов и читаемых ими документов."""
+        self.flights: Dict[bytes, asyncio.Future] = {}
+        self.documents: DefaultDict[Document, Set[bytes]] = defaultdict(set)
+
+    async def coalesce(
+        self,
+        collection: MongoCollections,
+        key: bytes,
+        call: Callable[[], Awaitable],
+        doc_id: Optional[UUID] = None,
+    ) -> Any:
+        """Выполнение запроса или ожидание результата уже выполняющегося запроса с тем же ключом.
+
+        Args:
+            collection: Коллекция с документами
+            key: Ключ запроса
+            call: Функция, выполняющая запрос
+            doc_id: ID читаемого документа или None, если запрос читает любые документы коллекции
+
+        Returns:
+            Any: Результат запроса, общий для всех ожидающих
+        """
+        if (flight := self.flights.get(key)) is None:
+            flight = asyncio.ensure_future(call())
+            self.flights[key] = flight
+            self.documents[collection, doc_id].add(key)
+            flight.add_done_callback(lambda done: self.land(key, done, (collection, doc_id)))
+        else:
+            COALESCED_READS.labels(collection.name).inc()
+        return await asyncio.shield(flight)
+
+    def land(self, key: bytes, flight: asyncio.Future, document: Document):
+        """Удаление завершенного запроса из реестра, если его еще не сбросила запись.
+
+        Args:
+            key: Ключ запроса
+            flight: Завершенный запрос
+            document: Коллекция и ID читаемого документа
+        """
+        if self.flights.get(key) is flight:
+            self.flights.pop(key)
+            self.documents[document].discard(key)
+        if not flight.cancelled():
+            flight.exception()
+
+    def forget(self, collection: MongoCollections, doc_id: Optional[UUID]):
+        """Сброс выполняющихся запросов на чтение записанного документа.
+
+        Такие запросы могли начаться до записи, поэтому чтение после неё выполняется заново, а не присоединяется к ним.
+        Запросы без ID документа сбрасываются при любой записи в коллекцию, а запись без ID сбрасывает их все.
+
+        Args:
+            collection: Коллекция с документами
+            doc_id: ID записанного документа или None, если он неизвестен
+        """
+        if doc_id is None:
+            documents = [document for document in self.documents if document[0] == collection]
+        else:
+            documents = [(collection, doc_id), (collection, None)]
+        for document in documents:
+            for key in self.documents.pop(document, set()):
+                self.flights.pop(key, None)
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from fastapi import Depends
+
+from services.crud import CRUDService, get_crud_service
+from core.enums import MongoCollections
+from core.tasks import spawn
+from models.base import HistoryChoices, VotesChoices, bucket_start
+from models.queries import ListHistory, RecordHistory
+
+
+class HistoryService:
+    """Класс для учета и чтения истории рейтинга фильмов по часам и дням.
+
+    Документ за интервал хранит изменения количества лайков, дизлайков и суммы оценок,
+    поэтому рейтинг на любой момент получается суммированием интервалов без перебора голосов.
+    """
+
+    def __init__(self, mongo: CRUDService):
+        """При инициализации класса принимает сервис для выполнения MongoDB-запросов.
+
+        Args:
+            mongo: Объект для выполнения MongoDB-запросов
+        """
+        self.mongo = mongo
+
+    def rate(self, film_id: UUID, previous: Optional[Dict], current: Optional[Dict]):
+        """Фоновый учет изменения пользовательской оценки фильма в текущем часе и дне.
+
+        Args:
+            film_id: ID фильма
+            previous: Голос пользователя до изменения
+            current: Голос пользователя после изменения
+        """
+        counts = {choice: 0 for choice in VotesChoices}
+        if previous:
+            counts[VotesChoices(previous['score'])] -= 1
+        if current:
+            counts[VotesChoices(current['score'])] += 1
+        if any(counts.values()):
+            spawn(self.record(film_id, datetime.now(), counts))
+
+    async def record(self, film_id: UUID, date: datetime, counts: Dict[VotesChoices, int]):
+        """Увеличение счетчиков в документах за час и день, к которым относится момент времени.
+
+        Args:
+            film_id: ID фильма
+            date: Момент изменения оценки
+            counts: Изменение количества голосов по оценкам
+        """
+        total = sum(choice.value * count for choice, count in counts.items())
+        await asyncio.gather(*(
+            self.save(RecordHistory(
+                film_id=film_id,
+                unit=unit,
+                period=bucket_start(unit, date),
+                likes=counts[VotesChoices.like],
+                dislikes=counts[VotesChoices.dislike],
+                total=total,
+            ))
+            for unit in HistoryChoices
+        ))
+
+    async def save(self, query: RecordHistory):
+        """Увеличение счетчиков в документе за один интервал.
+
+        Args:
+            query: Запрос для обновления документа за интервал
+        """
+        try:
+            await self.mongo.update(collection=MongoCollections.history, query=query)
+        except Exception as exc:
+            logging.error('Не удалось обновить историю рейтинга фильма {film_id}: {exc}'.format(
+                film_id=query.film_id, exc=exc,
+            ))
+
+    async def search(
+        self, film_id: UUID, unit: HistoryChoices, since: datetime, until: datetime, limit: int,
+    ) -> List[Dict]:
+        """История рейтинга фильма за период.
+
+        Args:
+            film_id: ID фильма
+            unit: Интервал истории рейтинга
+            since: Начало периода
+            until: Конец периода
+            limit: Максимальное количество интервалов
+
+        Returns:
+            List[Dict]: Изменения рейтинга по интервалам в порядке возрастания времени
+        """
+        return await self.mongo.search(
+            collection=MongoCollections.history,
+            query=ListHistory(film_id=film_id, unit=unit, since=since, until=until, limit=limit),
+        )
+
+
+@lru_cache()
+def get_history_service(mongo: CRUDService = Depends(get_crud_service)) -> HistoryService:
+    """Функция для создания объекта сервиса HistoryService в едином экземпляре (синглтона).
+
+    Args:
+        mongo: Объект для выполнения MongoDB-запросов
+
+    Returns:
+        HistoryService: Сервис истории рейтинга фильмов
+    """
+    return HistoryService(mongo)
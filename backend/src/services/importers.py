@@ -0,0 +1,148 @@
+import logging
+from collections import defaultdict
+from types import MappingProxyType
+from typing import Callable, Counter, DefaultDict, Dict, List, Tuple, Union
+
+from pymongo import ReplaceOne, UpdateOne
+
+from services.records import Batch
+from services.validation import Queries, check_queries
+from core.enums import MongoCollections
+from models.base import ImportChoices
+from models.queries import AddBookmark, AddRating, CreateReview, SaveVote, ScoreReview, TouchFilm
+
+VOTE_SOURCES = (MongoCollections.films, MongoCollections.reviews)
+
+WriteModel = Union[ReplaceOne, UpdateOne]
+
+Operations = DefaultDict[MongoCollections, List[Tuple[int, WriteModel]]]
+
+
+def import_bookmark(record: Dict) -> Queries:
+    """Функция для запросов, которые добавляют фильм в закладки пользователя.
+
+    Args:
+        record: Запись с полями user_id и film_id
+
+    Returns:
+        Queries: Коллекции и параметры запросов
+    """
+    return [(MongoCollections.users, AddBookmark(**record).params)]
+
+
+def import_vote(record: Dict) -> Queries:
+    """Функция для запросов, которые сохраняют голос в фильме или рецензии и в коллекции голосов.
+
+    Фильм по голосу создается, если его еще нет, а рецензия - нет, поэтому рецензии загружаются раньше голосов за них.
+    Голос за фильм копируется и в рецензию пользователя на этот фильм, если она есть.
+
+    Args:
+        record: Запись с полями user_id, source_id, source (films или reviews), score и необязательным date
+
+    Raises:
+        ValueError: Ошибка, если голос не за фильм и не за рецензию
+
+    Returns:
+        Queries: Коллекции и параметры запросов
+    """
+    vote = AddRating(**record)
+    source = MongoCollections[record['source']]
+    if source not in VOTE_SOURCES:
+        raise ValueError('$.source: допустимые значения {enum}'.format(enum=[choice.name for choice in VOTE_SOURCES]))
+    queries = [
+        (source, {**vote.params, 'upsert': source == MongoCollections.films}),
+        (MongoCollections.votes, SaveVote(**vote.dict(), source=source).params),
+    ]
+    if source == MongoCollections.films:
+        queries.append((
+            MongoCollections.reviews,
+            ScoreReview(author=vote.user_id, film_id=vote.source_id, score=vote.score).params,
+        ))
+    return queries
+
+
+def import_review(record: Dict) -> Queries:
+    """Функция для запросов, которые создают рецензию и тем же обновлением фильма меняют его версию и число рецензий.
+
+    Args:
+        record: Запись с полями author, film_id, text и необязательным pub_date
+
+    Returns:
+        Queries: Коллекции и параметры запросов
+    """
+    review = CreateReview(**record)
+    return [
+        (MongoCollections.reviews, review.params),
+        (MongoCollections.films, TouchFilm(film_id=review.film_id, reviews=1).params),
+    ]
+
+
+IMPORTERS: 'MappingProxyType[ImportChoices, Callable[[Dict], Queries]]' = MappingProxyType({
+    ImportChoices.bookmarks: import_bookmark,
+    ImportChoices.votes: import_vote,
+    ImportChoices.reviews: import_review,
+})
+
+
+def reject(stats: Counter, number: int, reason: Exception):
+    """Функция для учета записи, которая не прошла проверку и пропускается.
+
+    Args:
+        stats: Счетчики загрузки
+        number: Номер записи
+        reason: Причина пропуска
+    """
+    logging.warning('Запись {number} пропущена: {reason}'.format(number=number, reason=reason))
+    stats['invalid'] += 1
+
+
+def prepare_batch(kind: ImportChoices, batch: Batch, stats: Counter) -> Dict[int, Queries]:
+    """Функция для получения запросов по записям пачки, документы которых соответствуют схемам коллекций.
+
+    Args:
+        kind: Вид записей
+        batch: Номера записей и записи
+        stats: Счетчики загрузки
+
+    Returns:
+        Dict[int, Queries]: Запросы по номерам записей
+    """
+    prepared = {}
+    for number, record in batch:
+        try:
+            queries = check_queries(IMPORTERS[kind](record))
+        except (KeyError, TypeError, ValueError) as exc:
+            reject(stats, number, exc)
+            continue
+        prepared[number] = queries
+    return prepared
+
+
+def write_model(params: Dict) -> WriteModel:
+    """Функция для превращения параметров запроса на вставку или обновление в операцию пакетной записи.
+
+    Args:
+        params: Параметры запроса
+
+    Returns:
+        WriteModel: Операция для `bulk_write`
+    """
+    if (replacement := params.get('replacement')) is not None:
+        return ReplaceOne(params['filter'], replacement, upsert=params['upsert'])
+    return UpdateOne(params['filter'], params['update'], upsert=params['upsert'])
+
+
+def group_operations(prepared: Dict[int, Queries]) -> Operations:
+    """Функция для группировки операций записи по коллекциям в порядке их появления в запросах.
+
+    Args:
+        prepared: Запросы по номерам записей
+
+    Returns:
+        Operations: Номера записей и операции по коллекциям
+    """
+    operations: Operations = defaultdict(list)
+    for number, queries in prepared.items():
+        for collection, params in queries:
+            operations[collection].append((number, write_model(params)))
+    return operations
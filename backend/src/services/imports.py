@@ -0,0 +1,168 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Counter, Dict, List, Set, Tuple
+from uuid import UUID
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import BulkWriteError
+
+from services.importers import Queries, WriteModel, group_operations, prepare_batch, reject
+from services.jobs import save_job, start_job
+from services.records import Batch, ImportSource, import_job_id, read_waves
+from core.enums import MongoCollections
+from models.base import ImportChoices
+
+DUPLICATE_KEY = 11000
+
+
+async def find_reviews(mongo: AsyncIOMotorDatabase, review_ids: Set[UUID]) -> Set[UUID]:
+    """Функция для получения одним запросом тех рецензий, которые есть в MongoDB.
+
+    Args:
+        mongo: Соединение с MongoDB
+        review_ids: ID рецензий
+
+    Returns:
+        Set[UUID]: ID найденных рецензий
+    """
+    return set(await mongo[MongoCollections.reviews.name].distinct('_id', {'_id': {'$in': list(review_ids)}}))
+
+
+async def drop_missing_reviews(
+    mongo: AsyncIOMotorDatabase,
+    prepared: Dict[int, Queries],
+    stats: Counter,
+) -> Dict[int, Queries]:
+    """Функция для пропуска голосов за рецензии, которых нет, чтобы в коллекции голосов не было голосов без рецензии.
+
+    Args:
+        mongo: Соединение с MongoDB
+        prepared: Запросы голосов по номерам записей
+        stats: Счетчики загрузки
+
+    Returns:
+        Dict[int, Queries]: Запросы голосов за фильмы и за найденные рецензии
+    """
+    voted = {
+        number: queries[0][1]['filter']['_id']
+        for number, queries in prepared.items() if queries[0][0] == MongoCollections.reviews
+    }
+    if not voted:
+        return prepared
+    found = await find_reviews(mongo, set(voted.values()))
+    for number, review_id in voted.items():
+        if review_id not in found:
+            reject(stats, number, ValueError('$.source_id: рецензия не найдена'))
+            prepared.pop(number)
+    return prepared
+
+
+def count_errors(stats: Counter, collection: MongoCollections, errors: List[Dict]):
+    """Функция для учета ошибок записи: повторы отклоняются уникальным индексом, а остальные ошибки выводятся в лог.
+
+    Args:
+        stats: Счетчики загрузки
+        collection: Коллекция
+        errors: Ошибки записи из `BulkWriteError`
+    """
+    duplicates = sum(error['code'] == DUPLICATE_KEY for error in errors)
+    stats['duplicates'] += duplicates
+    stats['failed'] += len(errors) - duplicates
+    if unexpected := [error['errmsg'] for error in errors if error['code'] != DUPLICATE_KEY]:
+        logging.error('Ошибки записи в {collection}: {error}'.format(collection=collection.name, error=unexpected[0]))
+
+
+async def write_collection(
+    mongo: AsyncIOMotorDatabase,
+    collection: MongoCollections,
+    operations: List[Tuple[int, WriteModel]],
+    stats: Counter,
+    failed: Set[int],
+):
+    """Функция для записи операций в коллекцию неупорядоченным `bulk_write`.
+
+    Операции записей, предыдущие операции которых не записаны, пропускаются,
+    а номера записей с ошибками добавляются к ним.
+
+    Args:
+        mongo: Соединение с MongoDB
+        collection: Коллекция
+        operations: Номера записей и операции
+        stats: Счетчики загрузки
+        failed: Номера записей, операции которых не записаны
+    """
+    if not (operations := [(number, operation) for number, operation in operations if number not in failed]):
+        return
+    try:
+        await mongo[collection.name].bulk_write([operation for _, operation in operations], ordered=False)
+    except BulkWriteError as exc:
+        count_errors(stats, collection, exc.details['writeErrors'])
+        failed.update(operations[error['index']][0] for error in exc.details['writeErrors'])
+
+
+async def write_batch(mongo: AsyncIOMotorDatabase, kind: ImportChoices, batch: Batch) -> Counter:
+    """Функция для проверки пачки записей и их записи неупорядоченными `bulk_write` по коллекциям.
+
+    Коллекции записываются в порядке появления в запросах: сначала фильмы или рецензии, затем производные данные.
+    Производные данные записи не пишутся, если её первая операция не записана: например, число рецензий фильма
+    не увеличивается для повторной рецензии, отклоненной уникальным индексом.
+
+    Args:
+        mongo: Соединение с MongoDB
+        kind: Вид записей
+        batch: Номера записей и записи
+
+    Returns:
+        Counter: Количество записанных, пропущенных, повторных и неудачных записей
+    """
+    stats: Counter = Counter()
+    prepared = prepare_batch(kind, batch, stats)
+    if kind == ImportChoices.votes:
+        prepared = await drop_missing_reviews(mongo, prepared, stats)
+    stats['valid'] += len(prepared)
+    failed: Set[int] = set()
+    for collection, operations in group_operations(prepared).items():
+        await write_collection(mongo, collection, operations, stats, failed)
+    return stats
+
+
+async def import_records(
+    mongo: AsyncIOMotorDatabase,
+    source: ImportSource,
+    size: int,
+    concurrency: int,
+    resume: bool = True,
+):
+    """Функция для загрузки закладок, голосов или рецензий из файла пачками, которые пишутся параллельно.
+
+    Одновременно в памяти и в работе не больше `concurrency` пачек. После каждой такой волны в задании
+    сохраняется количество загруженных записей, поэтому прерванная загрузка того же файла продолжается
+    с последней волны. Повторная загрузка тех же закладок и голосов идемпотентна, а повторные рецензии
+    отклоняются уникальным индексом. Рейтинги за неделю по загруженным данным пересчитываются командой `leaderboards`.
+
+    Args:
+        mongo: Соединение с MongoDB
+        source: Вид записей и путь к файлу NDJSON или CSV
+        size: Размер пачки
+        concurrency: Количество пачек, которые пишутся одновременно
+        resume: Продолжать ли незавершенную загрузку того же файла
+    """
+    job = await start_job(mongo, import_job_id(source), resume=resume)
+    stats: Counter = Counter()
+    started = datetime.now()
+    for wave in read_waves(source.path, job['offset'], size, concurrency):
+        stats = sum(await asyncio.gather(*(write_batch(mongo, source.kind, batch) for batch in wave)), stats)
+        await save_job(mongo, job, offset=wave[-1][-1][0], processed=wave[-1][-1][0])
+    await save_job(mongo, job, finished=datetime.now())
+    elapsed = (datetime.now() - started).total_seconds()
+    logging.info(
+        'Загрузка {kind} из {path} за {elapsed:.1f} с: записано {valid}, пропущено {invalid}, '
+        'повторов {duplicates}, ошибок {failed}, {rate:.0f} записей/с'.format(
+            kind=source.kind.value,
+            path=source.path,
+            elapsed=elapsed,
+            rate=(stats['valid'] + stats['invalid']) / elapsed if elapsed else 0,
+            **{key: stats[key] for key in ('valid', 'invalid', 'duplicates', 'failed')},
+        ),
+    )
@@ -0,0 +1,51 @@
+import logging
+from datetime import datetime
+from typing import Dict
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from core.enums import MongoCollections
+
+
+async def start_job(mongo: AsyncIOMotorDatabase, job_id: str, resume: bool = True, **fields) -> Dict:
+    """Функция для получения незавершенного задания или создания нового.
+
+    Args:
+        mongo: Соединение с MongoDB
+        job_id: ID задания
+        resume: Продолжать ли незавершенное задание
+        fields: Поля, которые описывают задание
+
+    Returns:
+        Dict: Документ задания с этапом и позицией, с которых продолжается работа
+    """
+    jobs = mongo[MongoCollections.jobs.name]
+    job = await jobs.find_one({'_id': job_id})
+    if job and not job['finished'] and resume:
+        logging.info('Задание {_id} продолжается с этапа {stage}, обработано {processed}'.format(**job))
+        return job
+    job = {
+        '_id': job_id,
+        **fields,
+        'stage': 0,
+        'last': None,
+        'offset': 0,
+        'processed': 0,
+        'started': datetime.now(),
+        'finished': None,
+    }
+    await jobs.replace_one({'_id': job_id}, job, upsert=True)
+    return job
+
+
+async def save_job(mongo: AsyncIOMotorDatabase, job: Dict, **progress):
+    """Функция для сохранения прогресса задания после обработанной пачки.
+
+    Args:
+        mongo: Соединение с MongoDB
+        job: Документ задания
+        progress: Изменившиеся поля задания
+    """
+    job.update(progress)
+    await mongo[MongoCollections.jobs.name].update_one({'_id': job['_id']}, {'$set': progress})
+    logging.info('Задание {_id}: этап {stage}, обработано {processed}'.format(**job))
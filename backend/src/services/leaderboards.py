@@ -0,0 +1,144 @@
+import asyncio
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import Depends
+
+from services.crud import CRUDService, get_crud_service
+from core.enums import MongoCollections
+from core.tasks import spawn
+from models.base import LeaderboardChoices, VotesChoices, week_start
+from models.queries import ListLeaderboard, ScoreLeaderboard
+
+
+class LeaderboardService:
+    """Класс для инкрементального обновления и чтения рейтингов фильмов за неделю.
+
+    В рейтинге `top` фильм получает очко за каждый лайк и теряет за каждый дизлайк, поданные за неделю,
+    а в рейтинге `discussed` - очко за каждую рецензию, опубликованную за неделю.
+    """
+
+    def __init__(self, mongo: CRUDService):
+        """При инициализации класса принимает сервис для выполнения MongoDB-запросов.
+
+        Args:
+            mongo: Объект для выполнения MongoDB-запросов
+        """
+        self.mongo = mongo
+
+    def rate(self, film_id: UUID, previous: Optional[Dict], current: Optional[Dict]):
+        """Фоновое обновление рейтинга `top` после изменения пользовательской оценки фильма.
+
+        Прежний голос вычитается из недели, в которую он был подан, а новый голос прибавляется к текущей неделе.
+
+        Args:
+            film_id: ID фильма
+            previous: Голос пользователя до изменения
+            current: Голос пользователя после изменения
+        """
+        changes = []
+        if previous and previous.get('date'):
+            changes.append((previous['date'], -vote_weight(previous)))
+        if current:
+            changes.append((current['date'], vote_weight(current)))
+        spawn(self.score(LeaderboardChoices.top, film_id, changes))
+
+    def review(self, film_id: UUID, pub_date: datetime, delta: int):
+        """Фоновое обновление рейтинга `discussed` после публикации или удаления рецензии.
+
+        Args:
+            film_id: ID фильма
+            pub_date: Дата публикации рецензии
+            delta: Изменение количества рецензий
+        """
+        spawn(self.score(LeaderboardChoices.discussed, film_id, [(pub_date, delta)]))
+
+    async def score(self, board: LeaderboardChoices, film_id: UUID, changes: Iterable[Tuple[datetime, int]]):
+        """Изменение очков фильма по неделям, к которым относятся изменения.
+
+        Args:
+            board: Рейтинг
+            film_id: ID фильма
+            changes: Моменты времени и изменения очков
+        """
+        await asyncio.gather(*(
+            self.shift(board, film_id, period, delta) for period, delta in weekly(changes).items() if delta
+        ))
+
+    async def shift(self, board: LeaderboardChoices, film_id: UUID, period: datetime, delta: int):
+        """Изменение очков фильма за одну неделю.
+
+        Args:
+            board: Рейтинг
+            film_id: ID фильма
+            period: Начало недели
+            delta: Изменение очков
+        """
+        try:
+            await self.mongo.update(
+                collection=MongoCollections.leaderboards,
+                query=ScoreLeaderboard(board=board, film_id=film_id, period=period, delta=delta),
+            )
+        except Exception as exc:
+            logging.error('Не удалось обновить рейтинг {board} фильма {film_id}: {exc}'.format(
+                board=board.value, film_id=film_id, exc=exc,
+            ))
+
+    async def top(self, board: LeaderboardChoices, limit: int) -> List[Dict]:
+        """Первые фильмы рейтинга за текущую неделю.
+
+        Args:
+            board: Рейтинг
+            limit: Количество фильмов
+
+        Returns:
+            List[Dict]: ID фильмов и их очки по убыванию очков
+        """
+        return await self.mongo.search(
+            collection=MongoCollections.leaderboards,
+            query=ListLeaderboard(board=board, period=week_start(datetime.now()), limit=limit),
+        )
+
+
+def weekly(changes: Iterable[Tuple[datetime, int]]) -> Dict[datetime, int]:
+    """Функция для сложения изменений очков по неделям, к которым они относятся.
+
+    Args:
+        changes: Моменты времени и изменения очков
+
+    Returns:
+        Dict[datetime, int]: Изменения очков по началу недели
+    """
+    deltas: Dict[datetime, int] = {}
+    for date, delta in changes:
+        period = week_start(date)
+        deltas[period] = deltas.get(period, 0) + delta
+    return deltas
+
+
+def vote_weight(vote: Dict) -> int:
+    """Функция для получения очков фильма за голос пользователя.
+
+    Args:
+        vote: Голос пользователя
+
+    Returns:
+        int: 1 за лайк и -1 за дизлайк
+    """
+    return 1 if vote['score'] == VotesChoices.like.value else -1
+
+
+@lru_cache()
+def get_leaderboard_service(mongo: CRUDService = Depends(get_crud_service)) -> LeaderboardService:
+    """Функция для создания объекта сервиса LeaderboardService в едином экземпляре (синглтона).
+
+    Args:
+        mongo: Объект для выполнения MongoDB-запросов
+
+    Returns:
+        LeaderboardService: Сервис рейтингов фильмов за неделю
+    """
+    return LeaderboardService(mongo)
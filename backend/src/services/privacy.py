@@ -0,0 +1,230 @@
+import asyncio
+import os
+from collections import defaultdict
+from datetime import datetime
+from typing import AsyncIterator, BinaryIO, Callable, Dict, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+import orjson
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from services.jobs import save_job, start_job
+from core.enums import MongoCollections
+from models.queries import vote_id
+
+
+class Stage(NamedTuple):
+    """Этап задания: коллекция, поле с ID пользователя, поля сортировки и проекция документов."""
+
+    collection: MongoCollections
+    field: str
+    sort: Tuple[str, ...]
+    projection: Dict
+
+
+EXPORT_STAGES = (
+    Stage(MongoCollections.users, '_id', ('_id',), {}),
+    Stage(MongoCollections.reviews, 'author', ('film_id',), {'rating': 0}),
+    Stage(MongoCollections.votes, 'user_id', ('source_id',), {'_id': 0, 'user_id': 0}),
+    Stage(MongoCollections.activity, 'user_id', ('timestamp', '_id'), {'user_id': 0}),
+)
+
+
+def keyset(sort: Tuple[str, ...], last: Optional[List]) -> Dict:
+    """Функция для условия выборки документов, которые идут после последнего обработанного.
+
+    Args:
+        sort: Поля сортировки, однозначно задающие порядок документов пользователя
+        last: Значения полей сортировки у последнего обработанного документа
+
+    Returns:
+        Dict: Условие для фильтра запроса
+    """
+    if not last:
+        return {}
+    return {'$or': [
+        {**dict(zip(sort[:position], last[:position])), field: {'$gt': last[position]}}
+        for position, field in enumerate(sort)
+    ]}
+
+
+async def erase_votes(mongo: AsyncIOMotorDatabase, user_id: UUID, docs: List[Dict]):
+    """Функция для удаления пачки голосов пользователя из фильмов, рецензий и коллекции голосов.
+
+    Вместе с рецензией увеличивается и версия её фильма, от которой зависит ETag списка рецензий.
+
+    Args:
+        mongo: Соединение с MongoDB
+        user_id: ID пользователя
+        docs: Голоса пользователя из коллекции голосов
+    """
+    requests = defaultdict(list)
+    for doc in docs:
+        requests[doc['source']].append(UpdateOne(
+            {'_id': doc['source_id']},
+            {'$pull': {'rating.votes': {'user_id': user_id}}, '$inc': {'version': 1}},
+        ))
+    if review_ids := [vote['source_id'] for vote in docs if vote['source'] == MongoCollections.reviews.name]:
+        films = mongo[MongoCollections.reviews.name].distinct('film_id', {'_id': {'$in': review_ids}})
+        requests[MongoCollections.films.name].extend(
+            UpdateOne({'_id': film_id}, {'$inc': {'version': 1}}) for film_id in await films
+        )
+    await asyncio.gather(*(mongo[source].bulk_write(requests[source], ordered=False) for source in requests))
+    await mongo[MongoCollections.votes.name].delete_many({'_id': {'$in': [vote['_id'] for vote in docs]}})
+
+
+async def erase_reviews(mongo: AsyncIOMotorDatabase, user_id: UUID, docs: List[Dict]):
+    """Функция для удаления пачки рецензий пользователя вместе с голосами других пользователей за них.
+
+    Args:
+        mongo: Соединение с MongoDB
+        user_id: ID пользователя
+        docs: Рецензии пользователя
+    """
+    voters = [vote_id(vote['user_id'], doc['_id']) for doc in docs for vote in doc['rating']['votes']]
+    if voters:
+        await mongo[MongoCollections.votes.name].delete_many({'_id': {'$in': voters}})
+    await mongo[MongoCollections.reviews.name].delete_many({'_id': {'$in': [doc['_id'] for doc in docs]}})
+    await mongo[MongoCollections.films.name].bulk_write(
+        [UpdateOne({'_id': doc['film_id']}, {'$inc': {'version': 1, 'review_count': -1}}) for doc in docs],
+        ordered=False,
+    )
+
+
+async def erase_activity(mongo: AsyncIOMotorDatabase, user_id: UUID, docs: List[Dict]):
+    """Функция для удаления пачки действий пользователя.
+
+    Args:
+        mongo: Соединение с MongoDB
+        user_id: ID пользователя
+        docs: Действия пользователя
+    """
+    await mongo[MongoCollections.activity.name].delete_many({'_id': {'$in': [doc['_id'] for doc in docs]}})
+
+
+ERASE_STAGES = (
+    (Stage(MongoCollections.votes, 'user_id', ('source_id',), {'source_id': 1, 'source': 1}), erase_votes),
+    (
+        Stage(MongoCollections.reviews, 'author', ('film_id',), {'film_id': 1, 'rating.votes.user_id': 1}),
+        erase_reviews,
+    ),
+    (Stage(MongoCollections.activity, 'user_id', ('timestamp', '_id'), {'timestamp': 1}), erase_activity),
+)
+
+
+class UserDataJob:
+    """Класс для выгрузки и удаления всех данных пользователя пачками с паузами, чтобы не мешать обработке запросов.
+
+    Документы пользователя читаются пачками по индексам с пользователем в начале, поэтому в памяти только одна
+    пачка, а коллекции фильмов и рецензий не перебираются целиком. После каждой пачки в задании сохраняется
+    прогресс, так что прерванное задание продолжается с сохраненного этапа.
+    """
+
+    def __init__(self, mongo: AsyncIOMotorDatabase, user_id: UUID, size: int, pause: float):
+        """При инициализации класса принимает соединение с MongoDB, пользователя и темп обработки.
+
+        Args:
+            mongo: Соединение с MongoDB
+            user_id: ID пользователя
+            size: Размер пачки
+            pause: Пауза в секундах между пачками
+        """
+        self.mongo = mongo
+        self.user_id = user_id
+        self.size = size
+        self.pause = pause
+        self.job: Dict = {}
+
+    async def batches(self, stage: Stage, last: Optional[List]) -> AsyncIterator[List[Dict]]:
+        """Чтение документов пользователя пачками по индексу.
+
+        Args:
+            stage: Этап задания
+            last: Значения полей сортировки, с которых продолжается чтение
+
+        Yields:
+            List[Dict]: Очередная пачка документов
+        """
+        collection = self.mongo[stage.collection.name]
+        while True:
+            cursor = collection.find({stage.field: self.user_id, **keyset(stage.sort, last)}, stage.projection or None)
+            docs = await cursor.sort([(field, 1) for field in stage.sort]).limit(self.size).to_list(None)
+            if not docs:
+                return
+            yield docs
+            if len(docs) < self.size:
+                return
+            last = [docs[-1][field] for field in stage.sort]
+
+    async def export(self, path: str):
+        """Выгрузка всех данных пользователя в файл NDJSON: документ пользователя, рецензии, голоса и действия.
+
+        После каждой пачки в задании сохраняются позиция в коллекции и размер файла,
+        поэтому прерванная выгрузка обрезает файл до последней сохраненной пачки и продолжается с неё.
+
+        Args:
+            path: Путь к файлу выгрузки
+        """
+        job_id = 'export:{user_id}'.format(user_id=self.user_id)
+        self.job = await start_job(self.mongo, job_id, resume=os.path.exists(path), user_id=self.user_id)
+        with open(path, 'r+b' if self.job['offset'] else 'wb') as output:
+            output.truncate(self.job['offset'])
+            output.seek(self.job['offset'])
+            for position, stage in enumerate(EXPORT_STAGES):
+                if position >= self.job['stage']:
+                    await self.export_stage(output, position, stage)
+        await save_job(self.mongo, self.job, finished=datetime.now())
+
+    async def export_stage(self, output: BinaryIO, position: int, stage: Stage):
+        """Выгрузка документов пользователя из одной коллекции.
+
+        Args:
+            output: Файл выгрузки
+            position: Номер этапа
+            stage: Этап задания
+        """
+        last = self.job['last'] if position == self.job['stage'] else None
+        async for docs in self.batches(stage, last):
+            output.write(b''.join(
+                orjson.dumps({'collection': stage.collection.name, 'document': doc}, option=orjson.OPT_APPEND_NEWLINE)
+                for doc in docs
+            ))
+            output.flush()
+            await save_job(
+                self.mongo, self.job,
+                stage=position,
+                last=[docs[-1][key] for key in stage.sort],
+                offset=output.tell(),
+                processed=self.job['processed'] + len(docs),
+            )
+            await asyncio.sleep(self.pause)
+        await save_job(self.mongo, self.job, stage=position + 1, last=None)
+
+    async def erase(self):
+        """Удаление всех данных пользователя: голосов, рецензий, действий и документа пользователя.
+
+        Удаление каждой пачки идемпотентно. Рейтинги за неделю и история рейтинга
+        хранят только обезличенные счетчики и не изменяются.
+        """
+        job_id = 'erase:{user_id}'.format(user_id=self.user_id)
+        self.job = await start_job(self.mongo, job_id, user_id=self.user_id)
+        for position, (stage, erase_batch) in enumerate(ERASE_STAGES):
+            if position >= self.job['stage']:
+                await self.erase_stage(position, stage, erase_batch)
+        await self.mongo[MongoCollections.users.name].delete_one({'_id': self.user_id})
+        await save_job(self.mongo, self.job, finished=datetime.now())
+
+    async def erase_stage(self, position: int, stage: Stage, erase_batch: Callable):
+        """Удаление документов пользователя из одной коллекции.
+
+        Args:
+            position: Номер этапа
+            stage: Этап задания
+            erase_batch: Функция для удаления пачки документов
+        """
+        async for docs in self.batches(stage, None):
+            await erase_batch(self.mongo, self.user_id, docs)
+            await save_job(self.mongo, self.job, stage=position, processed=self.job['processed'] + len(docs))
+            await asyncio.sleep(self.pause)
+        await save_job(self.mongo, self.job, stage=position + 1)
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne
+
+from core.enums import MongoCollections
+from models.base import HistoryChoices, LeaderboardChoices, bucket_start
+from models.queries import CountHistory, RankFilms, RankReviews, RecordHistory, ScoreLeaderboard
+
+RANKINGS = MappingProxyType({
+    LeaderboardChoices.top: (MongoCollections.films, RankFilms),
+    LeaderboardChoices.discussed: (MongoCollections.reviews, RankReviews),
+})
+
+
+def history_bucket(unit: HistoryChoices, bucket: Dict, rebuilt: datetime) -> ReplaceOne:
+    """Функция для замены документа истории рейтинга за интервал пересчитанным по голосам.
+
+    Args:
+        unit: Интервал истории рейтинга
+        bucket: Лайки, дизлайки и сумма оценок фильма за интервал
+        rebuilt: Время начала пересчета, которым помечаются пересчитанные документы
+
+    Returns:
+        ReplaceOne: Операция замены документа с тем же ID, что и при фоновом учете
+    """
+    query = RecordHistory(
+        film_id=bucket['_id']['film_id'],
+        unit=unit,
+        period=bucket['_id']['period'],
+        likes=bucket['likes'],
+        dislikes=bucket['dislikes'],
+        total=bucket['total'],
+    )
+    return ReplaceOne({'_id': query.doc_id}, {
+        'film_id': query.film_id,
+        'unit': unit.value,
+        'period': query.period,
+        'likes': query.likes,
+        'dislikes': query.dislikes,
+        'total': query.total,
+        'rebuilt': rebuilt,
+    }, upsert=True)
+
+
+def leaderboard_position(board: LeaderboardChoices, period: datetime, rank: Dict) -> ReplaceOne:
+    """Функция для замены позиции фильма в рейтинге за неделю пересчитанной по данным.
+
+    Args:
+        board: Рейтинг
+        period: Начало недели
+        rank: ID фильма и его очки за неделю
+
+    Returns:
+        ReplaceOne: Операция замены документа с тем же ID, что и при инкрементальном обновлении
+    """
+    position = ScoreLeaderboard(board=board, film_id=rank['_id'], period=period, delta=rank['score'])
+    return ReplaceOne(
+        {'_id': position.doc_id},
+        {'board': board.value, 'period': period, 'film_id': position.film_id, 'score': position.delta},
+        upsert=True,
+    )
+
+
+async def rebuild_leaderboard(mongo: AsyncIOMotorDatabase, board: LeaderboardChoices, period: datetime):
+    """Функция для полного пересчета рейтинга за неделю, если инкрементальные обновления разошлись с данными.
+
+    Args:
+        mongo: Соединение с MongoDB
+        board: Рейтинг
+        period: Начало недели
+    """
+    collection, ranking = RANKINGS[board]
+    ranks = [rank async for rank in mongo[collection.name].aggregate(**ranking(period=period).params)]
+    leaderboards = mongo[MongoCollections.leaderboards.name]
+    if ranks:
+        await leaderboards.bulk_write([leaderboard_position(board, period, rank) for rank in ranks], ordered=False)
+    await leaderboards.delete_many({
+        'board': board.value,
+        'period': period,
+        'film_id': {'$nin': [rank['_id'] for rank in ranks]},
+    })
+    logging.info('Рейтинг {board} за неделю с {period:%Y-%m-%d} пересчитан: {count} фильмов'.format(
+        board=board.value, period=period, count=len(ranks),
+    ))
+
+
+async def rebuild_leaderboards(mongo: AsyncIOMotorDatabase, period: datetime):
+    """Функция для полного пересчета всех рейтингов за неделю.
+
+    Args:
+        mongo: Соединение с MongoDB
+        period: Начало недели
+    """
+    await asyncio.gather(*(rebuild_leaderboard(mongo, board, period) for board in LeaderboardChoices))
+
+
+async def rebuild_history(mongo: AsyncIOMotorDatabase, unit: HistoryChoices, batch: int):
+    """Функция для полного пересчета истории рейтинга фильмов, если фоновые записи разошлись с голосами.
+
+    Голос учитывается в интервале своего последнего изменения, поэтому сумма интервалов совпадает
+    с текущим рейтингом, а прежние оценки, которые пользователь потом изменил, из истории пропадают.
+    Интервалы, в которых голосов не осталось, удаляются, кроме текущего, который еще пополняется.
+
+    Args:
+        mongo: Соединение с MongoDB
+        unit: Интервал истории рейтинга
+        batch: Размер пачки документов
+    """
+    rebuilt = datetime.now()
+    history = mongo[MongoCollections.history.name]
+    requests: List[ReplaceOne] = []
+    count = 0
+    async for bucket in mongo[MongoCollections.votes.name].aggregate(**CountHistory(unit=unit).params):
+        requests.append(history_bucket(unit, bucket, rebuilt))
+        if len(requests) == batch:
+            await history.bulk_write(requests, ordered=False)
+            count += len(requests)
+            requests = []
+    if requests:
+        await history.bulk_write(requests, ordered=False)
+        count += len(requests)
+    await history.delete_many({
+        'unit': unit.value,
+        'period': {'$lt': bucket_start(unit, rebuilt)},
+        'rebuilt': {'$ne': rebuilt},
+    })
+    logging.info('История рейтинга по интервалам {unit} пересчитана: {count} интервалов'.format(
+        unit=unit.value, count=count,
+    ))
@@ -0,0 +1,80 @@
+import csv
+import hashlib
+import os
+from functools import partial
+from itertools import islice
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+import orjson
+
+from models.base import ImportChoices
+
+Batch = List[Tuple[int, Dict]]
+
+CHUNK_SIZE = 1048576
+
+
+class ImportSource(NamedTuple):
+    """Файл с записями для загрузки."""
+
+    kind: ImportChoices
+    path: str
+
+
+def import_job_id(source: ImportSource) -> str:
+    """Функция для получения ID задания загрузки по абсолютному пути к файлу и хэшу его содержимого.
+
+    Загрузки разных файлов с одинаковым именем, как и загрузка измененного файла, - это разные задания,
+    поэтому продолжается только загрузка того же самого файла.
+
+    Args:
+        source: Вид записей и путь к файлу
+
+    Returns:
+        str: ID задания
+    """
+    digest = hashlib.sha256()
+    with open(source.path, 'rb') as source_file:
+        for chunk in iter(partial(source_file.read, CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return 'import:{kind}:{path}:{digest}'.format(
+        kind=source.kind.value, path=os.path.abspath(source.path), digest=digest.hexdigest(),
+    )
+
+
+def read_records(path: str, offset: int) -> Iterator[Tuple[int, Dict]]:
+    """Функция для потокового чтения записей из файла NDJSON или CSV, начиная с заданной записи.
+
+    Пустые значения CSV пропускаются, чтобы для необязательных полей действовали значения по умолчанию.
+
+    Args:
+        path: Путь к файлу, формат определяется по расширению
+        offset: Количество уже загруженных записей
+
+    Yields:
+        Tuple[int, Dict]: Номер записи и запись
+    """
+    with open(path, newline='') as source:
+        if path.endswith('.csv'):
+            rows = ({key: cell for key, cell in row.items() if cell} for row in csv.DictReader(source))
+        else:
+            rows = (orjson.loads(line) for line in source if line.strip())
+        yield from islice(enumerate(rows, start=1), offset, None)
+
+
+def read_waves(path: str, offset: int, size: int, concurrency: int) -> Iterator[List[Batch]]:
+    """Функция для чтения записей волнами по `concurrency` пачек, чтобы в памяти была только одна волна.
+
+    Args:
+        path: Путь к файлу NDJSON или CSV
+        offset: Количество уже загруженных записей
+        size: Размер пачки
+        concurrency: Количество пачек в волне
+
+    Yields:
+        List[Batch]: Пачки записей с их номерами
+    """
+    records = read_records(path, offset)
+    batches = iter(lambda: list(islice(records, size)), [])
+    while wave := list(islice(batches, concurrency)):
+        yield wave
@@ -0,0 +1,61 @@
+from functools import lru_cache
+from typing import Dict, Optional
+from uuid import UUID
+
+from fastapi import Depends
+
+from services.crud import CRUDService, get_crud_service
+from services.cursors import decode_cursor, encode_cursor
+from core.enums import MongoCollections
+from models.queries import SearchReviews
+
+
+class ReviewSearchService:
+    """Класс для полнотекстового поиска рецензий.
+
+    Поиск идет по текстовому индексу рецензий, а страницы выдаются по курсору из релевантности и ID
+    последней рецензии, поэтому следующая страница не пересчитывает пропущенные результаты через `$skip`.
+    """
+
+    def __init__(self, mongo: CRUDService):
+        """При инициализации класса принимает сервис для выполнения MongoDB-запросов.
+
+        Args:
+            mongo: Объект для выполнения MongoDB-запросов
+        """
+        self.mongo = mongo
+
+    async def search(self, text: str, film_id: Optional[UUID], cursor: Optional[str], limit: int) -> Dict:
+        """Страница рецензий, найденных по тексту, от более релевантных к менее релевантным.
+
+        Args:
+            text: Поисковый запрос
+            film_id: ID фильма, если искать только среди его рецензий
+            cursor: Курсор, выданный вместе с предыдущей страницей
+            limit: Размер страницы
+
+        Returns:
+            Dict: Рецензии и курсор следующей страницы, если она может быть
+        """
+        relevance, last_id = decode_cursor(cursor, float) if cursor else (None, None)
+        reviews = await self.mongo.search(
+            collection=MongoCollections.reviews,
+            query=SearchReviews(text=text, film_id=film_id, relevance=relevance, last_id=last_id, limit=limit),
+        )
+        next_cursor = None
+        if len(reviews) == limit:
+            next_cursor = encode_cursor(reviews[-1]['relevance'], reviews[-1]['id'])
+        return {'items': reviews, 'cursor': next_cursor}
+
+
+@lru_cache()
+def get_review_search_service(mongo: CRUDService = Depends(get_crud_service)) -> ReviewSearchService:
+    """Функция для создания объекта сервиса ReviewSearchService в едином экземпляре (синглтона).
+
+    Args:
+        mongo: Объект для выполнения MongoDB-запросов
+
+    Returns:
+        ReviewSearchService: Сервис поиска рецензий
+    """
+    return ReviewSearchService(mongo)
@@ -0,0 +1,149 @@
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from uuid import UUID
+
+from core.enums import MongoCollections
+from core.schemas import FILMS_SCHEMA, REVIEWS_SCHEMA, USER_VOTES_SCHEMA, USERS_SCHEMA
+
+TypeInfo = Union[Type, Tuple[Type, ...]]
+
+SCHEMAS = MappingProxyType({
+    MongoCollections.users: USERS_SCHEMA,
+    MongoCollections.films: FILMS_SCHEMA,
+    MongoCollections.reviews: REVIEWS_SCHEMA,
+    MongoCollections.votes: USER_VOTES_SCHEMA,
+})
+
+BSON_TYPES: 'MappingProxyType[str, TypeInfo]' = MappingProxyType({
+    'object': dict,
+    'array': list,
+    'binData': UUID,
+    'string': str,
+    'date': datetime,
+    'number': (int, float),
+    'null': type(None),
+})
+
+Queries = List[Tuple[MongoCollections, Dict]]
+
+
+def type_errors(instance: Any, schema: Dict, path: str) -> List[str]:
+    """Функция для проверки типа значения и его допустимых значений по `bsonType` и `enum`.
+
+    Args:
+        instance: Значение
+        schema: JSON-схема значения
+        path: Путь к значению в документе
+
+    Returns:
+        List[str]: Описание нарушения схемы или пустой список
+    """
+    if bson_type := schema.get('bsonType'):
+        names = [bson_type] if isinstance(bson_type, str) else bson_type
+        if not any(isinstance(instance, BSON_TYPES[name]) for name in names):
+            return ['{path}: ожидается {names}'.format(path=path, names=', '.join(names))]
+    if (enum := schema.get('enum')) is not None and instance not in enum:
+        return ['{path}: допустимые значения {enum}'.format(path=path, enum=enum)]
+    return []
+
+
+def field_errors(instance: Dict, schema: Dict, path: str) -> List[str]:
+    """Функция для проверки обязательных полей и значений полей документа по `required` и `properties`.
+
+    Args:
+        instance: Документ
+        schema: JSON-схема документа
+        path: Путь к документу
+
+    Returns:
+        List[str]: Описания нарушений схемы
+    """
+    errors = [
+        '{path}.{field}: обязательное поле'.format(path=path, field=field)
+        for field in schema.get('required', []) if field not in instance
+    ]
+    properties = schema.get('properties', {})
+    for field, field_value in instance.items():
+        if (subschema := properties.get(field)) is not None:
+            errors.extend(schema_errors(field_value, subschema, '{path}.{field}'.format(path=path, field=field)))
+    return errors
+
+
+def element_errors(instance: List, schema: Dict, path: str) -> List[str]:
+    """Функция для проверки элементов массива по `items`.
+
+    Args:
+        instance: Массив
+        schema: JSON-схема элемента массива
+        path: Путь к массиву
+
+    Returns:
+        List[str]: Описания нарушений схемы
+    """
+    return [
+        error
+        for position, element in enumerate(instance)
+        for error in schema_errors(element, schema, '{path}[{position}]'.format(path=path, position=position))
+    ]
+
+
+def schema_errors(instance: Any, schema: Dict, path: str = '$') -> List[str]:
+    """Функция для проверки значения по `$jsonSchema` до отправки в MongoDB, чтобы ошибка указывала на запись.
+
+    Поддерживаются те ключевые слова, которые используются в валидаторах коллекций.
+
+    Args:
+        instance: Значение
+        schema: JSON-схема значения
+        path: Путь к значению в документе
+
+    Returns:
+        List[str]: Описания нарушений схемы
+    """
+    if errors := type_errors(instance, schema, path):
+        return errors
+    if isinstance(instance, dict):
+        return field_errors(instance, schema, path)
+    if isinstance(instance, list) and (element_schema := schema.get('items')) is not None:
+        return element_errors(instance, element_schema, path)
+    return []
+
+
+def preview(params: Dict) -> Optional[Dict]:
+    """Функция для получения документа в том виде, в каком его запишет запрос, для проверки по схеме коллекции.
+
+    Args:
+        params: Параметры запроса на вставку или обновление
+
+    Returns:
+        Optional[Dict]: Документ или None, если запрос обновляет документ конвейером агрегации или не вставляет его
+    """
+    if (replacement := params.get('replacement')) is not None:
+        return {**params['filter'], **replacement}
+    if isinstance(params['update'], list) or not params['upsert']:
+        return None
+    doc = dict(params['filter'])
+    for operator in ('$set', '$setOnInsert'):
+        doc.update(params['update'].get(operator, {}))
+    for field, element in params['update'].get('$addToSet', {}).items():
+        doc[field] = [element]
+    return doc
+
+
+def check_queries(queries: Queries) -> Queries:
+    """Функция для проверки документов, которые запишут запросы, по схемам их коллекций.
+
+    Args:
+        queries: Коллекции и параметры запросов
+
+    Raises:
+        ValueError: Ошибка с описаниями нарушений схемы
+
+    Returns:
+        Queries: Те же запросы, если документы соответствуют схемам
+    """
+    for collection, params in queries:
+        if (doc := preview(params)) is not None and (errors := schema_errors(doc, SCHEMAS[collection])):
+            raise ValueError('; '.join(errors))
+    return queries
@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, List
+from uuid import uuid4
+
+import pytest
+
+from services.activity import ActivityService
+from services.cursors import decode_cursor, encode_cursor
+from core.exceptions import InvalidCursorError
+from models.queries import ListActivity
+
+USER_ID = uuid4()
+ACTION_ID = uuid4()
+TIMESTAMP = datetime.fromisoformat('2023-03-01T12:30:15.125000')
+
+
+class FakeCRUD:
+    """Сервис MongoDB-запросов, который отдает заданные действия и запоминает запрос."""
+
+    def __init__(self, actions: List[Dict]):
+        """При инициализации класса принимает действия, которые найдет запрос.
+
+        Args:
+            actions: Найденные действия
+        """
+        self.actions = actions
+        self.query = None
+
+    async def search(self, collection, query: ListActivity) -> List[Dict]:
+        self.query = query
+        return self.actions
+
+
+def recorded(count: int) -> List[Dict]:
+    return [{'id': uuid4(), 'timestamp': TIMESTAMP} for _ in range(count)]
+
+
+def test_decodes_encoded_cursor():
+    encoded = encode_cursor(TIMESTAMP, ACTION_ID)
+    assert decode_cursor(encoded, datetime.fromisoformat) == (TIMESTAMP, ACTION_ID)
+
+
+@pytest.mark.parametrize('invalid', [
+    'не base64',
+    encode_cursor(TIMESTAMP, ACTION_ID)[:-4],
+    'WzEsIDJd',
+])
+def test_rejects_foreign_cursor(invalid: str):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(invalid, datetime.fromisoformat)
+
+
+def test_returns_cursor_after_full_page():
+    actions = recorded(2)
+    page = asyncio.run(ActivityService(FakeCRUD(actions)).search(USER_ID, None, limit=2))
+    assert decode_cursor(page['cursor'], datetime.fromisoformat) == (TIMESTAMP, actions[-1]['id'])
+
+
+def test_returns_no_cursor_after_last_page():
+    page = asyncio.run(ActivityService(FakeCRUD(recorded(1))).search(USER_ID, None, limit=2))
+    assert page['cursor'] is None
+
+
+def test_continues_after_cursor():
+    mongo = FakeCRUD([])
+    service = ActivityService(mongo)
+    asyncio.run(service.search(USER_ID, encode_cursor(TIMESTAMP, ACTION_ID), limit=2))
+    assert mongo.query.params['pipeline'][0] == {'$match': {
+        'user_id': USER_ID,
+        '$or': [
+            {'timestamp': {'$lt': TIMESTAMP}},
+            {'timestamp': TIMESTAMP, '_id': {'$lt': ACTION_ID}},
+        ],
+    }}
@@ -0,0 +1,91 @@
+import asyncio
+from http import HTTPStatus
+from typing import Dict, List
+
+import orjson
+import pytest
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.admission import AdmissionMiddleware, ConcurrencyLimit
+from core.config import CONFIG
+
+TARGET = 0.01
+
+
+class Client:
+    """Клиент, который запоминает отправленные ему сообщения ответа."""
+
+    def __init__(self):
+        """При инициализации класса создает пустой список сообщений."""
+        self.messages: List[Message] = []
+
+    async def receive(self) -> Dict:
+        return {'type': 'http.request'}
+
+    async def send(self, message: Message):
+        self.messages.append(message)
+
+
+async def crash(scope: Scope, receive: Receive, send: Send):
+    raise RuntimeError('Ошибка обработки запроса')
+
+
+def request(middleware: AdmissionMiddleware, method: str, path: str) -> List[Message]:
+    client = Client()
+    scope = {'type': 'http', 'method': method, 'path': path, 'headers': [], 'query_string': b''}
+    asyncio.run(middleware(scope, client.receive, client.send))
+    return client.messages
+
+
+def admission(app: ASGIApp) -> AdmissionMiddleware:
+    middleware = AdmissionMiddleware(app)
+    middleware.limits['writes'] = ConcurrencyLimit('writes', 1, TARGET)
+    return middleware
+
+
+async def wait_in_queue(limit: ConcurrencyLimit) -> List[bool]:
+    waiter = asyncio.ensure_future(limit.acquire())
+    await asyncio.sleep(0)
+    limit.release()
+    return [await waiter, await limit.acquire()]
+
+
+def test_rejects_while_queue_is_slow():
+    middleware = admission(Response(b'{}'))
+    limit = middleware.limits['writes']
+    limit.active = limit.limit
+    limit.delay = TARGET * 2
+    start, body = request(middleware, 'POST', '/api/v1/films/ratings')
+    assert start['status'] == HTTPStatus.SERVICE_UNAVAILABLE
+    assert Headers(raw=start['headers'])['retry-after'] == str(CONFIG.admission.retry)
+    assert orjson.loads(body['body'])['message']
+
+
+def test_passes_unlimited_route_through():
+    middleware = admission(Response(b'{}'))
+    middleware.limits['writes'].active = 1
+    start, _ = request(middleware, 'GET', '/health')
+    assert start['status'] == HTTPStatus.OK
+
+
+def test_releases_slot_after_error():
+    middleware = admission(crash)
+    with pytest.raises(RuntimeError):
+        request(middleware, 'POST', '/api/v1/films/ratings')
+    assert middleware.limits['writes'].active == 0
+
+
+def test_times_out_waiting_in_queue():
+    limit = ConcurrencyLimit('writes', 1, TARGET)
+    assert asyncio.run(limit.acquire())
+    assert not asyncio.run(limit.acquire())
+    assert limit.active == 1
+
+
+def test_hands_slot_to_waiter():
+    limit = ConcurrencyLimit('writes', 1, TARGET)
+    assert asyncio.run(limit.acquire())
+    assert asyncio.run(wait_in_queue(limit)) == [True, False]
+    assert limit.active == 1
@@ -0,0 +1,97 @@
+import asyncio
+from http import HTTPStatus
+from typing import Any, Dict, Hashable, List, Tuple
+
+import pytest
+
+from services.cache import ReadCache
+from core.exceptions import ServiceUnavailableError
+
+TTL = 5
+STALE = 30
+ERROR = 300
+KEY = ('films', 1)
+
+
+class Loader:
+    """Загрузка значений из MongoDB, которая считает обращения и может быть недоступна."""
+
+    def __init__(self):
+        """При инициализации класса MongoDB доступна."""
+        self.calls = 0
+        self.available = True
+
+    async def load(self) -> Dict:
+        self.calls += 1
+        if not self.available:
+            raise ServiceUnavailableError(status_code=HTTPStatus.SERVICE_UNAVAILABLE)
+        return {'likes': self.calls}
+
+    async def load_many(self, idents: List[Hashable]) -> Dict[Hashable, Dict]:
+        self.calls += 1
+        return {ident: {'likes': self.calls} for ident in idents}
+
+
+@pytest.fixture
+def cache() -> ReadCache:
+    return ReadCache(ttl=TTL, stale=STALE, error=ERROR, size=10)
+
+
+@pytest.fixture
+def loader() -> Loader:
+    return Loader()
+
+
+def read(cache: ReadCache, loader: Loader) -> Tuple[Any, bool]:
+    return asyncio.run(cache.get(KEY, loader.load))
+
+
+def prime(cache: ReadCache, loader: Loader, age: float):
+    read(cache, loader)
+    payload, stored = cache.entries[KEY]
+    cache.entries[KEY] = (payload, stored - age)
+
+
+async def read_and_settle(cache: ReadCache, loader: Loader) -> Tuple[Any, bool]:
+    outcome = await cache.get(KEY, loader.load)
+    await asyncio.sleep(0)
+    return outcome
+
+
+def test_serves_fresh_entry(cache: ReadCache, loader: Loader):
+    prime(cache, loader, 0)
+    assert read(cache, loader) == ({'likes': 1}, False)
+    assert loader.calls == 1
+
+
+def test_serves_stale_entry_while_revalidating(cache: ReadCache, loader: Loader):
+    prime(cache, loader, TTL + 1)
+    assert asyncio.run(read_and_settle(cache, loader)) == ({'likes': 1}, True)
+    assert read(cache, loader) == ({'likes': 2}, False)
+    assert not cache.refreshing
+
+
+def test_serves_stale_entry_if_mongo_unavailable(cache: ReadCache, loader: Loader):
+    prime(cache, loader, TTL + STALE + 1)
+    loader.available = False
+    assert read(cache, loader) == ({'likes': 1}, True)
+
+
+def test_fails_if_entry_too_old_for_outage(cache: ReadCache, loader: Loader):
+    prime(cache, loader, TTL + ERROR + 1)
+    loader.available = False
+    with pytest.raises(ServiceUnavailableError):
+        read(cache, loader)
+
+
+def test_loads_only_missing_entries(cache: ReadCache, loader: Loader):
+    asyncio.run(cache.get_many({1: ('films', 1, 1)}, loader.load_many))
+    ratings, stale = asyncio.run(cache.get_many({1: ('films', 1, 1), 2: ('films', 2, 1)}, loader.load_many))
+    assert ratings == {1: {'likes': 1}, 2: {'likes': 2}}
+    assert not stale
+
+
+def test_reloads_entries_of_new_version(cache: ReadCache, loader: Loader):
+    asyncio.run(cache.get_many({1: ('films', 1, 1)}, loader.load_many))
+    ratings, _ = asyncio.run(cache.get_many({1: ('films', 1, 2)}, loader.load_many))
+    assert ratings == {1: {'likes': 2}}
@@ -0,0 +1,108 @@
+import asyncio
+import gzip
+from typing import AsyncIterator, Dict, List
+
+import pytest
+from prometheus_client import REGISTRY
+from starlette.datastructures import Headers
+from starlette.responses import Response, StreamingResponse
+from starlette.types import ASGIApp, Message
+
+from api.compression import CompressionMiddleware
+from api.encoders import negotiate
+from core.config import CONFIG
+
+BODY = b'{"likes": 1}' * CONFIG.compression.minimum
+
+
+async def chunks() -> AsyncIterator[bytes]:
+    yield BODY
+    yield BODY
+
+
+class Client:
+    """Клиент, который запоминает отправленные ему сообщения ответа и не отключается."""
+
+    def __init__(self):
+        """При инициализации класса создает пустой список сообщений."""
+        self.messages: List[Message] = []
+
+    async def receive(self) -> Dict:
+        await asyncio.Event().wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message: Message):
+        self.messages.append(message)
+
+
+async def call(middleware: CompressionMiddleware, accept_encoding: str) -> List[Message]:
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': '/api/v1/films/ratings',
+        'query_string': b'',
+        'headers': [(b'accept-encoding', accept_encoding.encode())],
+    }
+    client = Client()
+    await middleware(scope, client.receive, client.send)
+    return client.messages
+
+
+def respond(app: ASGIApp, accept_encoding: str = 'gzip') -> List[Message]:
+    return asyncio.run(call(CompressionMiddleware(app), accept_encoding))
+
+
+def cache_hits() -> float:
+    return REGISTRY.get_sample_value('ugc_compression_cache_total', {'result': 'hit'}) or 0
+
+
+@pytest.mark.parametrize('accept_encoding, encoding', [
+    ('gzip', 'gzip'),
+    ('gzip;q=0.5, zstd;q=0.8', 'zstd'),
+    ('*;q=0.1, gzip', 'gzip'),
+    ('gzip;q=0', None),
+    ('identity', None),
+    ('gzip;q=abc', None),
+])
+def test_negotiates_encoding(accept_encoding: str, encoding: str):
+    assert negotiate(accept_encoding) == encoding
+
+
+def test_compresses_whole_response():
+    start, body = respond(Response(BODY, media_type='application/json'))
+    headers = Headers(raw=start['headers'])
+    assert headers['content-encoding'] == 'gzip'
+    assert headers['vary'] == 'Accept-Encoding'
+    assert headers['content-length'] == str(len(body['body']))
+    assert gzip.decompress(body['body']) == BODY
+
+
+def test_passes_small_response_through():
+    start, body = respond(Response(b'{}', media_type='application/json'))
+    headers = Headers(raw=start['headers'])
+    assert 'content-encoding' not in headers
+    assert headers['vary'] == 'Accept-Encoding'
+    assert body['body'] == b'{}'
+
+
+def test_passes_unaccepted_encoding_through():
+    start, body = respond(Response(BODY, media_type='application/json'), accept_encoding='identity')
+    assert 'content-encoding' not in Headers(raw=start['headers'])
+    assert body['body'] == BODY
+
+
+def test_compresses_stream_by_chunks():
+    start, *messages = respond(StreamingResponse(chunks(), media_type='application/x-ndjson'))
+    headers = Headers(raw=start['headers'])
+    assert headers['content-encoding'] == 'gzip'
+    assert 'content-length' not in headers
+    assert gzip.decompress(b''.join(message['body'] for message in messages)) == BODY * 2
+
+
+def test_caches_response_with_etag():
+    middleware = CompressionMiddleware(Response(BODY, media_type='application/json', headers={'ETag': '"1"'}))
+    hits = cache_hits()
+    _, first = asyncio.run(call(middleware, 'gzip'))
+    _, second = asyncio.run(call(middleware, 'gzip'))
+    assert first['body'] == second['body']
+    assert cache_hits() == hits + 1
@@ -0,0 +1,34 @@
+from http import HTTPStatus
+from typing import Optional
+
+import pytest
+from fastapi import Request, Response
+
+from api.v1.base import Conditional, make_etag
+
+VERSION = 3
+
+
+def conditional(response: Response, if_none_match: Optional[str] = None) -> Conditional:
+    headers = [] if if_none_match is None else [(b'if-none-match', if_none_match.encode())]
+    return Conditional(Request({'type': 'http', 'headers': headers}), response)
+
+
+@pytest.mark.parametrize('if_none_match', [
+    '"3"',
+    'W/"3"',
+    '"1", W/"3"',
+    '*',
+])
+def test_answers_not_modified(if_none_match: str):
+    not_modified = conditional(Response(), if_none_match).check(VERSION)
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED
+    assert not_modified.headers['etag'] == make_etag(VERSION)
+
+
+@pytest.mark.parametrize('if_none_match', [None, '"2"', 'W/"2"', ''])
+def test_tags_modified_response(if_none_match: Optional[str]):
+    response = Response()
+    assert conditional(response, if_none_match).check(VERSION) is None
+    assert response.headers['etag'] == make_etag(VERSION)
+    assert 'max-age' in response.headers['cache-control']
@@ -0,0 +1,202 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List
+from uuid import uuid4
+
+import pytest
+from prometheus_client import REGISTRY
+from pymongo.errors import ConnectionFailure
+
+from services.breaker import BreakerState, CircuitBreaker
+from services.crud import CRUDService
+from core.enums import MongoCollections
+from core.exceptions import ServiceUnavailableError
+from models.queries import AddBookmark
+
+WINDOW = 4
+LATENCY = 0.05
+COOLDOWN = 60
+
+
+class FakeCollection:
+    """Коллекция Motor, которая отвечает заданным поведением и считает обращения."""
+
+    def __init__(self):
+        """При инициализации класса коллекция отвечает сразу и без ошибок."""
+        self.behaviour: Callable[[], Awaitable[Dict]] = self.succeed
+        self.calls = 0
+
+    async def succeed(self) -> Dict:
+        return {'version': 1}
+
+    async def fail(self) -> Dict:
+        raise ConnectionFailure('MongoDB недоступна')
+
+    async def stall(self) -> Dict:
+        await asyncio.sleep(LATENCY * 2)
+        return {'version': 1}
+
+    async def find_one_and_update(self, **params) -> Dict:
+        self.calls += 1
+        return await self.behaviour()
+
+    async def find_one(self, *args, **params) -> Dict:
+        self.calls += 1
+        return await self.stall()
+
+
+class FakeDatabase:
+    """База данных Motor с одной фальшивой коллекцией на все имена."""
+
+    def __init__(self, collection: FakeCollection):
+        """При инициализации класса принимает коллекцию.
+
+        Args:
+            collection: Фальшивая коллекция
+        """
+        self.collection = collection
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        return self.collection
+
+
+@pytest.fixture
+def collection() -> FakeCollection:
+    return FakeCollection()
+
+
+@pytest.fixture
+def crud(collection: FakeCollection) -> CRUDService:
+    service = CRUDService(FakeDatabase(collection))
+    service.breaker = CircuitBreaker(window=WINDOW, threshold=0.5, latency=LATENCY, cooldown=COOLDOWN)
+    return service
+
+
+def bookmark() -> AddBookmark:
+    return AddBookmark(user_id=uuid4(), film_id=uuid4())
+
+
+async def write(crud: CRUDService, query: AddBookmark) -> Dict:
+    return await crud.update(collection=MongoCollections.users, query=query)
+
+
+def touch(crud: CRUDService) -> Dict:
+    return asyncio.run(write(crud, bookmark()))
+
+
+def fail_touch(crud: CRUDService):
+    with pytest.raises(ServiceUnavailableError):
+        touch(crud)
+
+
+def trip(crud: CRUDService, collection: FakeCollection):
+    collection.behaviour = collection.fail
+    for _ in range(WINDOW):
+        fail_touch(crud)
+
+
+def cool_down(crud: CRUDService):
+    crud.breaker.opened_at -= COOLDOWN
+
+
+async def probe_concurrently(crud: CRUDService) -> List:
+    return await asyncio.gather(write(crud, bookmark()), write(crud, bookmark()), return_exceptions=True)
+
+
+async def succeed_after_trip(crud: CRUDService) -> Dict:
+    late = asyncio.ensure_future(write(crud, bookmark()))
+    await asyncio.sleep(0)
+    crud.breaker.switch(BreakerState.open)
+    cool_down(crud)
+    crud.breaker.allow()
+    return await late
+
+
+async def read_after_write(crud: CRUDService):
+    query = bookmark()
+    stale = asyncio.ensure_future(crud.retrieve(collection=MongoCollections.users, doc_id=query.user_id))
+    await asyncio.sleep(0)
+    await write(crud, query)
+    await asyncio.gather(stale, crud.retrieve(collection=MongoCollections.users, doc_id=query.user_id))
+
+
+def test_trips_on_error_threshold(crud: CRUDService, collection: FakeCollection):
+    collection.behaviour = collection.fail
+    for _ in range(WINDOW - 1):
+        fail_touch(crud)
+    assert crud.breaker.state == BreakerState.closed
+    fail_touch(crud)
+    assert crud.breaker.state == BreakerState.open
+
+
+def test_ignores_errors_below_threshold(crud: CRUDService, collection: FakeCollection):
+    collection.behaviour = collection.fail
+    fail_touch(crud)
+    collection.behaviour = collection.succeed
+    for _ in range(WINDOW - 1):
+        touch(crud)
+    assert crud.breaker.state == BreakerState.closed
+
+
+def test_trips_on_latency_threshold(crud: CRUDService, collection: FakeCollection):
+    collection.behaviour = collection.stall
+    for _ in range(WINDOW):
+        assert touch(crud) == {'version': 1}
+    assert crud.breaker.state == BreakerState.open
+
+
+def test_fails_fast_while_open(crud: CRUDService, collection: FakeCollection):
+    trip(crud, collection)
+    collection.behaviour = collection.succeed
+    calls = collection.calls
+    with pytest.raises(ServiceUnavailableError) as exc:
+        touch(crud)
+    assert collection.calls == calls
+    assert exc.value.headers == {'Retry-After': str(COOLDOWN)}
+
+
+def test_allows_single_half_open_probe(crud: CRUDService, collection: FakeCollection):
+    trip(crud, collection)
+    cool_down(crud)
+    collection.behaviour = collection.stall
+    calls = collection.calls
+    _, rejected = asyncio.run(probe_concurrently(crud))
+    assert collection.calls == calls + 1
+    assert isinstance(rejected, ServiceUnavailableError)
+    assert crud.breaker.state == BreakerState.open
+
+
+def test_reopens_after_failed_probe(crud: CRUDService, collection: FakeCollection):
+    trip(crud, collection)
+    cool_down(crud)
+    fail_touch(crud)
+    assert crud.breaker.state == BreakerState.open
+
+
+def test_closes_after_successful_probe(crud: CRUDService, collection: FakeCollection):
+    trip(crud, collection)
+    cool_down(crud)
+    collection.behaviour = collection.succeed
+    assert touch(crud) == {'version': 1}
+    assert crud.breaker.state == BreakerState.closed
+    assert touch(crud) == {'version': 1}
+
+
+def test_exports_state_gauge(crud: CRUDService, collection: FakeCollection):
+    assert REGISTRY.get_sample_value('ugc_circuit_breaker_state') == BreakerState.closed
+    trip(crud, collection)
+    assert REGISTRY.get_sample_value('ugc_circuit_breaker_state') == BreakerState.open
+    cool_down(crud)
+    crud.breaker.allow()
+    assert REGISTRY.get_sample_value('ugc_circuit_breaker_state') == BreakerState.half_open
+
+
+def test_ignores_late_outcome_of_old_generation(crud: CRUDService, collection: FakeCollection):
+    collection.behaviour = collection.stall
+    assert asyncio.run(succeed_after_trip(crud)) == {'version': 1}
+    assert crud.breaker.state == BreakerState.half_open
+    assert not crud.breaker.allow()
+
+
+def test_rereads_document_written_during_flight(crud: CRUDService, collection: FakeCollection):
+    asyncio.run(read_after_write(crud))
+    assert collection.calls == 3
@@ -0,0 +1,28 @@
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, Dict, List
+
+from services.exports import render_chunks
+from models.base import ExportChoices
+
+COLUMNS = ('film_id', 'date')
+DATE = datetime.fromisoformat('2023-03-01T12:30:15')
+
+
+async def batches() -> AsyncIterator[List[Dict]]:
+    yield [{'film_id': 'b'}]
+
+
+async def collect(export_format: ExportChoices) -> bytes:
+    first = [{'film_id': 'a', 'date': DATE}]
+    chunks = render_chunks(batches(), first, export_format, list(COLUMNS))
+    return b''.join([chunk async for chunk in chunks])
+
+
+def test_renders_csv_with_header():
+    assert asyncio.run(collect(ExportChoices.csv)) == b'film_id,date\r\na,2023-03-01T12:30:15\r\nb,\r\n'
+
+
+def test_renders_ndjson_line_per_document():
+    rendered = asyncio.run(collect(ExportChoices.ndjson))
+    assert rendered == b'{"film_id":"a","date":"2023-03-01T12:30:15"}\n{"film_id":"b"}\n'
@@ -0,0 +1,108 @@
+import asyncio
+from pathlib import Path
+from typing import Counter, Dict, List
+from uuid import uuid4
+
+from pymongo.errors import BulkWriteError
+
+from services.importers import prepare_batch
+from services.imports import DUPLICATE_KEY, write_batch
+from services.records import ImportSource, import_job_id, read_waves
+from services.validation import schema_errors
+from core.enums import MongoCollections
+from core.schemas import USER_VOTES_SCHEMA
+from models.base import ImportChoices
+
+
+class FakeCollection:
+    """Коллекция Motor, которая запоминает пакетные записи и может отклонять их как повторы."""
+
+    def __init__(self, duplicates: bool):
+        """При инициализации класса задается, отклоняются ли записи уникальным индексом.
+
+        Args:
+            duplicates: Все записи коллекции - повторы
+        """
+        self.duplicates = duplicates
+        self.written: List = []
+
+    async def bulk_write(self, operations: List, ordered: bool):
+        if self.duplicates:
+            raise BulkWriteError({'writeErrors': [
+                {'index': index, 'code': DUPLICATE_KEY, 'errmsg': 'E11000'} for index in range(len(operations))
+            ]})
+        self.written.extend(operations)
+
+
+class FakeDatabase:
+    """База данных Motor с фальшивыми коллекциями по именам."""
+
+    def __init__(self, *duplicates: MongoCollections):
+        """При инициализации класса принимает коллекции, которые отклоняют записи как повторы.
+
+        Args:
+            duplicates: Коллекции, в которых все записи - повторы
+        """
+        self.collections = {
+            collection.name: FakeCollection(duplicates=collection in duplicates) for collection in MongoCollections
+        }
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        return self.collections[name]
+
+
+def uid() -> str:
+    return str(uuid4())
+
+
+def review() -> Dict:
+    return {'author': uid(), 'film_id': uid(), 'text': 'Отличный фильм'}
+
+
+def vote(**record) -> Dict:
+    return {'user_id': uid(), 'source_id': uid(), 'source': 'films', 'score': 10, **record}
+
+
+def test_reports_schema_violations_by_path():
+    errors = schema_errors({'_id': 'vote', 'user_id': 1, 'score': 'ten'}, USER_VOTES_SCHEMA)
+    assert '$.user_id: ожидается binData' in errors
+    assert '$.score: ожидается number' in errors
+
+
+def test_rejects_invalid_records():
+    stats: Counter = Counter()
+    batch = [(1, vote()), (2, vote(source='users')), (3, vote(score=5)), (4, vote(source_id=None))]
+    assert list(prepare_batch(ImportChoices.votes, batch, stats)) == [1]
+    assert stats['invalid'] == 3
+
+
+def test_skips_counters_of_duplicate_reviews():
+    mongo = FakeDatabase(MongoCollections.reviews)
+    stats = asyncio.run(write_batch(mongo, ImportChoices.reviews, [(1, review()), (2, review())]))
+    assert stats['duplicates'] == 2
+    assert not mongo[MongoCollections.films.name].written
+
+
+def test_counts_reviews_with_film_version():
+    mongo = FakeDatabase()
+    asyncio.run(write_batch(mongo, ImportChoices.reviews, [(1, review())]))
+    touch = mongo[MongoCollections.films.name].written[0]._doc
+    assert touch['$inc'] == {'review_count': 1, 'version': 1}
+
+
+def test_keys_job_by_path_and_content(tmp_path: Path):
+    paths = [tmp_path / name / 'votes.csv' for name in ('first', 'second')]
+    for csv_path in paths:
+        csv_path.parent.mkdir()
+        csv_path.write_text('user_id,source_id,source,score\n')
+    job_ids = {import_job_id(ImportSource(ImportChoices.votes, str(path))) for path in paths}
+    paths[0].write_text('user_id,source_id,source,score\n1,2,films,10\n')
+    job_ids.add(import_job_id(ImportSource(ImportChoices.votes, str(paths[0]))))
+    assert len(job_ids) == 3
+
+
+def test_reads_records_in_waves(tmp_path: Path):
+    path = tmp_path / 'bookmarks.ndjson'
+    path.write_text(''.join('{{"user_id": "{number}"}}\n'.format(number=number) for number in range(5)))
+    waves = list(read_waves(str(path), offset=1, size=2, concurrency=1))
+    assert [[number for number, _ in batch] for wave in waves for batch in wave] == [[2, 3], [4, 5]]
@@ -0,0 +1,45 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from models.base import HistoryChoices, VotesChoices, aggregate_votes, bucket_start, summarize_votes, week_start
+
+
+def test_summarizes_votes():
+    counts = {VotesChoices.like: 3, VotesChoices.dislike: 1}
+    assert summarize_votes(counts) == {'likes': 3, 'dislikes': 1, 'average_rating': 7}
+
+
+def test_summarizes_no_votes():
+    counts = {VotesChoices.like: 0, VotesChoices.dislike: 0}
+    assert summarize_votes(counts) == {'likes': 0, 'dislikes': 0, 'average_rating': None}
+
+
+def test_aggregates_votes():
+    votes = [{'user_id': uuid4(), 'score': score} for score in (10, 10, 0)]
+    assert aggregate_votes(votes) == {'likes': 2, 'dislikes': 1, 'average_rating': 6}
+
+
+def test_aggregates_scores_outside_byte_range():
+    votes = [{'user_id': uuid4(), 'score': score} for score in (10, 0, 1000, -1)]
+    assert aggregate_votes(votes) == {'likes': 1, 'dislikes': 1, 'average_rating': 5}
+
+
+@pytest.mark.parametrize('date, start', [
+    ('2023-03-06T00:00:00', '2023-03-06T00:00:00'),
+    ('2023-03-08T12:30:15', '2023-03-06T00:00:00'),
+    ('2023-03-12T23:59:59', '2023-03-06T00:00:00'),
+    ('2023-01-01T10:00:00', '2022-12-26T00:00:00'),
+])
+def test_starts_week_on_monday(date: str, start: str):
+    assert week_start(datetime.fromisoformat(date)) == datetime.fromisoformat(start)
+
+
+@pytest.mark.parametrize('unit, start', [
+    (HistoryChoices.hour, '2023-03-08T12:00:00'),
+    (HistoryChoices.day, '2023-03-08T00:00:00'),
+])
+def test_starts_history_bucket(unit: HistoryChoices, start: str):
+    date = datetime.fromisoformat('2023-03-08T12:30:15.125000')
+    assert bucket_start(unit, date) == datetime.fromisoformat(start)
@@ -0,0 +1,36 @@
+import asyncio
+from typing import Dict
+
+import pytest
+
+from db import mongo
+
+
+class FakeDatabase:
+    """База данных Motor, которая отвечает на команду `hello` заданным ответом."""
+
+    def __init__(self, hello: Dict):
+        """При инициализации класса принимает ответ на команду `hello`.
+
+        Args:
+            hello: Ответ MongoDB
+        """
+        self.hello = hello
+
+    async def command(self, name: str) -> Dict:
+        return self.hello
+
+
+@pytest.mark.parametrize('hello', [
+    {'isWritablePrimary': True, 'setName': 'rs0'},
+    {'isWritablePrimary': True, 'msg': 'isdbgrid'},
+])
+def test_accepts_transactional_deployment(monkeypatch: pytest.MonkeyPatch, hello: Dict):
+    monkeypatch.setattr(mongo, 'mongo', FakeDatabase(hello))
+    asyncio.run(mongo.check_transactions())
+
+
+def test_rejects_standalone_server(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(mongo, 'mongo', FakeDatabase({'isWritablePrimary': True}))
+    with pytest.raises(RuntimeError, match='--replSet'):
+        asyncio.run(mongo.check_transactions())
@@ -0,0 +1,91 @@
+import asyncio
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+import msgpack
+import orjson
+import pytest
+from bson import encode
+from bson.raw_bson import RawBSONDocument
+from fastapi import Request, Response
+
+from api.dependencies import negotiate_format
+from api.negotiation import MSGPACK, BSONResponse, MsgPackRequest, NegotiatedResponse, NegotiatedRoute
+from models.base import BINARY
+
+FILM_ID = uuid4()
+
+
+async def negotiated(accept: Optional[str]) -> bool:
+    await negotiate_format(accept)
+    return BINARY.get()
+
+
+async def make_response(binary: bool, response_class: type, payload: Any) -> NegotiatedResponse:
+    BINARY.set(binary)
+    return response_class(payload)
+
+
+def respond(binary: bool, payload: Any, response_class: type = NegotiatedResponse) -> NegotiatedResponse:
+    return asyncio.run(make_response(binary, response_class, payload))
+
+
+async def endpoint() -> Dict:
+    return {}
+
+
+async def echo(request: Request) -> Response:
+    return Response(type(request).__name__)
+
+
+async def receive() -> Dict:
+    return {'type': 'http.request', 'body': msgpack.packb({'film_id': FILM_ID.bytes, 'score': 10})}
+
+
+@pytest.mark.parametrize('accept, binary', [
+    ('application/msgpack', True),
+    ('application/x-msgpack;q=0.9, application/json', True),
+    ('application/json', False),
+    ('*/*', False),
+    (None, False),
+])
+def test_negotiates_format(accept: Optional[str], binary: bool):
+    assert asyncio.run(negotiated(accept)) is binary
+
+
+def test_renders_msgpack_when_requested():
+    response = respond(binary=True, payload={'film_id': FILM_ID, 'likes': 1})
+    assert response.headers['content-type'] == MSGPACK
+    assert response.headers['vary'] == 'Accept'
+    assert msgpack.unpackb(response.body) == {'film_id': FILM_ID.bytes, 'likes': 1}
+
+
+def test_renders_json_by_default():
+    response = respond(binary=False, payload={'film_id': FILM_ID, 'likes': 1})
+    assert response.headers['content-type'] == 'application/json'
+    assert response.headers['vary'] == 'Accept'
+    assert orjson.loads(response.body) == {'film_id': str(FILM_ID), 'likes': 1}
+
+
+def test_renders_bson_documents_as_msgpack():
+    doc = RawBSONDocument(encode({'likes': 1, 'dislikes': 0}))
+    response = respond(binary=True, payload=[doc], response_class=BSONResponse)
+    assert msgpack.unpackb(response.body) == [{'likes': 1, 'dislikes': 0}]
+
+
+def test_reads_msgpack_request_body():
+    scope = {'type': 'http', 'headers': [(b'content-type', MSGPACK.encode())]}
+    request = MsgPackRequest(scope, receive)
+    assert 'content-type' not in request.headers
+    assert asyncio.run(request.json()) == {'film_id': FILM_ID.bytes, 'score': 10}
+
+
+@pytest.mark.parametrize('content_type, request_class', [
+    ('application/x-msgpack; charset=utf-8', 'MsgPackRequest'),
+    ('application/json', 'Request'),
+])
+def test_routes_msgpack_body_to_msgpack_request(content_type: str, request_class: str):
+    route = NegotiatedRoute('/films/ratings/search', endpoint=endpoint, methods=['POST'])
+    request = Request({'type': 'http', 'headers': [(b'content-type', content_type.encode())]}, receive)
+    response = asyncio.run(route.negotiate(echo, request))
+    assert response.body == request_class.encode()
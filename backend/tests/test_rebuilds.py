@@ -0,0 +1,36 @@
+from datetime import datetime
+from uuid import uuid4
+
+from pymongo import ReplaceOne
+
+from services.rebuilds import history_bucket, leaderboard_position
+from models.base import HistoryChoices, LeaderboardChoices
+from models.queries import RecordHistory, ScoreLeaderboard
+
+PERIOD = datetime.fromisoformat('2023-03-08T12:00:00')
+
+
+def test_rebuilds_bucket_under_recorded_id():
+    film_id = uuid4()
+    rebuilt = datetime.now()
+    bucket = {'_id': {'film_id': film_id, 'period': PERIOD}, 'likes': 2, 'dislikes': 1, 'total': 20}
+    recorded = RecordHistory(film_id=film_id, unit=HistoryChoices.hour, period=PERIOD, likes=1, dislikes=0, total=10)
+    assert history_bucket(HistoryChoices.hour, bucket, rebuilt) == ReplaceOne({'_id': recorded.doc_id}, {
+        'film_id': film_id,
+        'unit': 'hour',
+        'period': PERIOD,
+        'likes': 2,
+        'dislikes': 1,
+        'total': 20,
+        'rebuilt': rebuilt,
+    }, upsert=True)
+
+
+def test_rebuilds_position_under_scored_id():
+    film_id = uuid4()
+    scored = ScoreLeaderboard(board=LeaderboardChoices.top, film_id=film_id, period=PERIOD, delta=1)
+    assert leaderboard_position(LeaderboardChoices.top, PERIOD, {'_id': film_id, 'score': 5}) == ReplaceOne(
+        {'_id': scored.doc_id},
+        {'board': 'top', 'period': PERIOD, 'film_id': film_id, 'score': 5},
+        upsert=True,
+    )
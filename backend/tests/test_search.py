@@ -0,0 +1,80 @@
+import asyncio
+import base64
+from typing import Dict, List
+from uuid import uuid4
+
+import pytest
+
+from services.cursors import decode_cursor, encode_cursor
+from services.search import ReviewSearchService
+from core.exceptions import InvalidCursorError
+from models.queries import SearchReviews
+
+REVIEW_ID = uuid4()
+RELEVANCE = 0.75
+
+
+class FakeCRUD:
+    """Сервис MongoDB-запросов, который отдает заданные рецензии и запоминает запрос."""
+
+    def __init__(self, reviews: List[Dict]):
+        """При инициализации класса принимает рецензии, которые найдет поиск.
+
+        Args:
+            reviews: Найденные рецензии
+        """
+        self.reviews = reviews
+        self.query = None
+
+    async def search(self, collection, query: SearchReviews) -> List[Dict]:
+        self.query = query
+        return self.reviews
+
+
+def found(count: int) -> List[Dict]:
+    return [{'id': uuid4(), 'relevance': 1.5} for _ in range(count)]
+
+
+def cursor(payload: bytes) -> str:
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def test_decodes_encoded_cursor():
+    encoded = encode_cursor(RELEVANCE, REVIEW_ID)
+    assert decode_cursor(encoded, float) == (RELEVANCE, REVIEW_ID)
+
+
+@pytest.mark.parametrize('invalid', [
+    'не base64',
+    cursor(b'not json'),
+    cursor(b'[1]'),
+    cursor(b'{"relevance": 1}'),
+    cursor(b'[null, null]'),
+    cursor(b'[1, "not uuid"]'),
+])
+def test_rejects_foreign_cursor(invalid: str):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(invalid, float)
+
+
+def test_returns_cursor_after_full_page():
+    reviews = found(2)
+    page = asyncio.run(ReviewSearchService(FakeCRUD(reviews)).search('фильм', None, None, limit=2))
+    assert decode_cursor(page['cursor'], float) == (1.5, reviews[-1]['id'])
+
+
+def test_returns_no_cursor_after_last_page():
+    page = asyncio.run(ReviewSearchService(FakeCRUD(found(1))).search('фильм', None, None, limit=2))
+    assert page['cursor'] is None
+
+
+def test_continues_after_cursor():
+    mongo = FakeCRUD([])
+    service = ReviewSearchService(mongo)
+    asyncio.run(service.search('фильм', None, encode_cursor(RELEVANCE, REVIEW_ID), limit=2))
+    assert mongo.query.relevance == RELEVANCE
+    assert mongo.query.last_id == REVIEW_ID
+    assert {'$match': {'$or': [
+        {'relevance': {'$lt': RELEVANCE}},
+        {'relevance': RELEVANCE, '_id': {'$lt': REVIEW_ID}},
+    ]}} in mongo.query.params['pipeline']
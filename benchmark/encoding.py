@@ -0,0 +1,77 @@
+"""Микро-бенчмарк сериализации ответов API в JSON и MessagePack.
+
+Сравнивает размер тела и время сериализации для списков закладок, рецензий и рейтингов
+тем же путем, которым их сериализует FastAPI: `jsonable_encoder` и рендер ответа. Запуск из корня репозитория:
+
+    python benchmark/encoding.py
+"""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from random import choice, randint
+from timeit import repeat
+from typing import Callable, List
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'backend' / 'src'))
+
+from api.v1.base import NegotiatedResponse  # noqa: E402
+from models.base import BINARY  # noqa: E402
+from models.responses import BookmarkResponse, RatingResponse, ReviewResponse  # noqa: E402
+
+
+def gen_bookmarks(size: int) -> List[BaseModel]:
+    return [BookmarkResponse(film_id=uuid4()) for _ in range(size)]
+
+
+def gen_reviews(size: int) -> List[BaseModel]:
+    return [
+        ReviewResponse(
+            id=uuid4(),
+            author=uuid4(),
+            film_id=uuid4(),
+            text='Рецензия ' * randint(5, 50),
+            pub_date=datetime(2023, 1, 1) + timedelta(minutes=position),
+            rating={'votes': [{'user_id': uuid4(), 'score': choice([0, 10])} for _ in range(randint(0, 20))]},
+        )
+        for position in range(size)
+    ]
+
+
+def gen_ratings(size: int) -> List[BaseModel]:
+    return [
+        RatingResponse(likes=randint(0, 10_000), dislikes=randint(0, 10_000), average_rating=5)
+        for _ in range(size)
+    ]
+
+
+def render(models: List[BaseModel], binary: bool) -> Callable[[], bytes]:
+    def run() -> bytes:
+        token = BINARY.set(binary)
+        try:
+            return NegotiatedResponse(jsonable_encoder(models, by_alias=False)).body
+        finally:
+            BINARY.reset(token)
+    return run
+
+
+if __name__ == '__main__':
+    print('{0:>10} | {1:>10} | {2:>10} | {3:>12} | {4:>12} | {5:>8}'.format(
+        'response', 'json, KB', 'msgpack, KB', 'json, ms', 'msgpack, ms', 'speedup',
+    ))
+    for name, gen in (('bookmarks', gen_bookmarks), ('reviews', gen_reviews), ('ratings', gen_ratings)):
+        models = gen(100)
+        json, binary = render(models, binary=False), render(models, binary=True)
+        json_time = min(repeat(json, number=1000, repeat=3)) / 1000
+        binary_time = min(repeat(binary, number=1000, repeat=3)) / 1000
+        print('{0:>10} | {1:>10.1f} | {2:>11.1f} | {3:>12.3f} | {4:>12.3f} | {5:>7.1f}x'.format(
+            name,
+            len(json()) / 1024,
+            len(binary()) / 1024,
+            json_time * 1000,
+            binary_time * 1000,
+            json_time / binary_time,
+        ))
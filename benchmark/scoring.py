@@ -0,0 +1,64 @@
+"""Микро-бенчмарк подсчета рейтинга по голосам пользователей.
+
+Сравнивает поэлементный подсчет через pydantic-модели голосов (как было раньше в `RatingResponse`)
+с подсчетом по компактному массиву оценок. Запуск из корня репозитория:
+
+    python benchmark/scoring.py
+"""
+import sys
+from pathlib import Path
+from random import choice
+from timeit import repeat
+from typing import Dict, List, Optional
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel, root_validator
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'backend' / 'src'))
+
+from models.base import VotesChoices, aggregate_votes  # noqa: E402
+from models.responses import RatingResponse  # noqa: E402
+
+
+class Vote(BaseModel):
+    """Голос пользователя, как он валидировался до векторизации."""
+
+    user_id: UUID
+    score: VotesChoices
+
+
+class LegacyRatingResponse(BaseModel):
+    """Рейтинг с поэлементным подсчетом голосов."""
+
+    likes: int = 0
+    dislikes: int = 0
+    average_rating: Optional[int]
+    votes: Optional[List[Vote]]
+
+    @root_validator
+    def scoring(cls, data: Dict) -> Dict:
+        if votes := data.get('votes'):
+            total_scores = 0
+            for vote in votes:
+                if vote.score == VotesChoices.like.value:
+                    data['likes'] += 1
+                elif vote.score == VotesChoices.dislike.value:
+                    data['dislikes'] += 1
+                total_scores += vote.score
+            data['average_rating'] = total_scores // (data['likes'] + data['dislikes'])
+        return data
+
+
+def gen_rating(size: int) -> Dict:
+    return {'votes': [{'user_id': uuid4(), 'score': choice([0, 10])} for _ in range(size)]}
+
+
+if __name__ == '__main__':
+    print('{0:>10} | {1:>12} | {2:>12} | {3:>8}'.format('votes', 'legacy, ms', 'vector, ms', 'speedup'))
+    for size in (10_000, 100_000, 1_000_000):
+        rating = gen_rating(size)
+        assert LegacyRatingResponse(**rating).dict(exclude={'votes'}) == RatingResponse.parse_obj(aggregate_votes(rating['votes'])).dict()
+        number = max(1, 100_000 // size)
+        legacy = min(repeat(lambda: LegacyRatingResponse(**rating), number=number, repeat=3)) / number
+        vector = min(repeat(lambda: RatingResponse.parse_obj(aggregate_votes(rating['votes'])), number=number, repeat=3)) / number
+        print('{0:>10} | {1:>12.2f} | {2:>12.2f} | {3:>7.1f}x'.format(size, legacy * 1000, vector * 1000, legacy / vector))